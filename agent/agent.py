@@ -1,13 +1,15 @@
+import time
+_import_started = time.perf_counter()
+
 from google.adk.agents.llm_agent import Agent
 # agent.py - Main file with all agents and tool registration
 import asyncio
 import json
+import logging
 import sys
 import os
 from dotenv import load_dotenv
-import nest_asyncio
 
-nest_asyncio.apply()
 load_dotenv()
 
 # Add project root to Python path
@@ -17,25 +19,16 @@ sys.path.insert(0, project_root)
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
 # from google.adk.agents import Agent
-from toolbox_core import ToolboxSyncClient
-
-# Import all your FunctionTools
-from tools.weather_tools import weather_function_tools
-from tools.destination_tools import destination_function_tools  
-from tools.itinerary_tools import itinerary_function_tools
-from tools.common_tools import common_function_tools
-
-# Connect to MCP Toolbox server
-toolbox_url = os.getenv("MCP_TOOLBOX_URL", "http://127.0.0.1:5000")
-toolbox = ToolboxSyncClient(toolbox_url)
-print("Connection successful!")
 
-# Load travel intelligence tools
-travel_tools = toolbox.load_toolset('travel_genius_toolset')
+from utils.logging_helper import configure_logging, bind_tool_log_context, reset_tool_log_context
+configure_logging()
+logger = logging.getLogger(__name__)
 
-# Combine all tools
-all_tools = (travel_tools + weather_function_tools + destination_function_tools + 
-             itinerary_function_tools + common_function_tools)
+# Each agent gets only the tools its instruction uses (tools/registry.py);
+# MCP Toolbox tools (travel intelligence) are fetched on first use, not at import
+from tools.registry import check_agents, tools_for
+from services import startup
+from services.fast_path_router import FastPathRouter
 
 # PERSONALITY ANALYSIS AGENT
 personality_agent = Agent(
@@ -60,7 +53,9 @@ personality_agent = Agent(
     Use the available tools to check destination data and weather conditions.
     Always consider seasonal weather patterns when making recommendations.
     """,
-    tools=all_tools
+    tools=tools_for("personality_analyzer"),
+    before_tool_callback=bind_tool_log_context,
+    after_tool_callback=reset_tool_log_context
 )
 
 # BUDGET OPTIMIZATION AGENT
@@ -86,7 +81,9 @@ budget_agent = Agent(
     Use calculate-trip-budget and search-transport-options tools to get accurate cost estimates.
     Use get_weather_analysis tool to factor in weather-related contingencies.
     """,
-    tools=all_tools
+    tools=tools_for("budget_optimizer"),
+    before_tool_callback=bind_tool_log_context,
+    after_tool_callback=reset_tool_log_context
 )
 
 # HIDDEN GEMS DISCOVERY AGENT
@@ -103,6 +100,7 @@ gems_agent = Agent(
     3. Use get_weather_analysis to consider weather suitability for outdoor vs indoor hidden gems
     4. Prioritize experiences marked as "hidden gems" in the database
     5. Focus on community-based tourism and local interactions
+    6. Use find_places_near to suggest gems close to the traveler's hotel or another activity
     
     Weather Adaptation:
     - Rainy season: Focus on indoor workshops, covered markets, cultural centers
@@ -111,7 +109,9 @@ gems_agent = Agent(
     
     Always explain why each recommendation suits the weather and season.
     """,
-    tools=all_tools
+    tools=tools_for("gems_discoverer"),
+    before_tool_callback=bind_tool_log_context,
+    after_tool_callback=reset_tool_log_context
 )
 
 # SUSTAINABILITY ADVISOR AGENT
@@ -129,7 +129,7 @@ sustainability_agent = Agent(
     - get-hidden-gems: Discover community-based and sustainable experiences
     
     Your Responsibilities:
-    1. Use search_transport_to_destination to compare eco-adjusted carbon footprints
+    1. Use search-transport-options to compare eco-adjusted carbon footprints
     2. Prioritize accommodations and activities with high sustainability scores
     3. Calculate total trip carbon footprint including weather-related adjustments
     4. Recommend off-peak travel to reduce environmental impact
@@ -146,7 +146,9 @@ sustainability_agent = Agent(
     - Climate-conscious timing recommendations
     - Community-based tourism options from hidden gems
     """,
-    tools=all_tools
+    tools=tools_for("sustainability_advisor"),
+    before_tool_callback=bind_tool_log_context,
+    after_tool_callback=reset_tool_log_context
 )
 
 # ACCOMMODATION SPECIALIST AGENT
@@ -165,6 +167,7 @@ accommodation_agent = Agent(
     
     Use get_weather_analysis tool to understand weather conditions for the travel period.
     Use search-hotels-enhanced to find accommodations with appropriate amenities.
+    Use find_places_near (kind="activity", near=<hotel name>) to show what is within walking or short driving distance of a property.
     
     Match accommodation types to personality AND weather:
     - ADVENTURE + Good weather: Eco-lodges, outdoor-focused properties
@@ -173,7 +176,9 @@ accommodation_agent = Agent(
     
     Always explain how each property handles different weather conditions.
     """,
-    tools=all_tools
+    tools=tools_for("accommodation_specialist"),
+    before_tool_callback=bind_tool_log_context,
+    after_tool_callback=reset_tool_log_context
 )
 
 # WEATHER PLANNER AGENT
@@ -188,14 +193,15 @@ weather_agent = Agent(
     1. Use get_current_weather_report tool to get comprehensive weather forecasts
     2. Use get_weather_analysis tool to score activities by weather suitability (1-10 scale)
     3. Use optimize_schedule_for_weather tool to reorganize itinerary for maximum enjoyment
-    4. Provide weather-specific recommendations and alternatives
-    5. Generate weather alerts and contingency plans
+    4. Use compare_destinations_weather tool (one call, all destinations) when the user is choosing between destinations
+    5. Provide weather-specific recommendations and alternatives
+    6. Generate weather alerts and contingency plans
     
     Optimization Strategy:
     - Prioritize outdoor activities on high-score weather days (8-10/10)
     - Schedule indoor cultural activities during poor weather (1-4/10)
     - Use mixed indoor/outdoor for moderate weather (5-7/10)
-    - Consider time-of-day adjustments (early morning for hot weather)
+    - Use get_best_time_for_activity tool for time-of-day adjustments instead of guessing
     - Maintain personality alignment while adapting to conditions
     
     Weather Scoring Criteria:
@@ -206,7 +212,9 @@ weather_agent = Agent(
     
     Always maintain the traveler's personality preferences while optimizing for weather.
     """,
-    tools=all_tools
+    tools=tools_for("weather_planner"),
+    before_tool_callback=bind_tool_log_context,
+    after_tool_callback=reset_tool_log_context
 )
 
 travel_genius = Agent(
@@ -285,15 +293,18 @@ travel_genius = Agent(
 }
 
 RULES:
-1. Include 2-4 activities per day with realistic costs in INR
+1. Include 2-4 activities per day with realistic costs in INR; use cluster_activities_by_day so each day's activities are close together
 2. Use weather data from tools to optimize indoor/outdoor activities  
 3. Activity types: "adventure", "food", "cultural", "instagram", "attraction", "transport"
 4. Always include at least one "instagram" type activity
 5. Costs should be realistic for the destination and activity type
 6. Use emojis in titles for visual appeal
-7. Return ONLY the JSON object, no other text whatsoever""",
+7. Return ONLY the JSON object, no other text whatsoever
+8. When destination, days and budget are known, call build_itinerary_draft first and refine its itinerary (it is built from our stored activities and the weather forecast) rather than writing one from scratch""",
     sub_agents=[personality_agent, budget_agent, gems_agent, sustainability_agent, accommodation_agent, weather_agent],
-    tools=all_tools
+    tools=tools_for("travel_genius"),
+    before_tool_callback=bind_tool_log_context,
+    after_tool_callback=reset_tool_log_context
 )
 
 
@@ -312,6 +323,7 @@ CAPABILITIES:
 - Help with practical travel advice
 - Explain weather considerations
 - Offer budget-friendly alternatives
+- Answer "what is near my hotel / this activity" with find_places_near
 
 RESPONSE STYLE:
 - Be conversational, friendly, and enthusiastic
@@ -336,7 +348,9 @@ FORMAT RULE:
     • emoji    (string) – a representative emoji
 --- Do **not** wrap the JSON in markdown fences.
 You are NOT generating new itineraries – only helping with existing ones.""",
-    tools=all_tools
+    tools=tools_for("itinerary_assistant"),
+    before_tool_callback=bind_tool_log_context,
+    after_tool_callback=reset_tool_log_context
 )
 
 travel_genius_router = Agent(
@@ -367,7 +381,9 @@ OUTPUT INSTRUCTIONS:
 
 You do not generate responses yourself - you only route to the appropriate agent.""",
     sub_agents=[travel_genius, itinerary_assistant],
-    tools=all_tools
+    tools=tools_for("travel_genius_router"),
+    before_tool_callback=bind_tool_log_context,
+    after_tool_callback=reset_tool_log_context
 )
 
 # # ROOT AGENT (Single exposed endpoint)
@@ -387,4 +403,19 @@ You do not generate responses yourself - you only route to the appropriate agent
 
 # EXPORTS FOR ADK API SERVER
 
-root_agent = travel_genius_router
+# Unambiguous requests skip the LLM routing call; the rest go to travel_genius_router
+root_agent = FastPathRouter(
+    name="travel_genius_fast_router",
+    description="Routes clear requests straight to travel_genius / itinerary_assistant, others via the LLM router",
+    sub_agents=[travel_genius_router],
+    min_confidence=float(os.getenv("ROUTER_FAST_PATH_MIN_CONFIDENCE", 0.6)),
+    enabled=os.getenv("ROUTER_FAST_PATH", "1") != "0",
+    use_engine=os.getenv("ITINERARY_ENGINE", "1") != "0",
+)
+
+for problem in check_agents(root_agent):
+    logger.warning("⚠️ Tool registry: %s", problem)
+
+# Build the toolbox / weather / ingestion clients in parallel in the background
+startup.record_import(_import_started)
+startup.start_background_warmup()
@@ -0,0 +1,123 @@
+# benchmarks/bench_bulk_insert.py
+"""
+Row-at-a-time inserts vs DatabaseIntegration.bulk_insert_destinations,
+plus a second bulk pass over the same (unchanged) records.
+
+Needs a local Postgres with the destinations / activities / hotels tables;
+point the CLOUDSQL_* variables at it. Rows are written under "bench-" names
+and deleted afterwards.
+
+    CLOUDSQL_HOST=127.0.0.1 CLOUDSQL_PASSWORD=... python benchmarks/bench_bulk_insert.py --sizes 10 1000 100000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("CLOUDSQL_HOST", "127.0.0.1")
+os.environ.setdefault("MCP_TOOLBOX_URL", "http://127.0.0.1:1")
+
+from services.dynamic_ingestion_service import DatabaseIntegration
+
+ACTIVITIES_PER_DESTINATION = 8
+HOTELS_PER_DESTINATION = 2
+ROWS_PER_DESTINATION = 1 + ACTIVITIES_PER_DESTINATION + HOTELS_PER_DESTINATION
+
+
+def make_records(total_rows: int, tag: str) -> list:
+    records = []
+    for i in range(max(1, total_rows // ROWS_PER_DESTINATION)):
+        name = f"bench-{tag}-{i}"
+        records.append({
+            "destination_info": {"name": name, "country": "Benchland", "category": "City",
+                                 "description": "benchmark row"},
+            "activities": [{"name": f"{name}-activity-{j}", "type": "cultural", "price": 500,
+                            "description": "benchmark row"} for j in range(ACTIVITIES_PER_DESTINATION)],
+            "hotels": [{"name": f"{name}-hotel-{j}", "location": name, "price_tier": "Mid-range"}
+                       for j in range(HOTELS_PER_DESTINATION)],
+        })
+    return records
+
+
+def row_at_a_time(db: DatabaseIntegration, records: list) -> None:
+    """The previous insert_discovered_destination: one execute (round-trip) per row"""
+    with db.pool.connection() as conn:
+        with conn.cursor() as cursor:
+            for record in records:
+                info = record["destination_info"]
+                cursor.execute("""
+                    INSERT INTO destinations (name, country, category, description, best_season, avg_temperature, sustainability_rating, hidden_gem)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (name) DO UPDATE SET updated_at = CURRENT_TIMESTAMP
+                    RETURNING id;
+                    """, (info["name"], info["country"], info["category"], info["description"],
+                          "Year-round", 25, 7, False))
+                destination_id = cursor.fetchone()[0]
+                for activity in record["activities"]:
+                    cursor.execute("""
+                        INSERT INTO activities (destination_id, name, type, price, duration_hours, sustainability_score, hidden_gem, description)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                        ON CONFLICT DO NOTHING;
+                        """, (destination_id, activity["name"], activity["type"], activity["price"], 2, 7, False,
+                              activity["description"]))
+                for hotel in record["hotels"]:
+                    cursor.execute("""
+                        INSERT INTO hotels (name, location, price_tier, rating, sustainability_score, amenities, checkin_date)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s)
+                        ON CONFLICT DO NOTHING;
+                        """, (hotel["name"], hotel["location"], hotel["price_tier"], 4.0, 7, ["WiFi"],
+                              datetime.now().date()))
+        conn.commit()
+
+
+def cleanup(db: DatabaseIntegration) -> None:
+    with db.pool.connection() as conn:
+        with conn.cursor() as cursor:
+            for table in ("activities", "hotels"):
+                cursor.execute(f"DELETE FROM {table} WHERE name LIKE 'bench-%%' OR destination_id IN "
+                               "(SELECT id FROM destinations WHERE name LIKE 'bench-%%');")
+            cursor.execute("DELETE FROM destinations WHERE name LIKE 'bench-%%';")
+        conn.commit()
+
+
+def timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main(args) -> None:
+    db = DatabaseIntegration()
+    db.ensure_schema()
+    cleanup(db)
+    print(f"{'rows':>8} {'row-at-a-time':>16} {'bulk':>16} {'speedup':>8} {'re-ingest (unchanged)':>22}")
+    try:
+        for size in args.sizes:
+            legacy_records = make_records(size, f"legacy{size}")
+            bulk_records = make_records(size, f"bulk{size}")
+            rows = len(bulk_records) * ROWS_PER_DESTINATION
+
+            if size <= args.max_legacy_rows:
+                legacy = timed(lambda: row_at_a_time(db, legacy_records))
+                legacy_rate = f"{rows / legacy:12.0f} r/s"
+            else:
+                legacy, legacy_rate = None, "skipped".rjust(16)
+            bulk = timed(lambda: db.bulk_insert_destinations(bulk_records, page_size=args.page_size))
+            reingest = timed(lambda: db.bulk_insert_destinations(bulk_records, page_size=args.page_size))
+            speedup = f"{legacy / bulk:7.1f}x" if legacy else "-".rjust(8)
+            print(f"{rows:>8} {legacy_rate:>16} {rows / bulk:12.0f} r/s {speedup} {rows / reingest:18.0f} r/s")
+            cleanup(db)
+    finally:
+        cleanup(db)
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--max-legacy-rows", type=int, default=100000,
+                        help="skip the row-at-a-time run above this many rows")
+    main(parser.parse_args())
@@ -0,0 +1,90 @@
+# benchmarks/bench_db_pool.py
+"""
+psycopg2.connect() per operation vs DatabaseIntegration's connection pool.
+
+Point the CLOUDSQL_* variables at a local Postgres (no tables needed):
+
+    CLOUDSQL_HOST=127.0.0.1 CLOUDSQL_PASSWORD=... python benchmarks/bench_db_pool.py --ops 500 --threads 8
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psycopg2
+
+from services.connection_pool import ConnectionPool
+
+
+def connection_params() -> dict:
+    return {
+        'host': os.getenv('CLOUDSQL_HOST', '127.0.0.1'),
+        'database': os.getenv('CLOUDSQL_DBNAME', 'postgres'),
+        'user': os.getenv('CLOUDSQL_USER', 'postgres'),
+        'password': os.getenv('CLOUDSQL_PASSWORD'),
+        'port': int(os.getenv('CLOUDSQL_PORT', 5432)),
+    }
+
+
+def connect_per_op(params: dict) -> None:
+    """The pre-pool behaviour of test_connection()"""
+    conn = psycopg2.connect(**params)
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1;")
+    cursor.fetchone()
+    cursor.close()
+    conn.close()
+
+
+def pooled_op(pool: ConnectionPool) -> None:
+    with pool.connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1;")
+            cursor.fetchone()
+
+
+def run(fn, ops: int, threads: int):
+    def timed(_):
+        t0 = time.perf_counter()
+        fn()
+        return (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = sorted(executor.map(timed, range(ops)))
+    return latencies, time.perf_counter() - t0
+
+
+def report(name: str, latencies: list, wall: float) -> None:
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{name:<18} p50={statistics.median(latencies):7.2f}ms  p99={p99:7.2f}ms  "
+          f"throughput={len(latencies) / wall:8.1f} ops/s")
+
+
+def main(args) -> None:
+    params = connection_params()
+    pool = ConnectionPool(lambda: psycopg2.connect(**params), max_size=args.pool_size)
+    try:
+        per_op = run(lambda: connect_per_op(params), args.ops, args.threads)
+        pooled = run(lambda: pooled_op(pool), args.ops, args.threads)
+    finally:
+        stats = pool.stats()
+        pool.close()
+
+    print(f"{args.ops} SELECT 1 operations, {args.threads} threads, pool max_size={args.pool_size}")
+    report("connect per op", *per_op)
+    report("pooled", *pooled)
+    print(f"pool: checkouts={stats['checkouts']} created={stats['created']} waits={stats['waits']} "
+          f"avg_wait={stats['wait_time_avg_ms']}ms max_wait={stats['wait_time_max_ms']}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ops", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--pool-size", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,135 @@
+# benchmarks/bench_itinerary_engine.py
+"""
+Itinerary engine vs the travel_genius agent path: latency and cost per itinerary.
+
+Engine: build_itinerary() over --activities synthetic stored activities of
+mixed types (with day clusters from an in-memory ProximityIndex) and a
+synthetic forecast, for 3 / 5 / 7-day requests. No database or network.
+
+Agent path: a travel_genius generation. By default it is modelled from the
+agent's real prompt (instruction + its tool schemas, as registered) and an
+output the size of the engine's JSON: --llm-calls model calls (tool rounds)
+each re-sending the prompt, at --ttft-ms to first token and --tokens-per-s
+decoding, priced at --price-in / --price-out USD per 1M tokens. With --live
+(and Gemini credentials in the environment) the agent is actually run once
+per request and its usage metadata is reported instead.
+
+    python benchmarks/bench_itinerary_engine.py --activities 60 --repeat 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.itinerary_engine import build_itinerary
+from services.proximity_index import ProximityIndex
+
+TYPES = ["cultural", "cultural", "adventure", "adventure", "food", "attraction", "attraction"]
+
+
+def make_activities(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [{
+        "id": i, "name": f"Bench Place {i}", "type": TYPES[i % len(TYPES)],
+        "price": rng.choice([0, 200, 500, 1200, 2500]), "duration_hours": rng.choice([1, 2, 3, 4]),
+        "sustainability_score": rng.randint(5, 9), "hidden_gem": i % 9 == 0, "rating": rng.choice([None, 4.1, 4.6]),
+        "description": f"A {TYPES[i % len(TYPES)]} stop", "latitude": 15.3 + rng.uniform(-0.2, 0.2),
+        "longitude": 73.9 + rng.uniform(-0.2, 0.2),
+    } for i in range(n)]
+
+
+def make_forecast(days: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [{"condition": rng.choice(["clear sky", "light rain", "scattered clouds"]),
+             "suitability_scores": {"outdoor": rng.randint(3, 9), "indoor": rng.randint(6, 8),
+                                    "beach": rng.randint(3, 9)},
+             "recommendations": []} for _ in range(days)]
+
+
+def agent_prompt_tokens() -> int:
+    """travel_genius instruction + its tool schemas, ~4 characters per token (as tools.registry --report)"""
+    from agent import travel_genius
+    from tools.registry import FUNCTION_TOOLS, schema_tokens, tool_names_for
+    schema = sum(schema_tokens(FUNCTION_TOOLS[n]._get_declaration())
+                 for n in tool_names_for("travel_genius") if n in FUNCTION_TOOLS)
+    # toolbox tools: not loaded here; count them at the average FunctionTool size
+    toolbox = [n for n in tool_names_for("travel_genius") if n not in FUNCTION_TOOLS]
+    schema += len(toolbox) * schema // max(1, len(tool_names_for("travel_genius")) - len(toolbox))
+    return len(travel_genius.instruction) // 4 + schema
+
+
+async def run_live(request: dict) -> dict:
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+    from agent import travel_genius
+    runner = InMemoryRunner(agent=travel_genius, app_name="bench")
+    session = await runner.session_service.create_session(app_name="bench", user_id="bench")
+    text = (f"Plan a {request['days']}-day trip to {request['destination']} with a budget of {request['budget']}"
+            f" for a {request['personality'].lower()} traveller")
+    started = time.perf_counter()
+    usage = {"prompt": 0, "output": 0, "calls": 0}
+    async for event in runner.run_async(user_id="bench", session_id=session.id,
+                                        new_message=types.Content(role="user", parts=[types.Part(text=text)])):
+        if event.usage_metadata:
+            usage["calls"] += 1
+            usage["prompt"] += event.usage_metadata.prompt_token_count or 0
+            usage["output"] += event.usage_metadata.candidates_token_count or 0
+    usage["ms"] = (time.perf_counter() - started) * 1000
+    return usage
+
+
+def main(args) -> None:
+    activities = make_activities(args.activities)
+    index = ProximityIndex(lambda: [("activity", a["id"], f"bench-{a['id']}", 1, a["name"], a["type"],
+                                     a["latitude"], a["longitude"]) for a in activities], refresh_interval=0)
+    index.refresh()
+    prompt_tokens = agent_prompt_tokens() if not args.skip_agent else 0
+
+    print(f"{args.activities} stored activities, {args.repeat} runs per request\n")
+    print(f"{'request':<10}{'engine p50 ms':>14}{'p99 ms':>9}{'out tok':>9}"
+          f"{'agent ms':>10}{'agent $':>11}{'engine $':>10}")
+    for days in (3, 5, 7):
+        request = {"destination": "Benchtown", "days": days, "budget": 12_000 * days, "groupSize": 2,
+                   "personality": "ADVENTURE"}
+        forecast = make_forecast(days)
+        samples = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            groups = [[p["name"] for p in cluster] for cluster in index.cluster(1, days)]
+            itinerary = build_itinerary(request, activities, forecast, groups)
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        output_tokens = len(json.dumps(itinerary, ensure_ascii=False)) // 4
+        if args.live:
+            usage = asyncio.run(run_live(request))
+            agent_ms, prompt_total, output_total = usage["ms"], usage["prompt"], usage["output"]
+        else:
+            prompt_total = args.llm_calls * prompt_tokens
+            output_total = output_tokens + (args.llm_calls - 1) * 50  # tool-call turns emit a short call each
+            agent_ms = args.llm_calls * args.ttft_ms + output_total / args.tokens_per_s * 1000
+        agent_usd = (prompt_total * args.price_in + output_total * args.price_out) / 1e6
+        print(f"{days}-day{'':<5}{statistics.median(samples):>14.2f}{samples[int(len(samples) * 0.99) - 1]:>9.2f}"
+              f"{output_tokens:>9}{agent_ms:>10.0f}{agent_usd:>11.5f}{0:>10}")
+    if not args.live:
+        print(f"\nagent path modelled: {args.llm_calls} calls x {prompt_tokens} prompt tokens, "
+              f"{args.ttft_ms:.0f} ms to first token, {args.tokens_per_s:.0f} tokens/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--activities", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--llm-calls", type=int, default=3, help="model calls per generation (tool rounds)")
+    parser.add_argument("--ttft-ms", type=float, default=600.0)
+    parser.add_argument("--tokens-per-s", type=float, default=150.0)
+    parser.add_argument("--price-in", type=float, default=0.10, help="USD per 1M input tokens")
+    parser.add_argument("--price-out", type=float, default=0.40, help="USD per 1M output tokens")
+    parser.add_argument("--live", action="store_true", help="run the real travel_genius agent (needs credentials)")
+    parser.add_argument("--skip-agent", action="store_true", help="don't import agent.py for the prompt size")
+    main(parser.parse_args())
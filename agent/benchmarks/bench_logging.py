@@ -0,0 +1,60 @@
+# benchmarks/bench_logging.py
+"""
+Per-request logging/printing overhead of WeatherService on a warm cache.
+
+Every call is served from the cache, so what remains is scoring plus whatever
+the service writes to stdout/logs. Output goes to a real file so write
+syscalls are counted.
+
+    python benchmarks/bench_logging.py --calls 2000
+    LOG_LEVEL=DEBUG python benchmarks/bench_logging.py
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("WEATHER_API_KEY", "benchmark")
+
+from benchmarks.stub_weather_server import StubWeatherServer
+from services.weather_service import WeatherService
+
+
+async def main(args) -> None:
+    server = StubWeatherServer()
+    base = await server.start()
+    sink = tempfile.TemporaryFile(mode="w")
+    try:
+        with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+            try:
+                from utils.logging_helper import configure_logging
+                configure_logging(stream=sink)
+            except ImportError:
+                pass  # pre-logging versions of the service only print
+            service = WeatherService()
+            service.base_url_current = f"{base}/weather"
+            service.base_url_forecast = f"{base}/forecast"
+            await service.get_weather_report("Goa", duration_days=5)  # warm the cache
+
+            t0 = time.perf_counter()
+            for _ in range(args.calls):
+                await service.get_weather_report("Goa", duration_days=5)
+            elapsed = time.perf_counter() - t0
+            written = sink.tell()
+            await service.close()
+    finally:
+        sink.close()
+        await server.stop()
+
+    print(f"{args.calls} warm get_weather_report calls: "
+          f"{elapsed / args.calls * 1e6:.1f}us/request, {written / args.calls:.0f} bytes logged/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=2000)
+    asyncio.run(main(parser.parse_args()))
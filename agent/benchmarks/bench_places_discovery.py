@@ -0,0 +1,81 @@
+# benchmarks/bench_places_discovery.py
+"""
+Single searchNearby (the previous activity discovery) vs PlacesDiscoveryEngine.
+
+Runs against the local Places stub, so it measures coverage and call
+patterns, not Google's latency. --delay adds a per-request server delay.
+
+    python benchmarks/bench_places_discovery.py --delay 0.15 --budget 8
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiohttp
+
+from benchmarks.stub_places_server import StubPlacesServer
+from services.places_discovery import ACTIVITY_CATEGORIES, PlacesDiscoveryEngine, parse_weights
+
+
+def make_post(session: aiohttp.ClientSession, base_url: str):
+    async def post(method: str, field_mask: str, body: dict, timeout: float) -> dict:
+        async with session.post(f"{base_url}:{method}", json=body, headers={"X-Goog-FieldMask": field_mask},
+                                timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            response.raise_for_status()
+            return await response.json()
+    return post
+
+
+async def legacy(post, center: dict) -> list:
+    """One nearby search over six types, max 15 results, truncated to 10"""
+    result = await post("searchNearby", "places.id,places.types", {
+        "includedTypes": ["tourist_attraction", "museum", "amusement_park", "zoo", "aquarium", "park"],
+        "maxResultCount": 15,
+        "locationRestriction": {"circle": {"center": {"latitude": center["lat"], "longitude": center["lng"]},
+                                           "radius": 25000.0}},
+    }, 15)
+    return [place["types"][0] for place in result.get("places", [])][:10]
+
+
+async def main(args) -> None:
+    server = StubPlacesServer(delay=args.delay)
+    base_url = await server.start()
+    center = server.center
+    try:
+        async with aiohttp.ClientSession() as session:
+            post = make_post(session, base_url)
+
+            t0 = time.perf_counter()
+            legacy_types = await legacy(post, center)
+            legacy_ms = (time.perf_counter() - t0) * 1000
+            legacy_calls = sum(server.hits.values())
+
+            server.hits.clear()
+            engine = PlacesDiscoveryEngine(post, budget=args.budget, max_pages=args.max_pages,
+                                           weights=parse_weights(args.weights))
+            result = await engine.discover(center, 25000.0, ACTIVITY_CATEGORIES)
+            stats = result["stats"]
+    finally:
+        await server.stop()
+
+    print(f"{'':<22}{'results':>8}{'categories':>12}{'API calls':>11}{'wall ms':>10}")
+    print(f"{'single searchNearby':<22}{len(legacy_types):>8}{len(set(legacy_types)):>12}{legacy_calls:>11}{legacy_ms:>10.0f}")
+    print(f"{'discovery engine':<22}{stats['selected']:>8}{sum(1 for n in stats['per_category'].values() if n):>12}"
+          f"{stats['requests']:>11}{stats['elapsed_ms']:>10.0f}")
+    print(f"\nsingle searchNearby types: {dict(Counter(legacy_types))}")
+    print(f"engine per category:       {stats['per_category']}")
+    print(f"engine candidates={stats['candidates']} unique={stats['unique']} timed_out={stats['timed_out']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay", type=float, default=0.15, help="server delay per request (s)")
+    parser.add_argument("--budget", type=float, default=8.0)
+    parser.add_argument("--max-pages", type=int, default=2)
+    parser.add_argument("--weights", default="", help="e.g. rating=1,popularity=0.3,distance=1")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,79 @@
+# benchmarks/bench_places_tiling.py
+"""
+One 25km circle vs a tiled sweep over a sprawling destination.
+
+Serves a synthetic region (default 90km across, 4x the stub city's density)
+from the local Places stub and compares:
+
+  * single circle: PlacesDiscoveryEngine.discover around the centre (what
+    every destination got before)
+  * tiled:         PlacesDiscoveryEngine.discover_area over the viewport
+
+Coverage is the share of the region's 10km grid cells (that hold any place)
+with at least one selected place; "far" is how many selections are more
+than 25km from the centre.
+
+    python benchmarks/bench_places_tiling.py --radius-km 90 --density 4 --delay 0.1
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiohttp
+
+from benchmarks.bench_places_discovery import make_post
+from benchmarks.stub_places_server import StubPlacesServer
+from services.places_discovery import ACTIVITY_CATEGORIES, PlacesDiscoveryEngine
+from utils.geo_helper import circle_viewport, grid_cell, haversine_km
+
+
+def coverage(server: StubPlacesServer, places: list, cell_km: float = 10.0) -> tuple:
+    occupied = {grid_cell(p["location"]["latitude"], p["location"]["longitude"], cell_km) for p in server.places}
+    hit = {grid_cell(p["location"]["latitude"], p["location"]["longitude"], cell_km) for p in places}
+    far = sum(1 for p in places if haversine_km(server.center["lat"], server.center["lng"],
+                                                p["location"]["latitude"], p["location"]["longitude"]) > 25)
+    return len(hit & occupied) / len(occupied), far
+
+
+async def main(args) -> None:
+    server = StubPlacesServer(delay=args.delay, radius_km=args.radius_km, density=args.density)
+    base_url = await server.start()
+    viewport = circle_viewport(server.center, args.radius_km * 700)
+    rows = []
+    try:
+        async with aiohttp.ClientSession() as session:
+            post = make_post(session, base_url)
+            for label in ("single circle", "tiled"):
+                server.hits.clear()
+                engine = PlacesDiscoveryEngine(post, budget=args.budget, tile_radius_m=args.tile_radius * 1000,
+                                               max_tiles=args.max_tiles)
+                if label == "tiled":
+                    result = await engine.discover_area(viewport, ACTIVITY_CATEGORIES)
+                else:
+                    result = await engine.discover(server.center, 25000.0, ACTIVITY_CATEGORIES)
+                selected = [match["place"] for match in result["places"]]
+                cells, far = coverage(server, selected)
+                rows.append((label, result["stats"], len(selected), cells, far, sum(server.hits.values())))
+    finally:
+        await server.stop()
+
+    print(f"region: {len(server.places)} places, {args.radius_km:.0f}km radius\n")
+    print(f"{'':<15}{'selected':>9}{'coverage':>10}{'far':>6}{'API calls':>11}{'wall ms':>9}")
+    for label, stats, selected, cells, far, calls in rows:
+        print(f"{label:<15}{selected:>9}{cells:>9.0%}{far:>6}{calls:>11}{stats['elapsed_ms']:>9.0f}")
+    print(f"\ntiles: {rows[-1][1].get('tiles')}")
+    print(f"tiled per category: {rows[-1][1]['per_category']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--radius-km", type=float, default=90.0, help="radius of the synthetic region")
+    parser.add_argument("--density", type=float, default=4.0, help="places per type, relative to the stub city")
+    parser.add_argument("--delay", type=float, default=0.1, help="server delay per request (s)")
+    parser.add_argument("--budget", type=float, default=8.0)
+    parser.add_argument("--tile-radius", type=float, default=5.0, help="smallest tile radius (km)")
+    parser.add_argument("--max-tiles", type=int, default=24)
+    asyncio.run(main(parser.parse_args()))
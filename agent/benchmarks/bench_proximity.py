@@ -0,0 +1,83 @@
+# benchmarks/bench_proximity.py
+"""
+ProximityIndex query latency vs a plain Python haversine scan over the same rows.
+
+Synthetic data: --destinations cities with --per-destination located
+activities/hotels each. No database needed (the index is fed directly).
+
+    python benchmarks/bench_proximity.py --destinations 500 --per-destination 200
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.proximity_index import ProximityIndex
+from utils.geo_helper import haversine_km, offset_point
+
+
+def make_rows(destinations: int, per_destination: int, seed: int = 3) -> list:
+    rng = random.Random(seed)
+    rows = []
+    for dest_id in range(1, destinations + 1):
+        lat, lng = rng.uniform(8, 34), rng.uniform(69, 95)
+        for i in range(per_destination):
+            kind = "hotel" if i % 5 == 0 else "activity"
+            p_lat, p_lng = offset_point(lat, lng, rng.gauss(0, 6), rng.gauss(0, 6))
+            rows.append((kind, len(rows) + 1, f"bench-{dest_id}-{i}", dest_id, f"{kind} {dest_id}-{i}",
+                         "cultural", p_lat, p_lng))
+    return rows
+
+
+def scan_within(rows: list, lat: float, lng: float, radius_km: float, dest_id: int = None) -> list:
+    hits = [(haversine_km(lat, lng, r[6], r[7]), r) for r in rows if dest_id is None or r[3] == dest_id]
+    return sorted((h for h in hits if h[0] <= radius_km), key=lambda h: h[0])
+
+
+def per_query_ms(fn, queries: list) -> float:
+    t0 = time.perf_counter()
+    for query in queries:
+        fn(*query)
+    return (time.perf_counter() - t0) * 1000 / len(queries)
+
+
+def main(args) -> None:
+    rows = make_rows(args.destinations, args.per_destination)
+    t0 = time.perf_counter()
+    index = ProximityIndex(lambda: rows)
+    index.refresh()
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    rng = random.Random(11)
+    anchors = [rows[rng.randrange(len(rows))] for _ in range(args.queries)]
+    local = [(r[6], r[7], 5.0, r[3]) for r in anchors]
+    regional = [(r[6], r[7], 50.0, None) for r in anchors]
+
+    print(f"{len(rows)} places in {args.destinations} destinations, index build {build_ms:.0f} ms\n")
+    print(f"{'query':<38}{'python scan ms':>15}{'index ms':>10}{'speedup':>9}")
+    for label, queries, indexed in (
+        ("within 5km, same destination", local,
+         lambda lat, lng, radius, dest: index.within(lat, lng, radius, destination_id=dest)),
+        ("within 50km, all destinations", regional,
+         lambda lat, lng, radius, dest: index.within(lat, lng, radius)),
+        ("10 nearest, all destinations", regional,
+         lambda lat, lng, radius, dest: index.nearest(lat, lng, k=10)),
+    ):
+        scan = per_query_ms(lambda lat, lng, radius, dest: scan_within(rows, lat, lng, radius, dest), queries[:20])
+        fast = per_query_ms(indexed, queries)
+        print(f"{label:<38}{scan:>15.2f}{fast:>10.3f}{scan / fast:>8.0f}x")
+
+    cluster_ms = per_query_ms(lambda dest: index.cluster(dest, args.days), [(r[3],) for r in anchors[:50]])
+    print(f"\ncluster one destination into {args.days} days: {cluster_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--destinations", type=int, default=500)
+    parser.add_argument("--per-destination", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--days", type=int, default=4)
+    main(parser.parse_args())
@@ -0,0 +1,79 @@
+# benchmarks/bench_routing.py
+"""
+Accuracy and latency of the fast-path router's intent classifier.
+
+Runs every query of a labeled set (benchmarks/routing_queries.jsonl: query,
+has_itinerary, intent) through the keyword baseline (determine_intent) and
+classify_intent, then for each confidence threshold reports how many
+queries the fast path would dispatch directly, how many of those it routes
+correctly, and the LLM routing time that saves (--llm-ms per routed turn).
+Misrouted fast-path queries are listed for the chosen --threshold.
+
+    python benchmarks/bench_routing.py --threshold 0.6
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.routing_helper import classify_intent, determine_intent
+
+DEFAULT_QUERIES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "routing_queries.jsonl")
+
+
+def load_queries(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def time_classifier(queries: list, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        for q in queries:
+            started = time.perf_counter()
+            classify_intent(q["query"], q["has_itinerary"])
+            samples.append((time.perf_counter() - started) * 1e6)
+    return sorted(samples)
+
+
+def main(args) -> None:
+    queries = load_queries(args.queries)
+    decisions = [classify_intent(q["query"], q["has_itinerary"]) for q in queries]
+    baseline = sum(determine_intent(q["query"], q["has_itinerary"]) == q["intent"] for q in queries)
+    correct = sum(d["intent"] == q["intent"] for d, q in zip(decisions, queries))
+    print(f"{len(queries)} labeled queries")
+    print(f"keyword baseline (determine_intent) accuracy: {baseline / len(queries):.1%}")
+    print(f"classify_intent accuracy (all queries):        {correct / len(queries):.1%}\n")
+
+    print(f"{'threshold':>9}{'fast path':>11}{'accuracy':>10}{'misroutes':>11}{'LLM s saved':>13}")
+    for threshold in args.thresholds:
+        fast = [(d, q) for d, q in zip(decisions, queries) if d["confidence"] >= threshold]
+        right = sum(d["intent"] == q["intent"] for d, q in fast)
+        accuracy = right / len(fast) if fast else float("nan")
+        print(f"{threshold:>9.2f}{len(fast) / len(queries):>11.1%}{accuracy:>10.1%}{len(fast) - right:>11}"
+              f"{len(fast) * args.llm_ms / 1000:>13.1f}")
+
+    misroutes = [(d, q) for d, q in zip(decisions, queries)
+                 if d["confidence"] >= args.threshold and d["intent"] != q["intent"]]
+    if misroutes:
+        print(f"\nfast-path misroutes at {args.threshold}:")
+        for d, q in misroutes:
+            print(f"  {q['query']!r}: {d['intent']} ({d['confidence']}) expected {q['intent']} {d['signals']}")
+
+    samples = time_classifier(queries, args.repeat)
+    print(f"\nclassify_intent latency: p50 {statistics.median(samples):.1f} us, "
+          f"p99 {samples[int(len(samples) * 0.99) - 1]:.1f} us (LLM routing turn ~{args.llm_ms:.0f} ms)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", default=DEFAULT_QUERIES)
+    parser.add_argument("--threshold", type=float, default=0.6, help="ROUTER_FAST_PATH_MIN_CONFIDENCE to inspect")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.4, 0.5, 0.6, 0.7, 0.8])
+    parser.add_argument("--llm-ms", type=float, default=900.0, help="latency of one LLM routing call")
+    parser.add_argument("--repeat", type=int, default=200)
+    main(parser.parse_args())
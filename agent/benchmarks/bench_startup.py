@@ -0,0 +1,99 @@
+# benchmarks/bench_startup.py
+"""
+Cold-start cost of the agent module: lazy + parallel warm-up vs eager + serial.
+
+Each run is a fresh interpreter that imports agent.py against a local
+toolbox stub (--toolbox-delay simulates a slow toolbox server):
+
+  * eager serial:  import, then build toolbox toolset, weather service and
+                   ingestion service one after another (what importing
+                   agent.py used to do)
+  * lazy:          import only (time until the ADK server can start serving)
+  * lazy + warm:   import, then services.startup.warm_up() (parallel)
+  * toolbox down:  import + warm-up with MCP_TOOLBOX_URL pointing nowhere
+
+No database is needed: the ingestion service connects lazily and its index
+loads fail in the background.
+
+    python benchmarks/bench_startup.py --runs 3 --toolbox-delay 0.5
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_toolbox_server import StubToolboxServer
+
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {agent_dir!r})
+import agent
+imported = (time.perf_counter() - started) * 1000
+from services import startup
+if {mode!r} == "serial":
+    for name, build in startup.COMPONENTS.items():
+        try:
+            build()
+        except Exception:
+            pass
+    status = startup.readiness()
+elif {mode!r} == "warm":
+    status = startup.warm_up(timeout=30)
+else:
+    status = startup.readiness()
+total = (time.perf_counter() - started) * 1000
+print(json.dumps({{"import_ms": imported, "total_ms": total, "ready": status["ready"],
+                  "components": {{k: v.get("init_ms") if v.get("ready") else "not ready"
+                                 for k, v in status["components"].items()}}}}))
+"""
+
+
+async def run_child(mode: str, env: dict) -> dict:
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-c", CHILD.format(agent_dir=AGENT_DIR, mode=mode), env=env,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+    stdout, _ = await process.communicate()
+    lines = stdout.decode().strip().splitlines()
+    if process.returncode != 0 or not lines:
+        return {"import_ms": float("nan"), "total_ms": float("nan"), "ready": False, "components": {}, "crashed": True}
+    return json.loads(lines[-1])
+
+
+async def main(args) -> None:
+    server = StubToolboxServer(delay=args.toolbox_delay)
+    toolbox_url = await server.start()
+    base_env = dict(os.environ, STARTUP_WARMUP="0", WEATHER_API_KEY="bench", GOOGLE_MAPS_API_KEY="bench",
+                    CLOUDSQL_HOST=os.getenv("CLOUDSQL_HOST", "127.0.0.1"),
+                    CLOUDSQL_PASSWORD=os.getenv("CLOUDSQL_PASSWORD", "bench"), PLACES_CACHE_PATH="off",
+                    LOG_LEVEL="WARNING")
+    scenarios = [
+        ("eager serial", "serial", toolbox_url),
+        ("lazy (import only)", "import", toolbox_url),
+        ("lazy + warm-up", "warm", toolbox_url),
+        ("toolbox down", "warm", "http://127.0.0.1:1"),
+    ]
+    try:
+        print(f"{'':<22}{'import ms':>10}{'ready ms':>10}{'ready':>7}  component build ms")
+        for label, mode, url in scenarios:
+            runs = [await run_child(mode, dict(base_env, MCP_TOOLBOX_URL=url)) for _ in range(args.runs)]
+            last = runs[-1]
+            ready_ms = statistics.median(r["total_ms"] for r in runs) if mode != "import" else float("nan")
+            print(f"{label:<22}{statistics.median(r['import_ms'] for r in runs):>10.0f}{ready_ms:>10.0f}"
+                  f"{str(last['ready']):>7}  {last['components']}")
+    finally:
+        await server.stop()
+    print(f"\ntoolbox manifest requests: {server.hits['toolset']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--toolbox-delay", type=float, default=0.5, help="seconds before the manifest is served")
+    asyncio.run(main(parser.parse_args()))
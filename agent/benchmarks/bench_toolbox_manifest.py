@@ -0,0 +1,76 @@
+# benchmarks/bench_toolbox_manifest.py
+"""
+Scale-out of N workers against one toolbox server: cold vs warm manifest cache.
+
+Starts --workers fresh interpreters at once, each loading the
+travel_genius_toolset the way the agent does (services.toolbox_service),
+against a local toolbox stub that takes --toolbox-delay seconds per
+manifest. Reported per scenario: manifest downloads the server saw and the
+median / slowest time for a worker to have its tools.
+
+  * no cache:    MCP_TOOLBOX_CACHE_DIR=off (every worker downloads)
+  * cold cache:  empty cache directory (first boot of a fleet)
+  * warm cache:  the directory the cold run just filled
+
+    python benchmarks/bench_toolbox_manifest.py --workers 16 --toolbox-delay 0.5
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_toolbox_server import StubToolboxServer
+
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, sys, time
+sys.path.insert(0, {agent_dir!r})
+from services.toolbox_service import travel_toolset, get_toolbox_service
+started = time.perf_counter()
+tools = travel_toolset.load()
+print(json.dumps({{"load_ms": (time.perf_counter() - started) * 1000, "tools": len(tools),
+                  **get_toolbox_service().stats()}}))
+"""
+
+
+async def run_child(env: dict) -> dict:
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-c", CHILD.format(agent_dir=AGENT_DIR), env=env,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+    stdout, _ = await process.communicate()
+    lines = stdout.decode().strip().splitlines()
+    if process.returncode != 0 or not lines:
+        return {"load_ms": float("nan"), "tools": 0, "crashed": True}
+    return json.loads(lines[-1])
+
+
+async def main(args) -> None:
+    server = StubToolboxServer(delay=args.toolbox_delay)
+    toolbox_url = await server.start()
+    cache_dir = tempfile.mkdtemp(prefix="toolbox-manifest-")
+    base_env = dict(os.environ, MCP_TOOLBOX_URL=toolbox_url, MCP_TOOLBOX_MANIFEST_CHECK="0", LOG_LEVEL="WARNING")
+    scenarios = [("no cache", "off"), ("cold cache", cache_dir), ("warm cache", cache_dir)]
+    try:
+        print(f"{'':<14}{'workers':>8}{'downloads':>11}{'median ms':>11}{'max ms':>9}{'tools':>7}")
+        for label, directory in scenarios:
+            before = server.hits["toolset"]
+            env = dict(base_env, MCP_TOOLBOX_CACHE_DIR=directory)
+            runs = await asyncio.gather(*(run_child(env) for _ in range(args.workers)))
+            load_ms = [r["load_ms"] for r in runs]
+            print(f"{label:<14}{args.workers:>8}{server.hits['toolset'] - before:>11}"
+                  f"{statistics.median(load_ms):>11.0f}{max(load_ms):>9.0f}{min(r['tools'] for r in runs):>7}")
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--toolbox-delay", type=float, default=0.5, help="seconds before the manifest is served")
+    asyncio.run(main(parser.parse_args()))
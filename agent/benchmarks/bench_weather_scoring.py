@@ -0,0 +1,81 @@
+# benchmarks/bench_weather_scoring.py
+"""
+Scalar get_weather_suitability_score loop vs the vectorized WeatherScoringEngine.
+
+Checks that both produce identical scores, then times days x activity types.
+
+    python benchmarks/bench_weather_scoring.py
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("WEATHER_API_KEY", "benchmark")
+
+from services.weather_scoring import CATEGORY_TYPES, WeatherScoringEngine
+from services.weather_service import WeatherService
+
+CONDITIONS = ["clear sky", "few clouds", "broken clouds", "light rain", "moderate rain",
+              "thunderstorm", "light drizzle", "sunny", "mist", "heavy intensity rain"]
+ACTIVITY_TYPES = ([t for types in CATEGORY_TYPES.values() for t in types]
+                  + ["Outdoor", "BEACH", "food", "nightlife", "spa", "transport", "instagram", "attraction", "party"])[:20]
+
+
+def random_day(rng: random.Random) -> dict:
+    return {
+        "condition": rng.choice(CONDITIONS),
+        "avg_temp": rng.uniform(-5, 45),
+        "precipitation": rng.choice([0, 0, rng.uniform(0, 25)]),
+        "wind_speed": rng.uniform(0, 45),
+    }
+
+
+def edge_days() -> list:
+    return [
+        {}, {"condition": None}, {"avg_temp": None}, {"avg_temp": "25"}, {"avg_temp": float("nan")},
+        {"avg_temp": 20, "precipitation": 10, "wind_speed": 30}, {"avg_temp": 28, "wind_speed": 10},
+        {"avg_temp": 35, "precipitation": 2, "wind_speed": 25}, {"avg_temp": 25, "condition": "SUNNY"},
+        {"avg_temp": 10, "wind_speed": 20}, {"avg_temp": 40.0001}, "not-a-dict",
+    ]
+
+
+def scalar(service: WeatherService, days: list, types: list) -> list:
+    return [[service.get_weather_suitability_score(d, t) for t in types] for d in days]
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main() -> None:
+    rng = random.Random(7)
+    service = WeatherService()
+    engine = WeatherScoringEngine()
+
+    check_days = edge_days() + [random_day(rng) for _ in range(5000)]
+    check_types = ACTIVITY_TYPES + [None, 42]
+    with contextlib.redirect_stdout(io.StringIO()):  # the reference scorer prints its fallbacks
+        expected = scalar(service, check_days, check_types)
+    assert engine.score_matrix(check_days, check_types).tolist() == expected, \
+        "vectorized scores diverge from the reference implementation"
+    print(f"equivalence: {len(check_days) * len(check_types)} day/activity pairs match\n")
+
+    print(f"{'days':>5} x {'types':<5} {'scalar':>10} {'vectorized':>12} {'speedup':>8}")
+    for n_days in (5, 16, 365):
+        days = [random_day(rng) for _ in range(n_days)]
+        slow = best_of(lambda: scalar(service, days, ACTIVITY_TYPES), 20)
+        fast = best_of(lambda: engine.score_matrix(days, ACTIVITY_TYPES), 20)
+        print(f"{n_days:>5} x {len(ACTIVITY_TYPES):<5} {slow:>8.3f}ms {fast:>10.3f}ms {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
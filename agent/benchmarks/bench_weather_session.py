@@ -0,0 +1,90 @@
+# benchmarks/bench_weather_session.py
+"""
+Per-call ClientSession vs the shared pooled session in WeatherService.
+
+Runs against a local stub server, so the numbers show connection setup and
+pool overhead only (no TLS; real-world savings against OpenWeatherMap are larger).
+
+    python benchmarks/bench_weather_session.py --requests 500 --concurrency 20
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("WEATHER_API_KEY", "benchmark")
+
+import aiohttp
+
+from benchmarks.stub_weather_server import StubWeatherServer
+from services.weather_service import WeatherService
+
+
+async def legacy_fetch(url: str, timeout: int = 10) -> dict:
+    """The pre-pool behaviour: a brand new session per request"""
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+        async with session.get(url) as response:
+            response.raise_for_status()
+            return await response.json()
+
+
+async def run(fetch, url: str, total: int, concurrency: int) -> list:
+    latencies = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            t0 = time.perf_counter()
+            await fetch(url)
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(total)))
+    return latencies
+
+
+def report(name: str, latencies: list, wall: float) -> None:
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{name:<16} p50={p50:7.2f}ms  p99={p99:7.2f}ms  "
+          f"throughput={len(latencies) / wall:8.1f} req/s")
+
+
+async def main(args) -> None:
+    server = StubWeatherServer(delay=args.delay)
+    base = await server.start()
+    url = f"{base}/forecast?q=Goa"
+    service = WeatherService()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            # warm both paths once so import/first-connect costs are excluded
+            await legacy_fetch(url)
+            await service._fetch_json(url)
+
+            t0 = time.perf_counter()
+            legacy = await run(legacy_fetch, url, args.requests, args.concurrency)
+            legacy_wall = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            pooled = await run(service._fetch_json, url, args.requests, args.concurrency)
+            pooled_wall = time.perf_counter() - t0
+    finally:
+        await service.close()
+        await server.stop()
+
+    print(f"{args.requests} requests, concurrency={args.concurrency}, server delay={args.delay * 1000:.0f}ms")
+    report("per-call session", legacy, legacy_wall)
+    report("pooled session", pooled, pooled_wall)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.005)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,121 @@
+# benchmarks/stub_places_server.py
+"""Local Places API (New) look-alike used by the benchmarks (no API key needed).
+
+Serves a synthetic city whose place mix is skewed like a real one: many more
+restaurants and attractions than zoos or museums. searchNearby returns the
+most popular matches inside the locationRestriction circle (max 20);
+searchText filters by includedType and paginates with nextPageToken (max 60,
+like the real API). radius_km / density make a sprawling region instead of
+a city.
+"""
+import asyncio
+import math
+import random
+from collections import Counter
+from typing import Dict, List
+
+from aiohttp import web
+
+from utils.geo_helper import circle_viewport, haversine_km
+
+CITY_MIX = {
+    "tourist_attraction": 120, "restaurant": 200, "bar": 60, "night_club": 15, "museum": 25,
+    "art_gallery": 10, "historical_landmark": 15, "park": 30, "amusement_park": 4, "zoo": 2,
+    "aquarium": 1, "shopping_mall": 12, "lodging": 80,
+}
+
+
+def make_city(center: Dict[str, float], radius_km: float = 20.0, seed: int = 7, density: float = 1.0) -> List[dict]:
+    rng = random.Random(seed)
+    places = []
+    for place_type, count in CITY_MIX.items():
+        for i in range(max(1, round(count * density))):
+            # denser towards the centre, like most cities
+            distance = radius_km * rng.random() ** 2
+            bearing = rng.uniform(0, 2 * math.pi)
+            lat = center["lat"] + distance / 111.0 * math.cos(bearing)
+            lng = center["lng"] + distance / (111.0 * math.cos(math.radians(center["lat"]))) * math.sin(bearing)
+            places.append({
+                "id": f"stub-{place_type}-{i}",
+                "displayName": {"text": f"{place_type.replace('_', ' ').title()} {i}"},
+                "formattedAddress": f"{i} Stub Street, Stubville",
+                "location": {"latitude": round(lat, 6), "longitude": round(lng, 6)},
+                "rating": round(rng.uniform(3.4, 4.9), 1),
+                "userRatingCount": int(rng.paretovariate(1.2) * 80),
+                "types": [place_type, "point_of_interest", "establishment"],
+                "priceLevel": rng.choice(["PRICE_LEVEL_INEXPENSIVE", "PRICE_LEVEL_MODERATE", "PRICE_LEVEL_EXPENSIVE"]),
+            })
+    return places
+
+
+class StubPlacesServer:
+    """searchText / searchNearby over a synthetic city, with an optional artificial delay"""
+
+    def __init__(self, center: Dict[str, float] = None, delay: float = 0.0, port: int = 0,
+                 radius_km: float = 20.0, density: float = 1.0):
+        self.center = center or {"lat": 15.4909, "lng": 73.8278}
+        self.delay = delay
+        self.port = port
+        self.radius_km = radius_km
+        self.places = make_city(self.center, radius_km, density=density)
+        self.hits: Counter = Counter()
+        self._runner = None
+
+    def city_place(self, name: str) -> dict:
+        return {"id": f"stub-city-{name.lower()}", "displayName": {"text": name},
+                "formattedAddress": f"{name}, Stubland",
+                "location": {"latitude": self.center["lat"], "longitude": self.center["lng"]},
+                "rating": 4.5, "userRatingCount": 12000, "types": ["locality", "political"],
+                # bounding box of the built-up core, not of every outlying place
+                "viewport": circle_viewport(self.center, self.radius_km * 700)}
+
+    async def _search_text(self, request: web.Request) -> web.Response:
+        self.hits["searchText"] += 1
+        body = await request.json()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        included = body.get("includedType")
+        if included == "locality":
+            return web.json_response({"places": [self.city_place(body.get("textQuery", "Stubville"))]})
+        matches = [p for p in self.places if not included or included in p["types"]]
+        matches.sort(key=lambda p: p["rating"] * math.log10(2 + p["userRatingCount"]), reverse=True)
+        matches = matches[:60]
+        offset = int(body.get("pageToken") or 0)
+        size = min(20, int(body.get("pageSize", 20)))
+        response = {"places": matches[offset:offset + size]}
+        if offset + size < len(matches):
+            response["nextPageToken"] = str(offset + size)
+        return web.json_response(response)
+
+    async def _search_nearby(self, request: web.Request) -> web.Response:
+        self.hits["searchNearby"] += 1
+        body = await request.json()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        included = set(body.get("includedTypes") or [])
+        circle = (body.get("locationRestriction") or {}).get("circle")
+        matches = [p for p in self.places if (not included or included & set(p["types"]))
+                   and (not circle or self._inside(p, circle))]
+        matches.sort(key=lambda p: p["userRatingCount"], reverse=True)
+        return web.json_response({"places": matches[:min(20, int(body.get("maxResultCount", 20)))]})
+
+    @staticmethod
+    def _inside(place: dict, circle: dict) -> bool:
+        location, center = place["location"], circle["center"]
+        distance = haversine_km(location["latitude"], location["longitude"], center["latitude"], center["longitude"])
+        return distance * 1000 <= circle["radius"]
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_post("/v1/places:searchText", self._search_text)
+        app.router.add_post("/v1/places:searchNearby", self._search_nearby)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{self.port}/v1/places"
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
@@ -0,0 +1,66 @@
+# benchmarks/stub_toolbox_server.py
+"""Local MCP Toolbox look-alike used by the benchmarks.
+
+Serves GET /api/toolset/<name> with a manifest of `tools` string-parameter
+tools (the shape toolbox_core parses) after an optional artificial delay,
+and answers POST /api/tool/<name>/invoke with an empty result.
+"""
+import asyncio
+from collections import Counter
+
+from aiohttp import web
+
+TOOL_NAMES = [
+    "search-destinations", "get-destination-details", "search-activities-by-interest", "get-hidden-gems",
+    "search-hotels-enhanced", "search-transport-options", "calculate-trip-budget", "get-seasonal-events",
+]
+
+
+def make_manifest(tools: int = 8, version: str = "0.14.0") -> dict:
+    names = [TOOL_NAMES[i] if i < len(TOOL_NAMES) else f"stub-tool-{i}" for i in range(tools)]
+    return {
+        "serverVersion": version,
+        "tools": {name: {
+            "description": f"{name.replace('-', ' ')} from the travel database",
+            "parameters": [
+                {"name": "destination", "type": "string", "description": "Destination name"},
+                {"name": "limit", "type": "integer", "required": False, "description": "Maximum rows"},
+            ],
+            "authRequired": [],
+        } for name in names},
+    }
+
+
+class StubToolboxServer:
+    def __init__(self, delay: float = 0.0, tools: int = 8, port: int = 0):
+        self.delay = delay
+        self.manifest = make_manifest(tools)
+        self.port = port
+        self.hits: Counter = Counter()
+        self._runner = None
+
+    async def _toolset(self, request: web.Request) -> web.Response:
+        self.hits["toolset"] += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return web.json_response(self.manifest)
+
+    async def _invoke(self, request: web.Request) -> web.Response:
+        self.hits["invoke"] += 1
+        return web.json_response({"result": "[]"})
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/api/toolset/{name}", self._toolset)
+        app.router.add_get("/api/toolset/", self._toolset)
+        app.router.add_post("/api/tool/{name}/invoke", self._invoke)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{self.port}"
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
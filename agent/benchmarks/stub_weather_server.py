@@ -0,0 +1,83 @@
+# benchmarks/stub_weather_server.py
+"""Local OpenWeatherMap look-alike used by the benchmarks (no API key needed)."""
+import asyncio
+from datetime import datetime, timedelta
+
+from aiohttp import web
+
+
+def make_forecast_payload(days: int = 5, start: datetime = None) -> dict:
+    start = start or datetime(2025, 12, 1)
+    conditions = ["clear sky", "few clouds", "light rain", "scattered clouds", "thunderstorm"]
+    items = []
+    for i in range(days * 8):
+        ts = start + timedelta(hours=3 * i)
+        item = {
+            "dt": int(ts.timestamp()),
+            "dt_txt": ts.strftime("%Y-%m-%d %H:%M:%S"),
+            "main": {
+                "temp": 18 + (i % 8) * 1.7,
+                "temp_min": 16 + (i % 8) * 1.5,
+                "temp_max": 20 + (i % 8) * 1.9,
+                "feels_like": 18 + (i % 8) * 1.6,
+                "humidity": 55 + (i % 5) * 6,
+            },
+            "weather": [{"description": conditions[(i // 8) % len(conditions)]}],
+            "wind": {"speed": 3 + (i % 6) * 4},
+        }
+        if "rain" in item["weather"][0]["description"]:
+            item["rain"] = {"3h": 1.5 + (i % 3)}
+        items.append(item)
+    return {"list": items}
+
+
+def make_current_payload() -> dict:
+    return {"weather": [{"description": "clear sky"}],
+            "main": {"temp": 27.5, "feels_like": 29.0}}
+
+
+class StubWeatherServer:
+    """Serves /weather and /forecast with an optional artificial delay.
+
+    Set `status` to a non-200 code to simulate an upstream outage or a bad city.
+    `script` holds statuses for the next requests, one per hit, before falling
+    back to `status`; error responses carry `retry_after` as a Retry-After header.
+    """
+
+    def __init__(self, delay: float = 0.0, port: int = 0, status: int = 200, retry_after: str = None):
+        self.delay = delay
+        self.status = status
+        self.retry_after = retry_after
+        self.script = []
+        self.port = port
+        self.hits = 0
+        self._runner = None
+        self._forecast = make_forecast_payload()
+        self._current = make_current_payload()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.hits += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        status = self.script.pop(0) if self.script else self.status
+        if status != 200:
+            headers = {"Retry-After": self.retry_after} if self.retry_after is not None else None
+            return web.json_response({"cod": status, "message": "stubbed failure"}, status=status, headers=headers)
+        if request.path.endswith("/forecast"):
+            return web.json_response(self._forecast)
+        return web.json_response(self._current)
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/weather", self._handle)
+        app.router.add_get("/forecast", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{self.port}"
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
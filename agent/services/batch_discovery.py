@@ -0,0 +1,236 @@
+"""
+Batch destination discovery for pre-warming the catalog.
+
+Reads destination names from a file, discovers them through the Places API
+with bounded concurrency (the ingestion service's per-method rate limits
+apply), and writes the results to Cloud SQL in bulk batches.
+
+Progress is checkpointed to a local JSON file after every committed batch,
+so a crashed or interrupted run picks up where it stopped: names already
+stored (or already known to the destination index) are skipped.
+
+Usage:
+    python -m services.batch_discovery names.txt --concurrency 8 --batch-size 25
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.destination_index import CONFIRMED_MATCHES, normalize_name
+from services.dynamic_ingestion_service import DynamicIngestionService
+
+logger = logging.getLogger("BatchDiscovery")
+
+
+def load_names_file(path: str) -> List[str]:
+    """One name per line ('#' starts a comment) or a JSON array of names"""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        return [str(name).strip() for name in json.loads(text) if str(name).strip()]
+    names = []
+    for line in text.splitlines():
+        name = line.split("#", 1)[0].strip()
+        if name:
+            names.append(name)
+    return names
+
+
+class Checkpoint:
+    """Resumable progress: stored, not-found and failed names, keyed by normalized name"""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.done: Dict[str, Optional[int]] = {}
+        self.not_found: Dict[str, str] = {}
+        self.failed: Dict[str, str] = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.done = data.get("done", {})
+            self.not_found = data.get("not_found", {})
+            self.failed = data.get("failed", {})
+            logger.info(f"📌 Resuming from {path}: {len(self.done)} done, "
+                        f"{len(self.not_found)} not found, {len(self.failed)} failed")
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "updated_at": time.time(), "done": self.done,
+                       "not_found": self.not_found, "failed": self.failed}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)  # never leave a half-written checkpoint behind
+
+
+class BatchDiscovery:
+    """Discover many destinations concurrently and store them in bulk batches"""
+
+    def __init__(self,
+                 service: DynamicIngestionService,
+                 concurrency: int = 4,
+                 write_batch_size: int = 25,
+                 checkpoint_path: Optional[str] = ".batch_discovery.json",
+                 skip_existing: bool = True,
+                 retry_not_found: bool = False):
+        self.service = service
+        self.db = service.db_integration
+        self.concurrency = max(1, concurrency)
+        self.write_batch_size = max(1, write_batch_size)
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.skip_existing = skip_existing
+        self.retry_not_found = retry_not_found
+
+        self._buffer: List[Tuple[str, str, Dict[str, Any]]] = []
+        self._errors: Counter = Counter()
+        self._stored = 0
+        self._not_found = 0
+        self._failed = 0
+        self._processed = 0
+        self._db_seconds = 0.0
+
+    def _plan(self, names: List[str]) -> Tuple[List[Tuple[str, str]], Dict[str, int]]:
+        """(key, name) pairs still to discover, plus how many were skipped and why"""
+        skipped = Counter()
+        index = self.db.destination_index
+        use_index = self.skip_existing and index.wait_ready(timeout=10.0)
+        seen = set()
+        pending = []
+        for name in names:
+            key = normalize_name(name)
+            if not key or key in seen:
+                skipped["duplicate"] += 1
+                continue
+            seen.add(key)
+            if key in self.checkpoint.done:
+                skipped["checkpoint"] += 1
+            elif key in self.checkpoint.not_found and not self.retry_not_found:
+                skipped["not_found_before"] += 1
+            elif use_index and self._already_stored(name):
+                skipped["already_stored"] += 1
+            else:
+                pending.append((key, name))
+        return pending, dict(skipped)
+
+    def _already_stored(self, name: str) -> bool:
+        # fuzzy matches are fine for a chat hint, too loose to skip a batch entry on
+        match = self.db.destination_index.lookup(name)
+        return match is not None and match["match"] in CONFIRMED_MATCHES
+
+    async def run(self, names: List[str]) -> Dict[str, Any]:
+        pending, skipped = self._plan(names)
+        logger.info(f"🚀 Batch discovery: {len(pending)} to discover, skipped {skipped}")
+
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        flush_lock = asyncio.Lock()
+
+        async def discover(key: str, name: str) -> None:
+            async with semaphore:
+                try:
+                    data = await self.service.collect_destination(name)
+                except Exception as e:
+                    self._record_failure(key, name, e)
+                    return
+            self._processed += 1
+            if data is None:
+                self._not_found += 1
+                self.checkpoint.not_found[key] = name
+                return
+            self._buffer.append((key, name, data))
+            if len(self._buffer) >= self.write_batch_size:
+                async with flush_lock:
+                    await self._flush()
+            if self._processed % 50 == 0:
+                logger.info(f"⏳ {self._processed}/{len(pending)} discovered, {self._stored} stored")
+
+        await asyncio.gather(*(discover(key, name) for key, name in pending))
+        async with flush_lock:
+            await self._flush()
+        self.checkpoint.save()
+
+        elapsed = time.perf_counter() - started
+        report = {
+            "requested": len(names),
+            "skipped": skipped,
+            "attempted": len(pending),
+            "stored": self._stored,
+            "not_found": self._not_found,
+            "failed": self._failed,
+            "errors": dict(self._errors),
+            "elapsed_seconds": round(elapsed, 2),
+            "db_write_seconds": round(self._db_seconds, 2),
+            "destinations_per_minute": round(self._stored / elapsed * 60, 1) if elapsed else 0.0,
+            "rate_limits": {method: limiter.stats() for method, limiter in self.service.rate_limits.items()},
+            "places_cache": self.service.places_cache_stats(),
+        }
+        logger.info(f"✅ Batch discovery finished: {report['stored']} stored, {report['not_found']} not found, "
+                     f"{report['failed']} failed, {report['destinations_per_minute']} destinations/min")
+        return report
+
+    async def _flush(self) -> None:
+        batch, self._buffer = self._buffer, []
+        if not batch:
+            return
+        t0 = time.perf_counter()
+        try:
+            result = await asyncio.to_thread(self.db.bulk_insert_destinations, [data for _, _, data in batch])
+        except Exception as e:
+            for key, name, _ in batch:
+                self._record_failure(key, name, e)
+            self.checkpoint.save()
+            return
+        finally:
+            self._db_seconds += time.perf_counter() - t0
+
+        for key, name, data in batch:
+            info = data["destination_info"]
+            self.checkpoint.done[key] = result["destination_ids"].get(info["name"])
+            self.checkpoint.failed.pop(key, None)
+            self.checkpoint.not_found.pop(key, None)
+            self.db.destination_index.add_alias(info.get("display_name", ""), info["name"])
+        self._stored += len(batch)
+        self.checkpoint.save()
+
+    def _record_failure(self, key: str, name: str, error: Exception) -> None:
+        self._failed += 1
+        self._errors[type(error).__name__] += 1
+        self.checkpoint.failed[key] = f"{name}: {error}"
+        logger.warning(f"⚠️ Discovery failed for {name}: {error}")
+
+
+async def discover_file(path: str, service: DynamicIngestionService, **options) -> Dict[str, Any]:
+    try:
+        return await BatchDiscovery(service, **options).run(load_names_file(path))
+    finally:
+        await service.close()
+
+
+if __name__ == "__main__":
+    from services.dynamic_ingestion_service import get_ingestion_service
+
+    parser = argparse.ArgumentParser(description="Discover and store many destinations")
+    parser.add_argument("path", help="text file with one destination per line, or a JSON array")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=25, help="destinations per DB write")
+    parser.add_argument("--checkpoint", default=".batch_discovery.json")
+    parser.add_argument("--no-skip-existing", action="store_true",
+                        help="rediscover destinations that are already stored")
+    parser.add_argument("--retry-not-found", action="store_true")
+    args = parser.parse_args()
+
+    report = asyncio.run(discover_file(
+        args.path, get_ingestion_service(),
+        concurrency=args.concurrency,
+        write_batch_size=args.batch_size,
+        checkpoint_path=args.checkpoint,
+        skip_existing=not args.no_skip_existing,
+        retry_not_found=args.retry_not_found,
+    ))
+    print(json.dumps(report, indent=2))
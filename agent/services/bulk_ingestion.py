@@ -0,0 +1,94 @@
+"""
+Bulk ingestion of pre-collected destination data into Cloud SQL.
+
+Loads destination records from a JSON array or JSON Lines file and writes
+them in batches through DatabaseIntegration.bulk_insert_destinations, one
+transaction per batch.
+
+Each record has the same shape discover_missing_destination stores:
+
+    {"destination_info": {"name": ..., "country": ...}, "activities": [...], "hotels": [...]}
+
+Usage:
+    python -m services.bulk_ingestion destinations.jsonl --batch-size 200
+"""
+
+import argparse
+import json
+import logging
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+from services.dynamic_ingestion_service import DatabaseIntegration
+
+logger = logging.getLogger("BulkIngestion")
+
+
+def load_destinations_file(path: str) -> List[Dict[str, Any]]:
+    """Read destination records from a JSON array or JSON Lines file"""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        records = json.loads(stripped)
+    else:
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    valid = []
+    for i, record in enumerate(records):
+        if isinstance(record, dict) and record.get("destination_info", {}).get("name"):
+            valid.append(record)
+        else:
+            logger.warning(f"⚠️ Skipping record {i}: missing destination_info.name")
+    return valid
+
+
+def bulk_ingest_file(path: str, batch_size: int = 100, db: DatabaseIntegration = None) -> Dict[str, Any]:
+    """Insert every record in `path`; a failed batch is logged and the rest continue"""
+    records = load_destinations_file(path)
+    db = db or DatabaseIntegration()
+
+    destination_ids: Dict[str, int] = {}
+    activities = hotels = failed = 0
+    changes = {table: Counter() for table in ("activities", "hotels")}
+    started = time.perf_counter()
+
+    for start in range(0, len(records), batch_size):
+        batch = records[start:start + batch_size]
+        try:
+            result = db.bulk_insert_destinations(batch)
+        except Exception as e:
+            failed += len(batch)
+            logger.error(f"❌ Batch {start}-{start + len(batch) - 1} failed: {e}")
+            continue
+        destination_ids.update(result["destination_ids"])
+        activities += sum(len(ids) for ids in result["activity_ids"].values())
+        hotels += sum(len(ids) for ids in result["hotel_ids"].values())
+        for table, counts in result["changes"].items():
+            changes[table].update(counts)
+
+    elapsed = time.perf_counter() - started
+    rows = len(destination_ids) + activities + hotels
+    return {
+        "records": len(records),
+        "destinations": len(destination_ids),
+        "activities": activities,
+        "hotels": hotels,
+        "changes": {table: dict(counts) for table, counts in changes.items()},
+        "failed_records": failed,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed else 0.0,
+        "destination_ids": destination_ids,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-load destination records into Cloud SQL")
+    parser.add_argument("path", help="JSON array or JSON Lines file of destination records")
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    summary = bulk_ingest_file(args.path, batch_size=args.batch_size)
+    summary.pop("destination_ids")
+    print(json.dumps(summary, indent=2))
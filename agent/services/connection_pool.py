@@ -0,0 +1,279 @@
+"""
+Bounded, thread-safe PostgreSQL connection pool for Cloud SQL access.
+
+Connections are reused across operations instead of paying a TCP + TLS + auth
+handshake per query. Idle connections are health-checked before reuse,
+recycled after a maximum lifetime and reaped when idle for too long.
+min_size connections are opened ahead of demand (prefill(), called at
+warm-up) and the reaper tops the pool back up to min_size.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+import psycopg2
+import psycopg2.extensions
+
+
+class PoolTimeout(Exception):
+    """No connection became available within the acquire timeout"""
+
+
+class _PooledConnection:
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class ConnectionPool:
+    """psycopg2 connection pool with health checks, max lifetime and idle reaping"""
+
+    def __init__(self,
+                 connect: Callable[[], Any],
+                 min_size: int = 0,
+                 max_size: int = 5,
+                 max_lifetime: float = 1800.0,
+                 max_idle: float = 300.0,
+                 health_check_after: float = 30.0,
+                 acquire_timeout: float = 10.0,
+                 reap_interval: float = 60.0):
+        if max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool bounds: min_size={min_size}, max_size={max_size}")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.health_check_after = health_check_after
+        self.acquire_timeout = acquire_timeout
+        self.reap_interval = reap_interval
+
+        self._idle: Deque[_PooledConnection] = deque()
+        self._in_use: Dict[int, _PooledConnection] = {}
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._reaper: Optional[threading.Thread] = None
+        self._stop_reaper = threading.Event()
+
+        self.logger = logging.getLogger("ConnectionPool")
+        self._metrics = {
+            "checkouts": 0, "waits": 0, "timeouts": 0, "wait_time_total": 0.0, "wait_time_max": 0.0,
+            "created": 0, "closed_lifetime": 0, "closed_idle": 0, "closed_broken": 0, "health_checks": 0,
+        }
+
+    # ---------- checkout / return ----------
+
+    def getconn(self, timeout: Optional[float] = None):
+        """Check out a healthy connection, waiting up to `timeout` seconds for one"""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.monotonic()
+        waited = False
+        self._ensure_reaper()
+
+        while True:
+            entry = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolTimeout("Connection pool is closed")
+                    self._reap_locked()
+                    if self._idle:
+                        entry = self._idle.pop()  # LIFO keeps the warmest connections busy
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1  # reserve a slot; connect outside the lock
+                        break
+                    remaining = timeout - (time.monotonic() - started)
+                    if remaining <= 0:
+                        self._metrics["timeouts"] += 1
+                        raise PoolTimeout(f"No connection available within {timeout:.1f}s "
+                                          f"(max_size={self.max_size})")
+                    waited = True
+                    self._cond.wait(remaining)
+
+            if entry is None:
+                try:
+                    entry = _PooledConnection(self._connect())
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._metrics["created"] += 1
+            elif not self._is_healthy(entry):
+                self._discard(entry, "closed_broken")
+                continue
+
+            wait = time.monotonic() - started
+            with self._cond:
+                self._in_use[id(entry.conn)] = entry
+                self._metrics["checkouts"] += 1
+                self._metrics["wait_time_total"] += wait
+                self._metrics["wait_time_max"] = max(self._metrics["wait_time_max"], wait)
+                if waited:
+                    self._metrics["waits"] += 1
+            return entry.conn
+
+    def putconn(self, conn, discard: bool = False) -> None:
+        """Return a connection; broken, expired or explicitly discarded ones are closed"""
+        with self._cond:
+            entry = self._in_use.pop(id(conn), None)
+        if entry is None:
+            raise ValueError("Connection does not belong to this pool")
+
+        if not discard and not conn.closed:
+            try:
+                if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        if discard or conn.closed:
+            self._discard(entry, "closed_broken")
+        elif self._closed or time.monotonic() - entry.created_at >= self.max_lifetime:
+            self._discard(entry, "closed_lifetime")
+        else:
+            entry.last_used = time.monotonic()
+            with self._cond:
+                self._idle.append(entry)
+                self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """`with pool.connection() as conn:` - rolled back and returned on exit"""
+        conn = self.getconn(timeout)
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            self.putconn(conn, discard=True)
+            raise
+        except BaseException:
+            self.putconn(conn)
+            raise
+        else:
+            self.putconn(conn)
+
+    # ---------- maintenance ----------
+
+    def prefill(self) -> int:
+        """Open connections until the pool holds min_size; returns how many were opened"""
+        opened = 0
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    break
+                self._size += 1  # reserve a slot; connect outside the lock
+            try:
+                entry = _PooledConnection(self._connect())
+            except Exception as e:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                self.logger.warning("⚠️ Could not prefill the pool (%s/%s opened): %s", opened, self.min_size, e)
+                break
+            with self._cond:
+                self._metrics["created"] += 1
+                if not self._closed:
+                    self._idle.appendleft(entry)  # behind the warmer connections (getconn takes from the right)
+                    self._cond.notify()
+                    opened += 1
+                    continue
+            self._discard(entry, "closed_lifetime")  # closed while we were connecting
+            break
+        self._ensure_reaper()
+        return opened
+
+    def _is_healthy(self, entry: _PooledConnection) -> bool:
+        conn = entry.conn
+        if conn.closed or time.monotonic() - entry.created_at >= self.max_lifetime:
+            return False
+        if time.monotonic() - entry.last_used < self.health_check_after:
+            return True
+        self._metrics["health_checks"] += 1
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, entry: _PooledConnection, reason: str) -> None:
+        try:
+            entry.conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._metrics[reason] += 1
+            self._cond.notify()
+
+    def _reap_locked(self) -> None:
+        """Close idle connections past max_idle / max_lifetime (caller holds the lock)"""
+        now = time.monotonic()
+        keep: Deque[_PooledConnection] = deque()
+        for entry in self._idle:
+            expired = now - entry.created_at >= self.max_lifetime
+            stale = now - entry.last_used >= self.max_idle and self._size > self.min_size
+            if expired or stale:
+                try:
+                    entry.conn.close()
+                except Exception:
+                    pass
+                self._size -= 1
+                self._metrics["closed_lifetime" if expired else "closed_idle"] += 1
+            else:
+                keep.append(entry)
+        self._idle = keep
+
+    def _ensure_reaper(self) -> None:
+        if self._reaper is not None or self.reap_interval <= 0:
+            return
+        with self._cond:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(target=self._reap_loop, name="db-pool-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self) -> None:
+        while not self._stop_reaper.wait(self.reap_interval):
+            with self._cond:
+                self._reap_locked()
+            if self.min_size:
+                self.prefill()
+
+    def close(self) -> None:
+        """Close idle connections now; in-use ones are closed when returned"""
+        self._stop_reaper.set()
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, deque()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            try:
+                entry.conn.close()
+            except Exception:
+                pass
+
+    # ---------- metrics ----------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            metrics = dict(self._metrics)
+            metrics.update(size=self._size, idle=len(self._idle), in_use=len(self._in_use),
+                           max_size=self.max_size)
+        checkouts = metrics["checkouts"]
+        metrics["wait_time_avg_ms"] = round(metrics["wait_time_total"] / checkouts * 1000, 3) if checkouts else 0.0
+        metrics["wait_time_max_ms"] = round(metrics.pop("wait_time_max") * 1000, 3)
+        metrics["wait_time_total"] = round(metrics["wait_time_total"], 3)
+        return metrics
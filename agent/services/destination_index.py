@@ -0,0 +1,301 @@
+"""
+In-memory index of destinations known to Cloud SQL.
+
+Answers "do we already have this destination?" without a database round-trip:
+names are normalized (case, accents, punctuation, whitespace), common
+aliases are resolved, and near-misses are caught with trigram candidate
+lookup followed by a difflib similarity check.
+
+The index is loaded from the `destinations` table in the background,
+updated incrementally as destinations are inserted, and refreshed
+periodically to pick up rows written by other processes. Readers never
+take a lock: every write publishes new containers instead of mutating
+ones a reader may be iterating.
+"""
+
+import difflib
+import heapq
+import logging
+import re
+import threading
+import time
+import unicodedata
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# alias -> canonical name, both normalized
+DEFAULT_ALIASES = {
+    "bombay": "mumbai",
+    "bangalore": "bengaluru",
+    "calcutta": "kolkata",
+    "madras": "chennai",
+    "pondicherry": "puducherry",
+    "benares": "varanasi",
+    "banaras": "varanasi",
+    "gurgaon": "gurugram",
+    "trivandrum": "thiruvananthapuram",
+    "cochin": "kochi",
+    "simla": "shimla",
+    "ooty": "udhagamandalam",
+    "nyc": "new york",
+    "new york city": "new york",
+    "la": "los angeles",
+    "sf": "san francisco",
+    "peking": "beijing",
+    "saigon": "ho chi minh city",
+}
+
+# lookup() match kinds that name the destination itself; a "fuzzy" hit is only a suggestion
+# ("Raipur" -> Jaipur, "Australia" -> Austria)
+CONFIRMED_MATCHES = ("exact", "alias")
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize_name(name: str) -> str:
+    """'  Málaga,  Spain ' -> 'malaga spain'"""
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(_PUNCTUATION.sub(" ", text.lower()).split())
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class DestinationEntry:
+    __slots__ = ("id", "name", "country")
+
+    def __init__(self, id: int, name: str, country: Optional[str] = None):
+        self.id = id
+        self.name = name
+        self.country = country
+
+
+class DestinationIndex:
+    """Exact, alias and fuzzy lookup over destination names"""
+
+    def __init__(self,
+                 loader: Callable[[], Iterable[Tuple[int, str, Optional[str]]]],
+                 refresh_interval: float = 300.0,
+                 fuzzy_threshold: float = 0.8,
+                 aliases: Optional[Dict[str, str]] = None):
+        self._loader = loader
+        self.refresh_interval = refresh_interval
+        self.fuzzy_threshold = fuzzy_threshold
+
+        self._entries: Dict[str, DestinationEntry] = {}
+        self._aliases: Dict[str, str] = dict(aliases if aliases is not None else DEFAULT_ALIASES)
+        self._postings: Dict[str, frozenset] = {}
+        self._gram_counts: Dict[str, int] = {}
+        self._added_during_refresh: Dict[str, DestinationEntry] = {}
+        # fuzzy results for the currently published postings; replaced on every publish
+        self._fuzzy_cache: Dict[str, Tuple[Optional[str], float]] = {}
+
+        self._write_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._started = False
+        self._stop = threading.Event()
+        self.last_refresh: Optional[float] = None
+        self.logger = logging.getLogger("DestinationIndex")
+        self._metrics = {"lookups": 0, "exact": 0, "alias": 0, "fuzzy": 0, "misses": 0, "refreshes": 0,
+                         "refresh_errors": 0}
+
+    # ---------- lifecycle ----------
+
+    def start(self) -> None:
+        """Load in the background and keep refreshing; safe to call repeatedly"""
+        if self._started:
+            return
+        with self._write_lock:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._refresh_loop, name="destination-index", daemon=True).start()
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Block until the first load has finished (or failed); True when loaded"""
+        self.start()
+        return self._ready.wait(timeout) and self.last_refresh is not None
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            self.refresh()
+            if self._stop.wait(self.refresh_interval):
+                return
+
+    def refresh(self) -> bool:
+        """Rebuild from the database and swap it in; keeps the old index on failure"""
+        with self._write_lock:
+            self._added_during_refresh = {}
+        try:
+            rows = list(self._loader())
+        except Exception as e:
+            self._metrics["refresh_errors"] += 1
+            self.logger.warning(f"⚠️ Destination index refresh failed: {e}")
+            self._ready.set()
+            return False
+
+        entries = {}
+        for dest_id, name, country in rows:
+            key = normalize_name(name)
+            if key:
+                entries[key] = DestinationEntry(dest_id, name, country)
+
+        with self._write_lock:
+            # inserts that committed after the snapshot was read must survive the swap
+            entries.update(self._added_during_refresh)
+            postings: Dict[str, Set[str]] = {}
+            gram_counts = {}
+            for key in entries:
+                grams = _trigrams(key)
+                gram_counts[key] = len(grams)
+                for gram in grams:
+                    postings.setdefault(gram, set()).add(key)
+            self._entries = entries
+            self._postings = {gram: frozenset(keys) for gram, keys in postings.items()}
+            self._gram_counts = gram_counts
+            self._fuzzy_cache = {}
+        self.last_refresh = time.time()
+        self._metrics["refreshes"] += 1
+        self._ready.set()
+        self.logger.debug(f"Destination index loaded {len(entries)} destinations")
+        return True
+
+    # ---------- writes ----------
+
+    def add(self, dest_id: int, name: str, country: Optional[str] = None) -> None:
+        """Record a newly inserted destination without waiting for the next refresh"""
+        self.add_many([(dest_id, name, country)])
+
+    def add_many(self, rows: Iterable[Tuple[int, str, Optional[str]]]) -> None:
+        """Record several destinations, publishing the updated index once"""
+        new_entries = {}
+        for dest_id, name, country in rows:
+            key = normalize_name(name)
+            if key:
+                new_entries[key] = DestinationEntry(dest_id, name, country)
+        if not new_entries:
+            return
+
+        added: Dict[str, Set[str]] = {}
+        gram_counts = {}
+        for key in new_entries:
+            grams = _trigrams(key)
+            gram_counts[key] = len(grams)
+            for gram in grams:
+                added.setdefault(gram, set()).add(key)
+
+        with self._write_lock:
+            entries = dict(self._entries)
+            entries.update(new_entries)
+            postings = dict(self._postings)
+            for gram, keys in added.items():
+                postings[gram] = postings.get(gram, frozenset()) | keys
+            counts = dict(self._gram_counts)
+            counts.update(gram_counts)
+            self._added_during_refresh.update(new_entries)
+            self._entries, self._postings, self._gram_counts = entries, postings, counts
+            self._fuzzy_cache = {}
+
+    def add_alias(self, alias: str, name: str) -> None:
+        """Resolve `alias` to the destination called `name` from now on"""
+        alias_key, key = normalize_name(alias), normalize_name(name)
+        if alias_key and key and alias_key != key:
+            with self._write_lock:
+                aliases = dict(self._aliases)
+                aliases[alias_key] = key
+                self._aliases = aliases
+
+    # ---------- reads ----------
+
+    def lookup(self, name: str) -> Optional[Dict[str, Any]]:
+        """Best match for `name` or None; never touches the database"""
+        self._metrics["lookups"] += 1
+        key = normalize_name(name)
+        if not key:
+            self._metrics["misses"] += 1
+            return None
+        entries = self._entries
+
+        entry = entries.get(key)
+        if entry is not None:
+            self._metrics["exact"] += 1
+            return self._match(entry, "exact", 1.0)
+
+        canonical = self._aliases.get(key)
+        if canonical is None and "," in (name or ""):
+            # "Goa, India" -> "goa"
+            head = normalize_name(name.split(",", 1)[0])
+            canonical = head if head in entries else self._aliases.get(head)
+        if canonical is not None and canonical in entries:
+            self._metrics["alias"] += 1
+            return self._match(entries[canonical], "alias", 1.0)
+
+        candidate, score = self._fuzzy(key)
+        if candidate is not None:
+            self._metrics["fuzzy"] += 1
+            return self._match(entries[candidate], "fuzzy", score)
+
+        self._metrics["misses"] += 1
+        return None
+
+    def _fuzzy(self, key: str, max_candidates: int = 8) -> Tuple[Optional[str], float]:
+        cache = self._fuzzy_cache
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        result = self._fuzzy_uncached(key, max_candidates)
+        if len(cache) >= 1024:
+            cache.clear()
+        cache[key] = result
+        return result
+
+    def _fuzzy_uncached(self, key: str, max_candidates: int) -> Tuple[Optional[str], float]:
+        postings, gram_counts = self._postings, self._gram_counts
+        grams = _trigrams(key)
+        overlap: Dict[str, int] = {}
+        for gram in grams:
+            for candidate in postings.get(gram, ()):
+                overlap[candidate] = overlap.get(candidate, 0) + 1
+        if not overlap:
+            return None, 0.0
+
+        # trigram Jaccard narrows the field; difflib ratio makes the call
+        ranked = heapq.nlargest(max_candidates, overlap.items(),
+                                key=lambda kv: kv[1] / (len(grams) + gram_counts.get(kv[0], 0) - kv[1]))
+        best, best_score = None, 0.0
+        for candidate, _ in ranked:
+            score = difflib.SequenceMatcher(None, key, candidate).ratio()
+            if score > best_score:
+                best, best_score = candidate, score
+        if best_score >= self.fuzzy_threshold:
+            return best, round(best_score, 3)
+        return None, 0.0
+
+    @staticmethod
+    def _match(entry: DestinationEntry, match_type: str, score: float) -> Dict[str, Any]:
+        return {"destination_id": entry.id, "name": entry.name, "country": entry.country,
+                "match": match_type, "score": score}
+
+    def suggestions(self, name: str, limit: int = 3) -> List[str]:
+        """Closest known names, for 'did you mean' replies on a miss"""
+        entries = self._entries
+        keys = difflib.get_close_matches(normalize_name(name), list(entries), n=limit, cutoff=0.6)
+        return [entries[key].name for key in keys]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def ready(self) -> bool:
+        return self.last_refresh is not None
+
+    def stats(self) -> Dict[str, Any]:
+        metrics = dict(self._metrics)
+        metrics.update(size=len(self._entries), aliases=len(self._aliases), ready=self.ready,
+                       last_refresh=self.last_refresh)
+        return metrics
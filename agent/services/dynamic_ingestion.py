@@ -8,13 +8,11 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional
 import googlemaps
 import requests
-from toolbox_core import ToolboxSyncClient
 from services.weather_service import weather_service
 class DynamicIngestionService:
     def __init__(self):
         self.gmaps = googlemaps.Client(key=os.getenv('GOOGLE_MAPS_API_KEY'))
         self.weather_api_key = os.getenv('WEATHER_API_KEY')
-        self.toolbox = ToolboxSyncClient(os.getenv('MCP_TOOLBOX_URL'))
         
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
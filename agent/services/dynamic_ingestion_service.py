@@ -5,13 +5,27 @@ Uses New Google Places API and stores data in Cloud SQL
 
 from dotenv import load_dotenv
 import os
+import argparse
 import asyncio
+import hashlib
 import logging
+import sqlite3
+import threading
 from datetime import datetime
 from typing import Dict, Any, List, Optional
-import requests
+import aiohttp
 import psycopg2
-from toolbox_core import ToolboxSyncClient
+from psycopg2.extras import execute_values
+from utils.http_helper import PooledSession
+from utils.lazy_helper import Lazy
+from utils.async_helper import RateLimiter
+from utils.geo_helper import viewport_radius_m
+from services.connection_pool import ConnectionPool
+from services.destination_index import DestinationIndex
+from services.proximity_index import ProximityIndex
+from services.places_cache import PlacesCache, default_cache_path
+from services.places_discovery import (PlacesDiscoveryEngine, ACTIVITY_CATEGORIES, LODGING_CATEGORIES,
+                                       parse_weights)
 
 # Load environment variables from .env file
 load_dotenv()
@@ -22,6 +36,60 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+# Idempotent: stable place-id identity, change detection, the hotel -> destination link and coordinates.
+# A place is unique per destination, not globally: overlapping destinations each keep their own row.
+# Rows from before place ids have place_id NULL (NULLs never conflict): ingestion adopts them by
+# (destination_id, lower(name)), and copies an earlier ingest already made are dropped here.
+SCHEMA_MIGRATION = """
+    ALTER TABLE activities ADD COLUMN IF NOT EXISTS place_id TEXT;
+    ALTER TABLE activities ADD COLUMN IF NOT EXISTS content_hash TEXT;
+    ALTER TABLE activities ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+    ALTER TABLE activities ADD COLUMN IF NOT EXISTS rating NUMERIC;
+    -- types an earlier category discovery stored, back in the itinerary vocabulary (see ACTIVITY_CATEGORIES)
+    UPDATE activities SET type = CASE type WHEN 'sightseeing' THEN 'cultural' WHEN 'outdoor' THEN 'adventure'
+                                           ELSE 'attraction' END
+    WHERE type IN ('sightseeing', 'outdoor', 'nightlife', 'shopping');
+    DROP INDEX IF EXISTS activities_place_id_key;
+    CREATE UNIQUE INDEX IF NOT EXISTS activities_destination_place_key ON activities (destination_id, place_id);
+    DELETE FROM activities AS legacy USING activities AS keyed
+    WHERE legacy.place_id IS NULL AND keyed.place_id IS NOT NULL
+      AND keyed.destination_id = legacy.destination_id AND lower(keyed.name) = lower(legacy.name);
+    CREATE INDEX IF NOT EXISTS activities_unkeyed_name_idx ON activities (destination_id, lower(name))
+        WHERE place_id IS NULL;
+    
+    ALTER TABLE hotels ADD COLUMN IF NOT EXISTS destination_id INTEGER REFERENCES destinations(id) ON DELETE CASCADE;
+    ALTER TABLE hotels ADD COLUMN IF NOT EXISTS place_id TEXT;
+    ALTER TABLE hotels ADD COLUMN IF NOT EXISTS content_hash TEXT;
+    ALTER TABLE hotels ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+    DROP INDEX IF EXISTS hotels_place_id_key;
+    CREATE UNIQUE INDEX IF NOT EXISTS hotels_destination_place_key ON hotels (destination_id, place_id);
+    DELETE FROM hotels AS legacy USING hotels AS keyed
+    WHERE legacy.place_id IS NULL AND keyed.place_id IS NOT NULL
+      AND keyed.destination_id = legacy.destination_id AND lower(keyed.name) = lower(legacy.name);
+    CREATE INDEX IF NOT EXISTS hotels_unkeyed_name_idx ON hotels (destination_id, lower(name))
+        WHERE place_id IS NULL;
+    CREATE INDEX IF NOT EXISTS hotels_destination_id_idx ON hotels (destination_id);
+    
+    ALTER TABLE destinations ADD COLUMN IF NOT EXISTS latitude DOUBLE PRECISION;
+    ALTER TABLE destinations ADD COLUMN IF NOT EXISTS longitude DOUBLE PRECISION;
+    ALTER TABLE activities ADD COLUMN IF NOT EXISTS latitude DOUBLE PRECISION;
+    ALTER TABLE activities ADD COLUMN IF NOT EXISTS longitude DOUBLE PRECISION;
+    ALTER TABLE hotels ADD COLUMN IF NOT EXISTS latitude DOUBLE PRECISION;
+    ALTER TABLE hotels ADD COLUMN IF NOT EXISTS longitude DOUBLE PRECISION;
+"""
+
+# Read-only: true once SCHEMA_MIGRATION has been applied (no DDL, no table locks)
+SCHEMA_CHECK = """
+    SELECT (SELECT count(*) FROM pg_indexes WHERE schemaname = current_schema()
+              AND indexname IN ('activities_destination_place_key', 'hotels_destination_place_key',
+                                'activities_unkeyed_name_idx', 'hotels_unkeyed_name_idx')) = 4
+       AND (SELECT count(*) FROM information_schema.columns WHERE table_schema = current_schema()
+              AND table_name IN ('destinations', 'activities', 'hotels')
+              AND column_name IN ('latitude', 'longitude')) = 6
+       AND EXISTS (SELECT 1 FROM information_schema.columns WHERE table_schema = current_schema()
+              AND table_name = 'activities' AND column_name = 'rating');
+"""
+
 class DatabaseIntegration:
     """Handles all database operations for storing discovered travel data"""
     
@@ -44,120 +112,335 @@ class DatabaseIntegration:
             raise ValueError(f"Missing required environment variables: {missing_vars}")
         
         self.logger = logging.getLogger("DatabaseIntegration")
+        
+        # Connections are reused across operations instead of one connect() per call
+        self.pool = ConnectionPool(
+            lambda: psycopg2.connect(**self.connection_params),
+            min_size=int(os.getenv('CLOUDSQL_POOL_MIN', 1)),
+            max_size=int(os.getenv('CLOUDSQL_POOL_MAX', 5)),
+            max_lifetime=float(os.getenv('CLOUDSQL_POOL_MAX_LIFETIME', 1800)),
+            max_idle=float(os.getenv('CLOUDSQL_POOL_MAX_IDLE', 300)),
+            acquire_timeout=float(os.getenv('CLOUDSQL_POOL_TIMEOUT', 10))
+        )
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+        
+        # Known destinations, kept in memory so existence checks skip the database
+        self.destination_index = DestinationIndex(
+            self.fetch_destination_names,
+            refresh_interval=float(os.getenv('DESTINATION_INDEX_REFRESH', 300))
+        )
+        # Activity / hotel coordinates, kept in memory for "near X" questions
+        self.proximity_index = ProximityIndex(
+            self.fetch_place_coordinates,
+            refresh_interval=float(os.getenv('PROXIMITY_INDEX_REFRESH', 300))
+        )
         self.logger.info(f"✅ Database connection configured for host: {self.connection_params['host']}")
 
+    def close(self) -> None:
+        """Close pooled connections (call on shutdown)"""
+        self.destination_index.stop()
+        self.proximity_index.stop()
+        self.pool.close()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Checkout count, wait times and connection churn of the pool"""
+        return self.pool.stats()
+
     def test_connection(self) -> bool:
         """Test database connection"""
         try:
-            conn = psycopg2.connect(**self.connection_params)
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1;")
-            result = cursor.fetchone()
-            cursor.close()
-            conn.close()
-            self.logger.info("✅ Database connection test successful!")
+            with self.pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1;")
+                    cursor.fetchone()
+            self.logger.debug("✅ Database connection test successful!")
             return True
         except Exception as e:
             self.logger.error(f"❌ Database connection test failed: {e}")
             return False
 
+    def fetch_destination_names(self) -> List[tuple]:
+        """(id, name, country) for every stored destination"""
+        with self.pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT id, name, country FROM destinations;")
+                return cursor.fetchall()
+
+    def fetch_place_coordinates(self) -> List[tuple]:
+        """(kind, id, place_id, destination_id, name, category, latitude, longitude) for located activities and hotels"""
+        # a read path: never migrate here (every worker loads this at boot)
+        if not self.schema_is_current():
+            self.logger.warning("⚠️ Schema migration pending (python -m services.dynamic_ingestion_service --migrate); "
+                                "no place coordinates yet")
+            return []
+        with self.pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT 'activity', id, place_id, destination_id, name, type, latitude, longitude
+                    FROM activities WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+                    UNION ALL
+                    SELECT 'hotel', id, place_id, destination_id, name, price_tier, latitude, longitude
+                    FROM hotels WHERE latitude IS NOT NULL AND longitude IS NOT NULL;
+                    """)
+                return cursor.fetchall()
+
+    def fetch_destination_activities(self, destination_id: int) -> List[Dict[str, Any]]:
+        """Stored activities of one destination, as dicts (what the itinerary engine plans from)"""
+        with self.pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT id, name, type, price, duration_hours, sustainability_score, hidden_gem, description,
+                           rating::float AS rating
+                    FROM activities WHERE destination_id = %s ORDER BY id;
+                    """, (destination_id,))
+                columns = [column[0] for column in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
     def insert_discovered_destination(self, data: Dict[str, Any]) -> Optional[int]:
         """Insert discovered destination data into Cloud SQL"""
         
         try:
-            conn = psycopg2.connect(**self.connection_params)
-            cursor = conn.cursor()
-            
-            dest_info = data.get("destination_info", {})
-            
-            # Insert destination with conflict handling
-            insert_dest_query = """
-                INSERT INTO destinations (name, country, category, description, best_season, avg_temperature, sustainability_rating, hidden_gem)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (name) DO UPDATE SET 
-                    country = EXCLUDED.country,
-                    category = EXCLUDED.category,
-                    description = EXCLUDED.description,
-                    sustainability_rating = EXCLUDED.sustainability_rating,
-                    hidden_gem = EXCLUDED.hidden_gem,
-                    updated_at = CURRENT_TIMESTAMP
-                RETURNING id;
-                """
-            
-            cursor.execute(insert_dest_query, (
-                dest_info.get("name"),
-                dest_info.get("country", "Unknown"),  # <-- Add this line
-                dest_info.get("category"),
-                dest_info.get("description"),
-                dest_info.get("best_season", "Year-round"),
-                dest_info.get("avg_temperature", 25),
-                dest_info.get("sustainability_rating", 7),
-                dest_info.get("hidden_gem", False)
-            ))
-            
-            destination_id = cursor.fetchone()[0]
-            self.logger.info(f"✅ Inserted destination '{dest_info.get('name')}' with ID: {destination_id}")
-            
-            # Insert activities
-            activities = data.get("activities", [])
-            if activities:
-                activity_query = """
-                INSERT INTO activities (destination_id, name, type, price, duration_hours, sustainability_score, hidden_gem, description)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT DO NOTHING;
-                """
+            result = self.bulk_insert_destinations([data])
+            return next(iter(result["destination_ids"].values()), None)
+        except Exception as e:
+            self.logger.error(f"❌ Database insertion failed: {e}")
+            return None
+
+    def schema_is_current(self) -> bool:
+        """Whether SCHEMA_MIGRATION has been applied (a catalog read, no locks taken)"""
+        if self._schema_ready:
+            return True
+        with self.pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(SCHEMA_CHECK)
+                current = cursor.fetchone()[0]
+            conn.rollback()
+        self._schema_ready = bool(current)
+        return self._schema_ready
+
+    def migrate(self) -> None:
+        """Apply SCHEMA_MIGRATION: place-id identity, content hashes, the hotel->destination link, coordinates.
+        
+        Takes ACCESS EXCLUSIVE locks on the tables, so it runs once per deploy
+        (--migrate), or on the first write that finds the schema behind; an
+        advisory lock keeps concurrent workers from running it together.
+        """
+        with self._schema_lock:
+            with self.pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_xact_lock(hashtext('travel_genius_schema_migration'));")
+                    cursor.execute(SCHEMA_MIGRATION)
+                conn.commit()
+            self._schema_ready = True
+            self.logger.info("✅ Database schema migrated")
+
+    def ensure_schema(self) -> None:
+        """Migrate unless the schema is already current (checked once per process)"""
+        if not self.schema_is_current():
+            self.migrate()
+
+    def bulk_insert_destinations(self, items: List[Dict[str, Any]], page_size: int = 1000) -> Dict[str, Any]:
+        """Upsert many discovered destinations plus their activities and hotels in one transaction.
+        
+        Uses multi-row INSERTs (execute_values), so the round-trips grow with
+        rows / page_size instead of one per row. Activities and hotels are keyed
+        on Google place id; rows whose content hash is unchanged are not
+        rewritten. Raises on failure after the transaction is rolled back.
+        
+        Returns {"destination_ids": {name: id}, "activity_ids": {name: [ids]},
+                 "hotel_ids": {name: [ids]}, "changes": {"activities": {...}, "hotels": {...}}}
+        """
+        
+        # One row per name: ON CONFLICT DO UPDATE cannot touch the same row twice in a statement
+        by_name = {}
+        for item in items:
+            dest_info = item.get("destination_info", {})
+            by_name[dest_info.get("name")] = item
+        if not by_name:
+            return {"destination_ids": {}, "activity_ids": {}, "hotel_ids": {}, "changes": {}}
+        
+        self.ensure_schema()
+        with self.pool.connection() as conn:
+            with conn.cursor() as cursor:
+                dest_rows = [(
+                    name,
+                    item["destination_info"].get("country", "Unknown"),
+                    item["destination_info"].get("category"),
+                    item["destination_info"].get("description"),
+                    item["destination_info"].get("best_season", "Year-round"),
+                    item["destination_info"].get("avg_temperature", 25),
+                    item["destination_info"].get("sustainability_rating", 7),
+                    item["destination_info"].get("hidden_gem", False),
+                    *self._coordinates(item["destination_info"])
+                ) for name, item in by_name.items()]
                 
-                for activity in activities:
-                    cursor.execute(activity_query, (
-                        destination_id,
-                        activity.get("name"),
-                        activity.get("type"),
-                        activity.get("price", 0),
-                        activity.get("duration_hours", 2),
-                        activity.get("sustainability_score", 7),
-                        activity.get("hidden_gem", False),
-                        activity.get("description", "")
-                    ))
+                returned = execute_values(cursor, """
+                    INSERT INTO destinations (name, country, category, description, best_season, avg_temperature, sustainability_rating, hidden_gem, latitude, longitude)
+                    VALUES %s
+                    ON CONFLICT (name) DO UPDATE SET 
+                        country = EXCLUDED.country,
+                        latitude = COALESCE(EXCLUDED.latitude, destinations.latitude),
+                        longitude = COALESCE(EXCLUDED.longitude, destinations.longitude),
+                        category = EXCLUDED.category,
+                        description = EXCLUDED.description,
+                        sustainability_rating = EXCLUDED.sustainability_rating,
+                        hidden_gem = EXCLUDED.hidden_gem,
+                        updated_at = CURRENT_TIMESTAMP
+                    RETURNING id, name;
+                    """, dest_rows, page_size=page_size, fetch=True)
+                destination_ids = {name: dest_id for dest_id, name in returned}
                 
-                self.logger.info(f"✅ Inserted {len(activities)} activities")
-            
-            # Insert hotels
-            hotels = data.get("hotels", [])
-            if hotels:
-                hotel_query = """
-                INSERT INTO hotels (name, location, price_tier, rating, sustainability_score, amenities, checkin_date)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT DO NOTHING;
-                """
+                activities = [(name, activity, {
+                    "destination_id": destination_ids[name],
+                    "name": activity.get("name"),
+                    "type": activity.get("type"),
+                    "price": activity.get("price", 0),
+                    "duration_hours": activity.get("duration_hours", 2),
+                    "sustainability_score": activity.get("sustainability_score", 7),
+                    "hidden_gem": activity.get("hidden_gem", False),
+                    "description": activity.get("description", ""),
+                    "rating": activity.get("rating"),
+                    **dict(zip(("latitude", "longitude"), self._coordinates(activity)))
+                }) for name, item in by_name.items() for activity in item.get("activities", [])]
                 
-                for hotel in hotels:
-                    cursor.execute(hotel_query, (
-                        hotel.get("name"),
-                        hotel.get("location"),
-                        hotel.get("price_tier", "Upscale"),
-                        hotel.get("rating", 4.0),
-                        hotel.get("sustainability_score", 7),
-                        hotel.get("amenities", ["WiFi", "Restaurant"]),
-                        datetime.now().date()
-                    ))
+                checkin_date = datetime.now().date()
+                hotels = [(name, hotel, {
+                    "destination_id": destination_ids[name],
+                    "name": hotel.get("name"),
+                    "location": hotel.get("location"),
+                    "price_tier": hotel.get("price_tier", "Upscale"),
+                    "rating": hotel.get("rating", 4.0),
+                    "sustainability_score": hotel.get("sustainability_score", 7),
+                    "amenities": hotel.get("amenities", ["WiFi", "Restaurant"]),
+                    **dict(zip(("latitude", "longitude"), self._coordinates(hotel)))
+                }) for name, item in by_name.items() for hotel in item.get("hotels", [])]
                 
-                self.logger.info(f"✅ Inserted {len(hotels)} hotels")
+                activity_ids, activity_changes = self._upsert_places(
+                    cursor, "activities", activities, destination_ids, page_size)
+                hotel_ids, hotel_changes = self._upsert_places(
+                    cursor, "hotels", hotels, destination_ids, page_size, extra={"checkin_date": checkin_date})
             
             conn.commit()
-            cursor.close()
-            conn.close()
-            
-            return destination_id
-            
-        except Exception as e:
-            self.logger.error(f"❌ Database insertion failed: {e}")
-            if 'conn' in locals():
-                try:
-                    conn.rollback()
-                    conn.close()
-                except:
-                    pass
-            return None
+        
+        self.destination_index.add_many(
+            (dest_id, name, by_name[name]["destination_info"].get("country")) for name, dest_id in destination_ids.items())
+        self.proximity_index.add_many(
+            [(kind, None, self._place_key(table, dest_name, raw, values), values["destination_id"], values["name"],
+              values.get(category), values["latitude"], values["longitude"])
+             for kind, table, category, rows in (("activity", "activities", "type", activities),
+                                                 ("hotel", "hotels", "price_tier", hotels))
+             for dest_name, raw, values in rows])
+        self.logger.info(f"✅ Upserted {len(destination_ids)} destinations; "
+                         f"activities {activity_changes}, hotels {hotel_changes}")
+        return {"destination_ids": destination_ids, "activity_ids": activity_ids, "hotel_ids": hotel_ids,
+                "changes": {"activities": activity_changes, "hotels": hotel_changes}}
+
+    def _upsert_places(self, cursor, table: str, rows: List[tuple], destination_ids: Dict[str, int],
+                       page_size: int, extra: Optional[Dict[str, Any]] = None):
+        """Upsert (destination name, raw dict, column values) rows keyed on (destination id, place id).
+        
+        The same place under two destinations is two rows; a row never moves
+        to another destination. A row stored before place ids (place_id NULL)
+        with the same destination and name is adopted rather than duplicated.
+        Rows whose content hash matches the stored one
+        are skipped entirely; `extra` columns (e.g. checkin_date) are written
+        but not hashed.
+        Returns ({destination name: [ids]}, {"inserted", "updated", "unchanged"}).
+        """
+        ids: Dict[str, List[int]] = {name: [] for name in destination_ids}
+        changes = {"inserted": 0, "updated": 0, "unchanged": 0}
+        if not rows:
+            return ids, changes
+        
+        # last one wins when the same place shows up twice for a destination (e.g. overlapping nearby searches)
+        keyed = {}
+        for dest_name, raw, values in rows:
+            key = (values["destination_id"], self._place_key(table, dest_name, raw, values))
+            keyed[key] = (values, self._content_hash(values))
+        
+        # a legacy row takes the place id of a new row with its name (NULL hash: the upsert rewrites it);
+        # other legacy rows with that name are the duplicates SCHEMA_MIGRATION drops
+        dest_ids = [dest_id for dest_id, _ in keyed]
+        place_ids = [place_id for _, place_id in keyed]
+        names = [values.get("name") or "" for values, _ in keyed.values()]
+        cursor.execute(f"""
+            UPDATE {table} AS t SET place_id = v.place_id
+            FROM (SELECT DISTINCT ON (destination_id, lower(name)) destination_id, place_id, name
+                  FROM unnest(%s::integer[], %s::text[], %s::text[]) AS n(destination_id, place_id, name)
+                  WHERE NOT EXISTS (SELECT 1 FROM {table} k
+                                    WHERE k.destination_id = n.destination_id AND k.place_id = n.place_id)
+                  ORDER BY destination_id, lower(name), place_id) AS v
+            WHERE t.id = (SELECT l.id FROM {table} l
+                          WHERE l.place_id IS NULL AND l.destination_id = v.destination_id
+                            AND lower(l.name) = lower(v.name)
+                          ORDER BY l.id LIMIT 1);
+            DELETE FROM {table} AS l
+            USING unnest(%s::integer[], %s::text[]) AS n(destination_id, name)
+            WHERE l.place_id IS NULL AND l.destination_id = n.destination_id AND lower(l.name) = lower(n.name);
+            """, (dest_ids, place_ids, names, dest_ids, names))
+        
+        cursor.execute(f"""
+            SELECT destination_id, place_id, id, content_hash FROM {table}
+            WHERE (destination_id, place_id) IN (SELECT * FROM unnest(%s::integer[], %s::text[]));
+            """, (dest_ids, place_ids))
+        stored = {(dest_id, place_id): (row_id, content_hash)
+                  for dest_id, place_id, row_id, content_hash in cursor.fetchall()}
+        
+        names_by_id = {dest_id: name for name, dest_id in destination_ids.items()}
+        changed = []
+        for (dest_id, place_id), (values, content_hash) in keyed.items():
+            existing = stored.get((dest_id, place_id))
+            if existing and existing[1] == content_hash:
+                changes["unchanged"] += 1
+                ids[names_by_id[dest_id]].append(existing[0])
+            else:
+                changed.append((place_id, content_hash, *values.values(), *(extra or {}).values()))
+        if not changed:
+            return ids, changes
+        
+        columns = list(next(iter(keyed.values()))[0]) + list(extra or {})
+        updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in columns if column != "destination_id")
+        returned = execute_values(cursor, f"""
+            INSERT INTO {table} (place_id, content_hash, {", ".join(columns)})
+            VALUES %s
+            ON CONFLICT (destination_id, place_id) DO UPDATE SET
+                {updates},
+                content_hash = EXCLUDED.content_hash,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE {table}.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+            RETURNING id, destination_id, (xmax = 0) AS inserted;
+            """, changed, page_size=page_size, fetch=True)
+        for row_id, dest_id, inserted in returned:
+            ids[names_by_id[dest_id]].append(row_id)
+            changes["inserted" if inserted else "updated"] += 1
+        # rows another writer brought up to date between our read and the upsert
+        changes["unchanged"] += len(changed) - len(returned)
+        return ids, changes
+
+    @staticmethod
+    def _content_hash(values: Dict[str, Any]) -> str:
+        # values always come in the same column order, so repr() of the tuple is stable and cheap
+        return hashlib.sha1(repr(tuple(values.values())).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _coordinates(item: Dict[str, Any]) -> tuple:
+        """(latitude, longitude) from a discovered item's "coordinates", or (None, None)"""
+        coordinates = item.get("coordinates") or {}
+        return coordinates.get("lat"), coordinates.get("lng")
+
+    @classmethod
+    def _place_key(cls, table: str, dest_name: str, raw: Dict[str, Any], values: Dict[str, Any]) -> str:
+        return raw.get("place_id") or cls._local_place_id(table, dest_name, values)
+
+    @staticmethod
+    def _local_place_id(table: str, dest_name: str, values: Dict[str, Any]) -> str:
+        """Stable stand-in key for rows without a Google place id (e.g. file imports)"""
+        identity = f"{table}|{dest_name}|{values.get('name')}|{values.get('location', '')}"
+        return "local:" + hashlib.sha1(identity.lower().encode("utf-8")).hexdigest()
+
+
+PLACES_API_URL = "https://places.googleapis.com/v1/places"
 
 
 class DynamicIngestionService:
@@ -169,8 +452,51 @@ class DynamicIngestionService:
             raise ValueError("GOOGLE_MAPS_API_KEY not found in environment variables")
         
         self.weather_api_key = os.getenv('WEATHER_API_KEY')
-        self.toolbox = ToolboxSyncClient(os.getenv('MCP_TOOLBOX_URL'))
         self.db_integration = DatabaseIntegration()
+        self.db_integration.destination_index.start()
+        self.db_integration.proximity_index.start()
+        
+        # Shared keep-alive pool for all Places API calls
+        self.http = PooledSession(
+            limit=int(os.getenv('PLACES_HTTP_POOL_LIMIT', 50)),
+            limit_per_host=int(os.getenv('PLACES_HTTP_POOL_PER_HOST', 20))
+        )
+        # Per-call deadlines (seconds) for text search and nearby search
+        self.search_timeout = float(os.getenv('PLACES_SEARCH_TIMEOUT', 10))
+        self.nearby_timeout = float(os.getenv('PLACES_NEARBY_TIMEOUT', 15))
+        # Per-method request rate caps (requests/second), shared by every caller
+        self.rate_limits = {
+            "searchText": RateLimiter(float(os.getenv('PLACES_RATE_SEARCH', 10)),
+                                      burst=int(os.getenv('PLACES_RATE_BURST', 5))),
+            "searchNearby": RateLimiter(float(os.getenv('PLACES_RATE_NEARBY', 10)),
+                                        burst=int(os.getenv('PLACES_RATE_BURST', 5)))
+        }
+        # On-disk cache of Places responses and place records ("off" disables it)
+        cache_path = os.getenv('PLACES_CACHE_PATH', default_cache_path())
+        self.places_cache = None if cache_path.lower() == 'off' else PlacesCache(
+            cache_path,
+            ttl_by_method={
+                "searchText": float(os.getenv('PLACES_CACHE_TTL_SEARCH', 86400)),
+                "searchNearby": float(os.getenv('PLACES_CACHE_TTL_NEARBY', 86400))
+            },
+            place_ttl=float(os.getenv('PLACES_CACHE_TTL_PLACE', 3 * 86400)),
+            max_responses=int(os.getenv('PLACES_CACHE_MAX_RESPONSES', 5000)),
+            max_places=int(os.getenv('PLACES_CACHE_MAX_PLACES', 50000))
+        )
+        
+        # Per-category activity / hotel discovery under one latency budget (seconds)
+        self.discovery = PlacesDiscoveryEngine(
+            self._post_places,
+            budget=float(os.getenv('PLACES_DISCOVERY_BUDGET', 8)),
+            max_pages=int(os.getenv('PLACES_DISCOVERY_MAX_PAGES', 2)),
+            request_timeout=self.search_timeout,
+            weights=parse_weights(os.getenv('PLACES_RANK_WEIGHTS', '')),
+            tile_radius_m=float(os.getenv('PLACES_TILE_RADIUS', 5000)),
+            max_tiles=int(os.getenv('PLACES_MAX_TILES', 24)),
+            max_tile_requests=int(os.getenv('PLACES_MAX_TILE_REQUESTS', 48))
+        )
+        # Destinations whose viewport is wider than this (metres from centre to corner) are searched tile by tile
+        self.tiling_min_radius = float(os.getenv('PLACES_TILING_MIN_RADIUS', 25000))
         
         self.logger = logging.getLogger("DynamicIngestion")
         self.logger.info(f"✅ Dynamic Ingestion Service initialized with NEW Places API")
@@ -181,37 +507,29 @@ class DynamicIngestionService:
         self.logger.info(f"🔍 Starting discovery for: {destination_name}")
         
         try:
-            # Step 1: Search for the destination using NEW Places API
-            destination_data = await self._search_destination_new_api(destination_name)
+            result_data = await self.collect_destination(destination_name)
             
-            if not destination_data:
+            if not result_data:
                 return {
                     "success": False, 
                     "message": f"Could not find comprehensive data for {destination_name}"
                 }
             
-            # Step 2: Get nearby places using NEW API
-            activities = await self._discover_activities_new_api(destination_data['coordinates'])
-            hotels = await self._discover_accommodations_new_api(destination_data['coordinates'])
-            
-            result_data = {
-                "destination_info": destination_data,
-                "activities": activities,
-                "hotels": hotels
-            }
-            
-            # Step 3: Store in database
-            destination_id = self.db_integration.insert_discovered_destination(result_data)
+            # Store in database (blocking driver, so off the event loop)
+            destination_id = await asyncio.to_thread(self.db_integration.insert_discovered_destination, result_data)
             
             if destination_id:
+                # stored under the name as asked; let the Places display name find it too
+                info = result_data['destination_info']
+                self.db_integration.destination_index.add_alias(info.get('display_name', ''), info['name'])
                 self.logger.info(f"✅ Successfully discovered and stored {destination_name}!")
                 
                 return {
                     "success": True,
                     "destination": destination_name,
                     "destination_id": destination_id,
-                    "activities_found": len(activities),
-                    "hotels_found": len(hotels),
+                    "activities_found": len(result_data['activities']),
+                    "hotels_found": len(result_data['hotels']),
                     "message": f"🎉 {destination_name} added to our knowledge base!"
                 }
             else:
@@ -224,17 +542,80 @@ class DynamicIngestionService:
             self.logger.error(f"❌ Discovery failed for {destination_name}: {str(e)}")
             return {"success": False, "error": str(e)}
 
+    async def collect_destination(self, destination_name: str) -> Optional[Dict[str, Any]]:
+        """Fetch a destination plus nearby activities and hotels from Places, without storing it.
+        
+        Returns None when Places has no match; API errors propagate.
+        """
+        
+        # Step 1: Search for the destination using NEW Places API
+        destination_data = await self._search_destination_new_api(destination_name)
+        if not destination_data:
+            return None
+        
+        # Step 2: Get nearby activities and hotels concurrently using NEW API
+        activities, hotels = await asyncio.gather(
+            self._discover_activities_new_api(destination_data['coordinates'], destination_data.get('viewport')),
+            self._discover_accommodations_new_api(destination_data['coordinates'], destination_data.get('viewport'))
+        )
+        
+        return {
+            "destination_info": destination_data,
+            "activities": activities,
+            "hotels": hotels
+        }
+
+    async def close(self) -> None:
+        """Close the shared Places API session (call on shutdown)"""
+        await self.http.close()
+
+    def places_cache_stats(self) -> Dict[str, Any]:
+        """Hit rate and size of the on-disk Places cache"""
+        return self.places_cache.stats() if self.places_cache else {"enabled": False}
+
+    async def _discover(self, coordinates: Dict[str, float], viewport: Optional[Dict[str, Any]],
+                        radius_m: float, categories) -> Dict[str, Any]:
+        """One circle around the centre, or a tiled sweep when the destination's viewport is larger"""
+        if viewport and viewport_radius_m(viewport) > max(radius_m, self.tiling_min_radius):
+            return await self.discovery.discover_area(viewport, categories)
+        return await self.discovery.discover(coordinates, radius_m, categories)
+
+    async def _post_places(self, method: str, field_mask: str, body: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """POST to a Places API (New) method, reading through the on-disk cache (off the event loop)"""
+        if self.places_cache is not None:
+            try:
+                cached = await asyncio.to_thread(self.places_cache.get, method, body, field_mask)
+            except sqlite3.Error as e:
+                self.logger.warning(f"⚠️ Places cache read failed: {e}")
+                cached = None
+            if cached is not None:
+                return cached
+        
+        headers = {
+            "Content-Type": "application/json",
+            "X-Goog-Api-Key": self.api_key,
+            "X-Goog-FieldMask": field_mask
+        }
+        limiter = self.rate_limits.get(method)
+        if limiter is not None:
+            await limiter.acquire()
+        session = await self.http.get()
+        async with session.post(f"{PLACES_API_URL}:{method}", headers=headers, json=body,
+                                timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            response.raise_for_status()
+            result = await response.json()
+        if self.places_cache is not None:
+            try:
+                await asyncio.to_thread(self.places_cache.put, method, body, field_mask, result)
+            except sqlite3.Error as e:
+                self.logger.warning(f"⚠️ Places cache write failed: {e}")
+        return result
+
     async def _search_destination_new_api(self, destination: str) -> Optional[Dict[str, Any]]:
         """Search for destination using NEW Places API Text Search"""
         
         try:
-            url = "https://places.googleapis.com/v1/places:searchText"
-            
-            headers = {
-                "Content-Type": "application/json",
-                "X-Goog-Api-Key": self.api_key,
-                "X-Goog-FieldMask": "places.id,places.displayName,places.formattedAddress,places.location,places.rating,places.userRatingCount,places.types"
-            }
+            field_mask = "places.id,places.displayName,places.formattedAddress,places.location,places.rating,places.userRatingCount,places.types,places.viewport"
             
             data = {
                 "textQuery": destination,
@@ -242,10 +623,7 @@ class DynamicIngestionService:
                 "maxResultCount": 1
             }
             
-            response = requests.post(url, headers=headers, json=data, timeout=10)
-            response.raise_for_status()
-            
-            result = response.json()
+            result = await self._post_places("searchText", field_mask, data, self.search_timeout)
             
             if not result.get('places'):
                 self.logger.warning(f"No places found for {destination}")
@@ -255,12 +633,14 @@ class DynamicIngestionService:
             
             return {
                 "name": destination,
+                "place_id": place.get('id'),
                 "country": self._extract_country(place.get('formattedAddress', '')) or "Unknown",
                 "display_name": place.get('displayName', {}).get('text', destination),
                 "coordinates": {
                     "lat": place['location']['latitude'],
                     "lng": place['location']['longitude']
                 },
+                "viewport": place.get('viewport'),
                 "address": place.get('formattedAddress', ''),
                 "rating": place.get('rating', 4.0),
                 "user_rating_count": place.get('userRatingCount', 0),
@@ -273,6 +653,8 @@ class DynamicIngestionService:
                 "hidden_gem": place.get('userRatingCount', 0) < 5000
             }
             
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            raise  # upstream trouble is not "no such place"; callers decide whether to retry
         except Exception as e:
             self.logger.error(f"Failed to search destination with NEW API: {e}")
             return None
@@ -285,47 +667,29 @@ class DynamicIngestionService:
                 return parts[-1].strip()
         return None
 
-    async def _discover_activities_new_api(self, coordinates: Dict[str, float]) -> List[Dict[str, Any]]:
-        """Discover activities using NEW Places API Nearby Search"""
+    async def _discover_activities_new_api(self, coordinates: Dict[str, float],
+                                           viewport: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Discover activities per category (attractions, museums, food, ...) using NEW Places API Text Search"""
         
         try:
-            url = "https://places.googleapis.com/v1/places:searchNearby"
-            
-            headers = {
-                "Content-Type": "application/json",
-                "X-Goog-Api-Key": self.api_key,
-                "X-Goog-FieldMask": "places.id,places.displayName,places.formattedAddress,places.location,places.rating,places.userRatingCount,places.types,places.priceLevel"
-            }
-            
-            data = {
-                "includedTypes": ["tourist_attraction", "museum", "amusement_park", "zoo", "aquarium", "park"],
-                "maxResultCount": 15,
-                "locationRestriction": {
-                    "circle": {
-                        "center": {
-                            "latitude": coordinates['lat'],
-                            "longitude": coordinates['lng']
-                        },
-                        "radius": 25000.0  # 25km radius
-                    }
-                }
-            }
-            
-            response = requests.post(url, headers=headers, json=data, timeout=15)
-            response.raise_for_status()
-            
-            result = response.json()
+            result = await self._discover(coordinates, viewport, 25000.0, ACTIVITY_CATEGORIES)  # 25km radius
             activities = []
             
-            for place in result.get('places', []):
+            for match in result['places']:
+                place = match['place']
+                types = place.get('types', [])
                 activity = {
+                    "place_id": place.get('id'),
                     "name": place.get('displayName', {}).get('text', 'Unknown Activity'),
-                    "type": self._map_to_activity_type(place.get('types', [])),
+                    "type": match['category'].activity_type,
+                    "category": match['category'].name,
                     "price": self._estimate_price_from_level(place.get('priceLevel')),
-                    "duration_hours": self._estimate_duration(place.get('types', [])),
+                    "duration_hours": self._estimate_duration(types),
                     "sustainability_score": min(9, int(place.get('rating', 4) * 2)),
-                    "description": f"Popular {place.get('types', ['attraction'])[0].replace('_', ' ')} near {place.get('formattedAddress', '')}",
+                    "description": f"Popular {(types or ['attraction'])[0].replace('_', ' ')} near {place.get('formattedAddress', '')}",
                     "hidden_gem": place.get('userRatingCount', 0) < 1000 and place.get('rating', 0) >= 4.2,
+                    "rating": place.get('rating'),
+                    "rank_score": match['score'],
                     "coordinates": {
                         "lat": place['location']['latitude'],
                         "lng": place['location']['longitude']
@@ -333,52 +697,31 @@ class DynamicIngestionService:
                 }
                 activities.append(activity)
             
-            return activities[:10]  # Return top 10
+            return activities
             
         except Exception as e:
             self.logger.error(f"Failed to discover activities with NEW API: {e}")
             return []
 
-    async def _discover_accommodations_new_api(self, coordinates: Dict[str, float]) -> List[Dict[str, Any]]:
+    async def _discover_accommodations_new_api(self, coordinates: Dict[str, float],
+                                               viewport: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Discover hotels using NEW Places API"""
         
         try:
-            url = "https://places.googleapis.com/v1/places:searchNearby"
-            
-            headers = {
-                "Content-Type": "application/json", 
-                "X-Goog-Api-Key": self.api_key,
-                "X-Goog-FieldMask": "places.id,places.displayName,places.formattedAddress,places.location,places.rating,places.userRatingCount,places.priceLevel"
-            }
-            
-            data = {
-                "includedTypes": ["lodging"],
-                "maxResultCount": 10,
-                "locationRestriction": {
-                    "circle": {
-                        "center": {
-                            "latitude": coordinates['lat'],
-                            "longitude": coordinates['lng']
-                        },
-                        "radius": 20000.0  # 20km radius
-                    }
-                }
-            }
-            
-            response = requests.post(url, headers=headers, json=data, timeout=15)
-            response.raise_for_status()
-            
-            result = response.json()
+            result = await self._discover(coordinates, viewport, 20000.0, LODGING_CATEGORIES)  # 20km radius
             hotels = []
             
-            for place in result.get('places', []):
+            for match in result['places']:
+                place = match['place']
                 hotel = {
+                    "place_id": place.get('id'),
                     "name": place.get('displayName', {}).get('text', 'Unknown Hotel'),
                     "location": place.get('formattedAddress', ''),
                     "price_tier": self._determine_price_tier(place.get('priceLevel')),
                     "rating": place.get('rating', 4.0),
                     "sustainability_score": min(9, int(place.get('rating', 4) * 2)),
                     "amenities": ["WiFi", "Restaurant"],  # Basic amenities
+                    "rank_score": match['score'],
                     "coordinates": {
                         "lat": place['location']['latitude'],
                         "lng": place['location']['longitude']
@@ -386,7 +729,7 @@ class DynamicIngestionService:
                 }
                 hotels.append(hotel)
             
-            return hotels[:8]  # Return top 8
+            return hotels
             
         except Exception as e:
             self.logger.error(f"Failed to discover hotels with NEW API: {e}")
@@ -407,17 +750,6 @@ class DynamicIngestionService:
         else:
             return 'cultural'
 
-    def _map_to_activity_type(self, types: List[str]) -> str:
-        """Map Google Places types to our activity types"""
-        if 'museum' in types or 'art_gallery' in types:
-            return 'cultural'
-        elif 'amusement_park' in types or 'zoo' in types:
-            return 'adventure'
-        elif 'aquarium' in types or 'tourist_attraction' in types:
-            return 'cultural'
-        else:
-            return 'cultural'
-
     def _estimate_price_from_level(self, price_level: Optional[int]) -> int:
         """Convert Google's price level to INR estimate"""
         if price_level is None:
@@ -432,7 +764,7 @@ class DynamicIngestionService:
             return 3
         elif 'amusement_park' in types or 'zoo' in types:
             return 6
-        elif 'park' in types:
+        elif 'park' in types or 'restaurant' in types or 'shopping_mall' in types:
             return 2
         else:
             return 3
@@ -466,8 +798,19 @@ class DynamicIngestionService:
             return f"{destination} is an interesting place worth visiting for its unique character and local attractions."
 
 
-# Create service instance for use in other modules
-ingestion_service = DynamicIngestionService()
+# Shared instance, built on first use so importing this module needs no credentials
+_ingestion_service = Lazy(DynamicIngestionService, "ingestion_service")
+
+
+def get_ingestion_service() -> DynamicIngestionService:
+    return _ingestion_service.get()
+
+
+def __getattr__(name: str):
+    # `from services.dynamic_ingestion_service import ingestion_service` keeps working (and builds it)
+    if name == "ingestion_service":
+        return get_ingestion_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Test functions
@@ -478,7 +821,7 @@ async def test_discovery():
     
     # Test database connection first
     print("1. Testing database connection...")
-    if ingestion_service.db_integration.test_connection():
+    if get_ingestion_service().db_integration.test_connection():
         print("✅ Database connection successful!")
     else:
         print("❌ Database connection failed!")
@@ -492,7 +835,7 @@ async def test_discovery():
         print("-" * 40)
         
         try:
-            result = await ingestion_service.discover_missing_destination(destination)
+            result = await get_ingestion_service().discover_missing_destination(destination)
             
             if result["success"]:
                 print(f"✅ Successfully discovered {destination}!")
@@ -540,6 +883,13 @@ def test_environment_variables():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dynamic data ingestion: discovery smoke test, schema migration")
+    parser.add_argument("--migrate", action="store_true", help="apply the schema migration and exit")
+    args = parser.parse_args()
+    if args.migrate:
+        DatabaseIntegration().migrate()
+        raise SystemExit(0)
+    
     print("🚀 AI Travel Genius - Dynamic Data Ingestion Service")
     print("="*60)
     
@@ -0,0 +1,110 @@
+"""
+Fast-path routing in front of the LLM router.
+
+travel_genius_router spends a full model call only to choose between
+travel_genius and itinerary_assistant. FastPathRouter runs
+classify_intent (keyword + pattern rules, microseconds) on the user's
+message first: when the confidence clears ROUTER_FAST_PATH_MIN_CONFIDENCE it
+runs the target agent directly; anything ambiguous goes to the LLM router as
+before. ROUTER_FAST_PATH=0 sends every turn to the LLM router.
+
+Confident generation requests that state destination, days and budget
+("5-day trip to Goa with a budget of 30000") are answered by the
+ItineraryEngine from stored activities, with no LLM call at all, whenever
+enough is stored for the destination (ITINERARY_ENGINE=0 turns this off).
+"""
+
+import asyncio
+import json
+import logging
+from collections import Counter
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.genai import types
+from pydantic import PrivateAttr
+
+from utils.itinerary_helper import parse_trip_request
+from utils.routing_helper import ROUTE_TARGETS, classify_intent, has_itinerary_context
+
+logger = logging.getLogger("FastPathRouter")
+
+
+def _user_text(ctx: InvocationContext) -> str:
+    content = ctx.user_content
+    if content is None or not content.parts:
+        return ""
+    return "\n".join(part.text for part in content.parts if part.text)
+
+
+class FastPathRouter(BaseAgent):
+    """Root agent: dispatches confident intents directly, everything else to its single sub-agent (the LLM router)"""
+
+    min_confidence: float = 0.6
+    enabled: bool = True
+    use_engine: bool = True
+    _stats: Counter = PrivateAttr(default_factory=Counter)
+
+    @property
+    def router(self) -> BaseAgent:
+        return self.sub_agents[0]
+
+    def _has_itinerary(self, ctx: InvocationContext, text: str) -> bool:
+        # pasted itinerary JSON, or one generated earlier in this session (by travel_genius or the engine)
+        generators = (ROUTE_TARGETS["generate"], self.name)
+        return has_itinerary_context(text) or any(event.author in generators for event in ctx.session.events)
+
+    def route(self, ctx: InvocationContext, text: str) -> Optional[Dict[str, Any]]:
+        """classify_intent() decision for this turn, or None when the LLM router should decide"""
+        if not self.enabled or not text.strip():
+            return None
+        decision = classify_intent(text, self._has_itinerary(ctx, text))
+        return decision if decision["confidence"] >= self.min_confidence else None
+
+    async def _engine_itinerary(self, text: str) -> Optional[Dict[str, Any]]:
+        request = parse_trip_request(text)
+        if request is None:
+            return None
+        # imported here: the engine pulls in the database / weather services
+        from services.itinerary_engine import get_itinerary_engine
+        try:
+            # the first call builds the services (or waits for warm-up to): not on the event loop
+            engine = await asyncio.to_thread(get_itinerary_engine)
+            return await engine.generate(request)
+        except Exception as e:
+            logger.warning("⚠️ Itinerary engine failed, using travel_genius: %s", e)
+            return None
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        text = _user_text(ctx)
+        decision = self.route(ctx, text)
+        if self.use_engine and decision and decision["intent"] == "generate":
+            itinerary = await self._engine_itinerary(text)
+            if itinerary is not None:
+                self._stats["engine"] += 1
+                logger.info("⚡ Itinerary engine answered (confidence %s)", decision["confidence"])
+                yield Event(author=self.name, invocation_id=ctx.invocation_id, branch=ctx.branch,
+                            content=types.Content(role="model", parts=[
+                                types.Part(text=json.dumps(itinerary, ensure_ascii=False))]))
+                return
+        target = self.router.find_agent(decision["target"]) if decision else None
+        if target is None:
+            self._stats["llm_router"] += 1
+            agent = self.router
+        else:
+            self._stats[f"fast:{target.name}"] += 1
+            logger.info("⚡ Fast path → %s (confidence %s, signals %s)",
+                        target.name, decision["confidence"], decision["signals"])
+            agent = target
+        async for event in agent.run_async(ctx):
+            yield event
+
+    def stats(self) -> Dict[str, Any]:
+        total = sum(self._stats.values())
+        return {
+            "turns": total,
+            "fast_path_rate": round(1 - self._stats["llm_router"] / total, 3) if total else None,
+            **self._stats,
+        }
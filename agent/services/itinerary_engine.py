@@ -0,0 +1,293 @@
+"""
+Deterministic itinerary engine: the travel_genius JSON built from stored activities.
+
+build_itinerary() fills every day's morning / lunch / afternoon / evening
+slots from the destination's ingested activities, ranked by personality
+affinity, that day's weather score for the activity's category, quality and
+price against the per-day activity budget. Geographic clusters from the
+ProximityIndex keep each day's stops close together, with the outdoor-heavy
+clusters on the best-weather days. Slots with nothing suitable stored fall back
+to the weather-driven template in utils.itinerary_helper.
+
+ItineraryEngine wires it to the database, the weather service and the
+proximity index, so "N-day trip to X with budget Y" requests are answered in
+milliseconds without an LLM generation (see FastPathRouter); the
+build_itinerary_draft tool gives travel_genius the same draft to refine.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from services.destination_index import CONFIRMED_MATCHES
+from services.weather_scoring import BEACH, INDOOR, OUTDOOR, activity_category
+from utils.async_helper import run_in_service_loop
+from utils.cache_helper import TTLCache
+from utils.itinerary_helper import create_daily_activities
+from utils.lazy_helper import Lazy
+
+logger = logging.getLogger("ItineraryEngine")
+
+# Affinity of each personality for the stored activity types (cultural: attractions, museums,
+# landmarks; adventure: nature, family parks; attraction: nightlife, shopping), and the share of
+# the budget that goes to activities (the budget_optimizer's allocation)
+PERSONALITY_PROFILES = {
+    "HERITAGE":  {"share": 0.20, "types": {"cultural": 1.0, "food": 0.5, "adventure": 0.3, "attraction": 0.2}},
+    "ADVENTURE": {"share": 0.35, "types": {"adventure": 1.0, "cultural": 0.5, "food": 0.4, "attraction": 0.2}},
+    "CULTURAL":  {"share": 0.25, "types": {"cultural": 0.9, "food": 0.8, "attraction": 0.5, "adventure": 0.3}},
+    "PARTY":     {"share": 0.30, "types": {"attraction": 1.0, "food": 0.8, "adventure": 0.5, "cultural": 0.4}},
+    "LUXURY":    {"share": 0.20, "types": {"food": 0.9, "attraction": 0.8, "cultural": 0.7, "adventure": 0.3}},
+}
+
+# stored activity type -> (itinerary "type", title emoji)
+ACTIVITY_STYLE = {
+    "cultural": ("cultural", "🏛️"), "adventure": ("adventure", "🌳"), "food": ("food", "🍽️"),
+    "attraction": ("attraction", "📍"),
+}
+
+# (slot, earliest start hour, longest stay, stored types that suit it, types it excludes, template fallback index)
+DAY_SLOTS = [
+    ("morning", 9.0, 4.0, ("adventure", "cultural"), ("attraction",), 0),
+    ("lunch", 13.0, 1.5, ("food",), (), 1),
+    ("afternoon", 15.0, 3.0, ("cultural", "attraction"), (), None),
+    ("evening", 18.0, 3.0, ("attraction",), ("adventure",), 2),
+]
+TEMPLATE_HOURS = {0: 3.5, 1: 1.5, 2: 2.0}
+DAY_END_HOUR = 22.0
+
+
+def _clock(hour: float) -> str:
+    h, m = int(hour), int(round((hour - int(hour)) * 60))
+    return f"{(h - 1) % 12 + 1}:{m:02d} {'AM' if h < 12 else 'PM'}"
+
+
+def _day_weather(forecast: List[dict], day: int) -> Dict[str, Any]:
+    # days past the forecast get the same neutral scores as create_weather_optimized_itinerary
+    wf = forecast[day - 1] if len(forecast) >= day else {}
+    scores = wf.get("suitability_scores", {})
+    return {"condition": wf.get("condition", "Good"),
+            "outdoor": scores.get("outdoor", 7), "indoor": scores.get("indoor", 6), "beach": scores.get("beach", 5),
+            "recommendations": wf.get("recommendations", [])}
+
+
+def _weather_fit(activity_type: Optional[str], weather: Dict[str, Any]) -> int:
+    category = activity_category(activity_type)
+    return {OUTDOOR: weather["outdoor"], INDOOR: weather["indoor"], BEACH: weather["beach"]}.get(category, 5)
+
+
+def _duration(hours: float) -> str:
+    return "1 hour" if hours == 1 else f"{hours:g} hours"
+
+
+def _assign_groups(day_groups: List[List[str]], activities: List[dict], weather: List[dict]) -> Dict[str, int]:
+    """activity name -> day: the most outdoor-heavy clusters go to the days with the best outdoor scores"""
+    types = {a["name"]: a.get("type") for a in activities}
+
+    def outdoor_share(names: List[str]) -> float:
+        return sum(activity_category(types.get(n)) in (OUTDOOR, BEACH) for n in names) / max(1, len(names))
+
+    groups = sorted(day_groups[:len(weather)], key=outdoor_share, reverse=True)
+    days = sorted(range(1, len(weather) + 1), key=lambda d: -weather[d - 1]["outdoor"])
+    return {name: day for day, names in zip(days, groups) for name in names}
+
+
+def build_itinerary(user_input: dict, activities: List[dict], daily_forecast: Optional[List[dict]] = None,
+                    day_groups: Optional[List[List[str]]] = None) -> Dict[str, Any]:
+    """Itinerary in the travel_genius JSON shape from stored activities.
+
+    user_input: destination, days, budget, groupSize, personality (as parse_trip_request returns).
+    activities: dicts with name, type, price (per person), duration_hours,
+    sustainability_score, hidden_gem, description. daily_forecast: the
+    weather summary's daily_weather (suitability_scores per day). day_groups:
+    activity names per geographic cluster.
+    """
+    destination = user_input.get("destination", "Amazing Destination")
+    days = max(1, int(user_input.get("days", 5)))
+    budget = int(user_input.get("budget", 50_000))
+    group_size = max(1, int(user_input.get("groupSize", 1)))
+    personality = str(user_input.get("personality", "CULTURAL")).upper()
+    profile = PERSONALITY_PROFILES.get(personality, PERSONALITY_PROFILES["CULTURAL"])
+    forecast = daily_forecast or []
+    weather = [_day_weather(forecast, d) for d in range(1, days + 1)]
+    day_budget = budget * profile["share"] / days
+    home_day = _assign_groups(day_groups, activities, weather) if day_groups else {}
+
+    used = set()
+    sustainability = []
+    daily_plans = []
+    for d, w in enumerate(weather, 1):
+        remaining = day_budget
+        clock = 9.0
+        entries = []
+        template = create_daily_activities(d, destination, int(day_budget), w["outdoor"], w["indoor"])
+        for slot, earliest, longest, preferred, excluded, fallback in DAY_SLOTS:
+            start = max(clock, earliest)
+            best, best_score = None, 0.0
+            for a in activities:
+                a_type = a.get("type")
+                if a["name"] in used or a_type in excluded or (slot == "lunch") != (a_type == "food"):
+                    continue
+                cost = int(a.get("price") or 0) * group_size
+                hours = min(float(a.get("duration_hours") or 2), longest)
+                if start + hours > DAY_END_HOUR or cost > max(remaining, 0):
+                    continue
+                score = (2.0 * profile["types"].get(a_type, 0.3)
+                         + 0.3 * _weather_fit(a_type, w)
+                         + 0.1 * (a.get("sustainability_score") or 5)
+                         + (0.5 if a_type in preferred else 0.0)
+                         + (0.8 if home_day.get(a["name"]) == d else 0.0)
+                         + (0.3 if a.get("hidden_gem") else 0.0)
+                         - 0.5 * cost / max(day_budget, 1))
+                if best is None or score > best_score:
+                    best, best_score = a, score
+
+            if best is not None:
+                used.add(best["name"])
+                hours = min(float(best.get("duration_hours") or 2), longest)
+                cost = int(best.get("price") or 0) * group_size
+                kind, emoji = ACTIVITY_STYLE.get(best.get("type"), ("attraction", "📍"))
+                entry = {"title": f"{emoji} {best['name']}",
+                         "description": best.get("description") or f"Visit {best['name']}",
+                         "cost": cost, "type": kind}
+                if best.get("sustainability_score") is not None:
+                    sustainability.append(best["sustainability_score"])
+            elif fallback is not None:
+                # nothing suitable stored: the weather-driven template slot
+                hours = TEMPLATE_HOURS[fallback]
+                entry = {k: template[fallback][k] for k in ("title", "description", "cost", "type")}
+                entry["cost"] = min(entry["cost"], int(max(remaining, 0)))
+                cost = entry["cost"]
+            else:
+                continue
+            entries.append({"id": f"day{d}_activity{len(entries) + 1}", **entry,
+                            "duration": _duration(hours),
+                            "timing": f"{_clock(start)} - {_clock(start + hours)}",
+                            "rating": best.get("rating") if best is not None else None})
+            remaining -= cost
+            clock = start + hours + 0.5
+
+        daily_plans.append({
+            "day": d,
+            "activities": entries,
+            "weatherSummary": {"condition": w["condition"], "outdoorScore": w["outdoor"],
+                               "indoorScore": w["indoor"], "recommendations": w["recommendations"]},
+        })
+
+    # the contract wants at least one "instagram" stop: the last outdoor-ish stop of the best-weather day
+    if not any(e["type"] == "instagram" for plan in daily_plans for e in plan["activities"]):
+        best_day = max(daily_plans, key=lambda p: p["weatherSummary"]["outdoorScore"])
+        photo = next((e for e in reversed(best_day["activities"]) if e["type"] in ("attraction", "adventure")), None)
+        if photo is not None:
+            photo["type"] = "instagram"
+
+    all_entries = [e for plan in daily_plans for e in plan["activities"]]
+    overall = round(sum((w["outdoor"] + w["indoor"]) / 2 for w in weather) / days, 1)
+    recommendations = []
+    priciest = max(all_entries, key=lambda e: e["cost"], default=None)
+    if priciest and priciest["cost"]:
+        recommendations.append(f"Book {priciest['title'].split(' ', 1)[-1]} in advance")
+    if min(w["outdoor"] for w in weather) < 5:
+        recommendations.append("Carry rain gear: indoor stops are scheduled on the low-scoring days")
+    if home_day:
+        recommendations.append(f"Each day's stops in {destination} are grouped by area to keep travel short")
+    return {
+        "tripTitle": f"Weather-Optimized {days}-Day {destination} {personality.title()} Trip",
+        "totalEstimatedCost": sum(e["cost"] for e in all_entries),
+        "dailyPlans": daily_plans,
+        "weatherOptimized": bool(forecast),
+        "sustainabilityScore": round(sum(sustainability) / len(sustainability), 1) if sustainability else None,
+        "weatherSummary": {
+            "overallScore": overall,
+            "suitableForOutdoor": overall >= 6,
+            "alerts": [],
+            "recommendations": list(dict.fromkeys(r for w in weather for r in w["recommendations"]))[:3],
+        },
+        "aiRecommendations": recommendations,
+        "instagramSpots": [e["title"].split(" ", 1)[-1] for e in all_entries if e["type"] == "instagram"],
+        "generatedBy": "AI Travel Genius",
+        "generatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+class ItineraryEngine:
+    """build_itinerary() over the stored activities, the weather service and the proximity index"""
+
+    def __init__(self, ingestion_service, weather_service,
+                 min_activities_per_day: float = 1.5,
+                 weather_timeout: float = 1.0,
+                 activity_ttl: float = 300.0):
+        self.db = ingestion_service.db_integration
+        self.weather = weather_service
+        self.min_activities_per_day = min_activities_per_day
+        self.weather_timeout = weather_timeout
+        self.activity_ttl = activity_ttl
+        self._activities = TTLCache(max_size=512)
+        self.stats = {"built": 0, "declined": 0, "weather_timeouts": 0}
+
+    def _stored_activities(self, destination_id: int) -> List[dict]:
+        activities = self._activities.get(destination_id)
+        if activities is None:
+            activities = self.db.fetch_destination_activities(destination_id)
+            self._activities.set(destination_id, activities, self.activity_ttl)
+        return activities
+
+    async def _forecast(self, destination: str, days: int, start_date: str) -> List[dict]:
+        try:
+            summary = await asyncio.wait_for(
+                run_in_service_loop(self.weather.get_weather_summary_for_dates(destination, start_date, days)),
+                self.weather_timeout)
+            return summary.get("daily_weather", [])
+        except asyncio.TimeoutError:
+            # plan with neutral weather rather than keep the user waiting
+            self.stats["weather_timeouts"] += 1
+            return []
+
+    async def generate(self, user_input: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Itinerary for a parsed trip request, or None when too little is stored for the destination"""
+        started = time.perf_counter()
+        index = self.db.destination_index
+        match = index.lookup(user_input["destination"]) if index.ready else None
+        # a fuzzy hit may be another place ("Raipur" -> Jaipur); travel_genius handles those
+        if match is None or match["match"] not in CONFIRMED_MATCHES:
+            self.stats["declined"] += 1
+            return None
+        days = int(user_input["days"])
+        forecast_task = asyncio.create_task(
+            self._forecast(match["name"], days, user_input.get("startDate") or datetime.now().date().isoformat()))
+        activities = await asyncio.to_thread(self._stored_activities, match["destination_id"])
+        if len([a for a in activities if a.get("type") != "food"]) < self.min_activities_per_day * days:
+            forecast_task.cancel()
+            self.stats["declined"] += 1
+            return None
+        day_groups = None
+        if self.db.proximity_index.ready:
+            clusters = self.db.proximity_index.cluster(match["destination_id"], days, kind="activity")
+            day_groups = [[place["name"] for place in cluster] for cluster in clusters] or None
+        forecast = await forecast_task
+        itinerary = build_itinerary(dict(user_input, destination=match["name"]), activities, forecast, day_groups)
+        self.stats["built"] += 1
+        logger.info(f"✅ Built {days}-day itinerary for {match['name']} from {len(activities)} stored activities "
+                    f"in {(time.perf_counter() - started) * 1000:.1f} ms")
+        return itinerary
+
+
+def _build_engine() -> ItineraryEngine:
+    from services.dynamic_ingestion_service import get_ingestion_service
+    from services.weather_service import get_weather_service
+    return ItineraryEngine(
+        get_ingestion_service(),
+        get_weather_service(),
+        min_activities_per_day=float(os.getenv("ITINERARY_MIN_ACTIVITIES_PER_DAY", 1.5)),
+        weather_timeout=float(os.getenv("ITINERARY_WEATHER_TIMEOUT", 1.0)),
+        activity_ttl=float(os.getenv("ITINERARY_ACTIVITY_TTL", 300)),
+    )
+
+
+_itinerary_engine = Lazy(_build_engine, "itinerary_engine")
+
+
+def get_itinerary_engine() -> ItineraryEngine:
+    return _itinerary_engine.get()
@@ -0,0 +1,232 @@
+"""
+Persistent cache for Places API (New) responses.
+
+Responses are keyed by (method, request body, field mask), with coordinates
+rounded to ~11m so a repeated discovery of the same destination hits. They
+store only the ordered place ids; the place records themselves live in a
+separate place-id keyed table. Overlapping nearby-search circles share one
+copy of each place, and a place refreshed by one response is fresh for all.
+
+Both tables are bounded by TTL and row count (least recently used rows are
+evicted first). Row counts are kept in memory, so a write doesn't count
+its tables; expired rows are swept (and the counts resynced with the file,
+which other workers may share) at most every `prune_interval` seconds. Keep
+TTLs short: Google's terms only allow place ids to be stored indefinitely.
+
+Responses carrying a nextPageToken are not cached: the token is short-lived,
+so a replayed first page would lead to a failed request for the second.
+
+The methods block on SQLite; async callers run them in a worker thread.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    place_ids TEXT NOT NULL,
+    extra TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS places (
+    place_id TEXT PRIMARY KEY,
+    record TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access);
+CREATE INDEX IF NOT EXISTS places_lru ON places (last_access);
+"""
+
+
+def _round_floats(value: Any, digits: int = 4) -> Any:
+    if isinstance(value, float):
+        return round(value, digits)
+    if isinstance(value, dict):
+        return {k: _round_floats(v, digits) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_round_floats(v, digits) for v in value]
+    return value
+
+
+def request_key(method: str, body: Dict[str, Any], field_mask: str) -> str:
+    canonical = json.dumps({"method": method, "body": _round_floats(body),
+                            "mask": ",".join(sorted(field_mask.split(",")))},
+                           sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class PlacesCache:
+    """SQLite-backed response cache plus place-id record store"""
+
+    def __init__(self,
+                 path: str,
+                 ttl_by_method: Optional[Dict[str, float]] = None,
+                 default_ttl: float = 86400.0,
+                 place_ttl: float = 3 * 86400.0,
+                 max_responses: int = 5000,
+                 max_places: int = 50000,
+                 prune_interval: float = 60.0):
+        self.path = path
+        self.ttl_by_method = ttl_by_method or {}
+        self.default_ttl = default_ttl
+        self.place_ttl = place_ttl
+        self.max_responses = max_responses
+        self.max_places = max_places
+        self.prune_interval = prune_interval
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._rows = {table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                      for table in ("responses", "places")}
+        self._pruned_at = 0.0
+
+        self.logger = logging.getLogger("PlacesCache")
+        self._metrics = {"hits": 0, "misses": 0, "expired": 0, "incomplete": 0, "writes": 0,
+                         "uncacheable": 0, "evicted_responses": 0, "evicted_places": 0}
+
+    def get(self, method: str, body: Dict[str, Any], field_mask: str) -> Optional[Dict[str, Any]]:
+        """Cached response for this request, or None if absent, expired or missing a place"""
+        key = request_key(method, body, field_mask)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT place_ids, extra, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._metrics["misses"] += 1
+                return None
+            place_ids, extra, expires_at = json.loads(row[0]), json.loads(row[1]), row[2]
+            if expires_at <= now:
+                self._metrics["expired"] += 1
+                return None
+
+            records = {}
+            if place_ids:
+                placeholders = ",".join("?" * len(place_ids))
+                for place_id, record in self._conn.execute(
+                        f"SELECT place_id, record FROM places WHERE expires_at > ? AND place_id IN ({placeholders})",
+                        (now, *place_ids)):
+                    records[place_id] = record
+            if len(records) < len(set(place_ids)):
+                # a referenced place expired or was evicted; refetch the whole response
+                self._metrics["incomplete"] += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            if place_ids:
+                self._conn.execute(f"UPDATE places SET last_access = ? WHERE place_id IN ({placeholders})",
+                                   (now, *place_ids))
+            self._metrics["hits"] += 1
+
+        response = dict(extra)
+        if place_ids:
+            response["places"] = [json.loads(records[place_id]) for place_id in place_ids]
+        return response
+
+    def put(self, method: str, body: Dict[str, Any], field_mask: str, response: Dict[str, Any]) -> None:
+        if response.get("nextPageToken"):
+            with self._lock:
+                self._metrics["uncacheable"] += 1
+            return
+        places = response.get("places") or []
+        if not places or any(not place.get("id") for place in places):
+            # nothing to dedupe on; keep the response whole
+            place_ids, extra = [], response
+        else:
+            place_ids = [place["id"] for place in places]
+            extra = {k: v for k, v in response.items() if k != "places"}
+
+        key = request_key(method, body, field_mask)
+        now = time.time()
+        ttl = self.ttl_by_method.get(method, self.default_ttl)
+        with self._lock:
+            added = {"responses": 0, "places": 0}
+            self._conn.execute("BEGIN")
+            try:
+                for place in places if place_ids else ():
+                    existing = self._conn.execute(
+                        "SELECT record FROM places WHERE place_id = ?", (place["id"],)).fetchone()
+                    # merge so a narrower field mask never drops fields another response needs
+                    record = {**json.loads(existing[0]), **place} if existing else place
+                    added["places"] += existing is None
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO places (place_id, record, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                        (place["id"], json.dumps(record), now + self.place_ttl, now))
+                added["responses"] += self._conn.execute(
+                    "SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone() is None
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, method, place_ids, extra, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, method, json.dumps(place_ids), json.dumps(extra), now + ttl, now))
+                rows = {table: self._rows[table] + added[table] for table in added}
+                rows = self._prune_locked(now, rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._rows = rows
+            self._metrics["writes"] += 1
+
+    def _prune_locked(self, now: float, rows: Dict[str, int]) -> Dict[str, int]:
+        """Sweep expired rows (at most every prune_interval), evict LRU rows over the limits; the new row counts"""
+        rows = dict(rows)
+        if now - self._pruned_at >= self.prune_interval:
+            # the file may be shared by several workers: resync the counts with what is really there
+            for table in ("responses", "places"):
+                self._conn.execute(f"DELETE FROM {table} WHERE expires_at <= ?", (now,))
+                rows[table] = self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            self._pruned_at = now
+        for table, limit, metric in (("responses", self.max_responses, "evicted_responses"),
+                                     ("places", self.max_places, "evicted_places")):
+            excess = rows[table] - limit
+            if excess > 0:
+                key = "key" if table == "responses" else "place_id"
+                evicted = self._conn.execute(
+                    f"DELETE FROM {table} WHERE {key} IN "
+                    f"(SELECT {key} FROM {table} ORDER BY last_access LIMIT ?)", (excess,)).rowcount
+                rows[table] -= evicted
+                self._metrics[metric] += evicted
+        return rows
+
+    def get_place(self, place_id: str) -> Optional[Dict[str, Any]]:
+        """A single cached place record by id"""
+        with self._lock:
+            row = self._conn.execute("SELECT record FROM places WHERE place_id = ? AND expires_at > ?",
+                                     (place_id, time.time())).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("DELETE FROM places")
+            self._rows = {"responses": 0, "places": 0}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics, rows = dict(self._metrics), dict(self._rows)
+        lookups = metrics["hits"] + metrics["misses"] + metrics["expired"] + metrics["incomplete"]
+        metrics.update(responses=rows["responses"], places=rows["places"],
+                       hit_rate=round(metrics["hits"] / lookups, 3) if lookups else 0.0)
+        return metrics
+
+
+def default_cache_path() -> str:
+    return os.path.join(os.path.expanduser("~"), ".cache", "travel-genius", "places_cache.sqlite3")
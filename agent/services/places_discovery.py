@@ -0,0 +1,329 @@
+"""
+Multi-category Places discovery.
+
+Instead of one nearby search whose 20 results are dominated by whichever
+type is most common, every category (attractions, museums, food, nightlife,
+...) gets its own concurrent Text Search, paginated until the category has
+enough candidates. Results are merged, deduplicated by place id, ranked by a
+configurable score and cut to per-category quotas.
+
+The whole call runs under a global latency budget: categories still running
+when it expires are cancelled and whatever pages already arrived are used.
+
+Sprawling destinations (a state, a metro region) go through discover_area:
+the viewport is covered with a hex grid of small nearby-search circles
+(picked evenly across it when there are more than max_tiles), so results are
+not all drawn from the centre. Tiles that come back full (the API caps a
+nearby search at 20 results) are split into seven smaller circles.
+"""
+
+import asyncio
+import logging
+import math
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from utils.geo_helper import (MAX_SEARCH_RADIUS_M, Tile, cover_viewport, grid_cell, haversine_km,
+                              viewport_center, viewport_radius_m)
+
+PostPlaces = Callable[[str, str, Dict[str, Any], float], Awaitable[Dict[str, Any]]]
+
+SEARCH_FIELD_MASK = ("places.id,places.displayName,places.formattedAddress,places.location,places.rating,"
+                     "places.userRatingCount,places.types,places.priceLevel,nextPageToken")
+NEARBY_FIELD_MASK = ("places.id,places.displayName,places.formattedAddress,places.location,places.rating,"
+                     "places.userRatingCount,places.types,places.priceLevel")
+NEARBY_RESULT_CAP = 20
+
+
+class DiscoveryCategory:
+    """One Text Search stream: query + Places type, mapped onto our activity type"""
+
+    __slots__ = ("name", "query", "included_type", "activity_type", "quota")
+
+    def __init__(self, name: str, query: str, included_type: str, activity_type: str, quota: int):
+        self.name = name
+        self.query = query
+        self.included_type = included_type
+        self.activity_type = activity_type
+        self.quota = quota
+
+
+# Stored activity types keep the itinerary vocabulary (cultural / adventure / food / attraction) that
+# the travel_genius prompt, the toolbox activity filters and earlier rows use
+ACTIVITY_CATEGORIES = [
+    DiscoveryCategory("attractions", "top tourist attractions", "tourist_attraction", "cultural", 8),
+    DiscoveryCategory("museums", "museums and galleries", "museum", "cultural", 4),
+    DiscoveryCategory("landmarks", "historical landmarks", "historical_landmark", "cultural", 3),
+    DiscoveryCategory("nature", "parks and nature", "park", "adventure", 4),
+    DiscoveryCategory("family", "amusement parks zoos and aquariums", "amusement_park", "adventure", 2),
+    DiscoveryCategory("food", "best local restaurants", "restaurant", "food", 4),
+    DiscoveryCategory("nightlife", "bars and nightlife", "bar", "attraction", 3),
+    DiscoveryCategory("shopping", "shopping and markets", "shopping_mall", "attraction", 3),
+]
+
+LODGING_CATEGORIES = [
+    DiscoveryCategory("lodging", "hotels", "lodging", "lodging", 8),
+]
+
+DEFAULT_WEIGHTS = {"rating": 1.0, "popularity": 0.5, "distance": 0.5, "hidden_gem": 0.0}
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """'rating=1,popularity=0.3' -> DEFAULT_WEIGHTS with those overrides"""
+    weights = dict(DEFAULT_WEIGHTS)
+    for part in filter(None, (p.strip() for p in (spec or "").split(","))):
+        name, _, value = part.partition("=")
+        if name.strip() in weights and value:
+            weights[name.strip()] = float(value)
+    return weights
+
+
+class PlacesDiscoveryEngine:
+    """Concurrent, paginated, quota-bounded Places discovery within a latency budget"""
+
+    def __init__(self,
+                 post: PostPlaces,
+                 budget: float = 8.0,
+                 max_pages: int = 2,
+                 request_timeout: float = 10.0,
+                 overfetch: float = 2.0,
+                 max_distance_factor: float = 1.5,
+                 weights: Optional[Dict[str, float]] = None,
+                 tile_radius_m: float = 5000.0,
+                 max_tiles: int = 24,
+                 max_tile_requests: int = 48,
+                 max_split_depth: int = 1,
+                 tile_concurrency: int = 8,
+                 max_quota_scale: float = 3.0):
+        self._post = post
+        self.budget = budget
+        self.max_pages = max(1, max_pages)
+        self.request_timeout = request_timeout
+        self.overfetch = overfetch
+        self.max_distance_factor = max_distance_factor
+        self.weights = weights or dict(DEFAULT_WEIGHTS)
+        self.tile_radius_m = tile_radius_m
+        self.max_tiles = max(1, max_tiles)
+        self.max_tile_requests = max(self.max_tiles, max_tile_requests)
+        self.max_split_depth = max_split_depth
+        self.tile_concurrency = max(1, tile_concurrency)
+        self.max_quota_scale = max_quota_scale
+        self.logger = logging.getLogger("PlacesDiscovery")
+
+    async def discover(self, center: Dict[str, float], radius_m: float,
+                       categories: Sequence[DiscoveryCategory],
+                       budget: Optional[float] = None) -> Dict[str, Any]:
+        """Ranked places per category: {"places": [{"place", "category", "score"}], "stats": {...}}"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + (self.budget if budget is None else budget)
+
+        # pages land here as they arrive, so a cancelled category keeps what it already fetched
+        fetched: Dict[str, List[Dict[str, Any]]] = {c.name: [] for c in categories}
+        stats = self._new_stats(categories)
+        await self._run_categories(center, radius_m, categories, deadline, fetched, stats)
+        return self._finish(center, radius_m, categories, fetched, stats, started)
+
+    async def discover_area(self, viewport: Dict[str, Dict[str, float]], categories: Sequence[DiscoveryCategory],
+                            budget: Optional[float] = None) -> Dict[str, Any]:
+        """discover() over a whole viewport: per-category Text Search plus a tiled nearby sweep.
+
+        Quotas grow with the area (relative to the 25km circle they were tuned
+        for, up to max_quota_scale) and each grid cell of the selection is
+        capped, so a dense centre cannot take every slot.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + (self.budget if budget is None else budget)
+        center = viewport_center(viewport)
+        radius_m = max(viewport_radius_m(viewport), 1.0)
+        tiles = cover_viewport(viewport, self.tile_radius_m, self.max_tiles, limit=self.max_tile_requests)
+
+        fetched: Dict[str, List[Dict[str, Any]]] = {c.name: [] for c in categories}
+        stats = self._new_stats(categories)
+        stats["tiles"] = {"planned": len(tiles), "searched": 0, "split": 0, "saturated": 0,
+                          "radius_m": round(tiles[0].radius_m)}
+        await asyncio.gather(
+            self._run_categories(center, radius_m, categories, deadline, fetched, stats),
+            self._sweep_tiles(tiles, categories, deadline, fetched, stats),
+        )
+        scale = min(self.max_quota_scale, max(1.0, radius_m / 25000.0))
+        return self._finish(center, radius_m, categories, fetched, stats, started,
+                            quota_scale=scale, cell_m=tiles[0].radius_m * 2, cells=len(tiles))
+
+    @staticmethod
+    def _new_stats(categories: Sequence[DiscoveryCategory]) -> Dict[str, Any]:
+        return {"requests": 0, "errors": 0, "pages": {c.name: 0 for c in categories}, "timed_out": []}
+
+    def _finish(self, center: Dict[str, float], radius_m: float, categories: Sequence[DiscoveryCategory],
+                fetched: Dict[str, List[Dict[str, Any]]], stats: Dict[str, Any], started: float,
+                quota_scale: float = 1.0, cell_m: Optional[float] = None, cells: int = 1) -> Dict[str, Any]:
+        selected, candidates, unique = self._select(center, radius_m, categories, fetched,
+                                                    quota_scale=quota_scale, cell_m=cell_m, cells=cells)
+        stats.update(
+            candidates=candidates,
+            unique=unique,
+            selected=len(selected),
+            per_category={c.name: sum(1 for s in selected if s["category"] is c) for c in categories},
+            elapsed_ms=round((asyncio.get_running_loop().time() - started) * 1000, 1),
+        )
+        self.logger.debug(f"Places discovery: {stats}")
+        return {"places": selected, "stats": stats}
+
+    async def _run_categories(self, center: Dict[str, float], radius_m: float,
+                              categories: Sequence[DiscoveryCategory], deadline: float,
+                              fetched: Dict[str, List[Dict[str, Any]]], stats: Dict[str, Any]) -> None:
+        loop = asyncio.get_running_loop()
+        tasks = {loop.create_task(self._fetch_category(c, center, radius_m, deadline, fetched[c.name], stats)): c
+                 for c in categories}
+        done, pending = await asyncio.wait(tasks, timeout=max(0.0, deadline - loop.time()))
+        for task in pending:
+            task.cancel()
+            stats["timed_out"].append(tasks[task].name)
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            if task.exception() is not None:
+                stats["errors"] += 1
+                self.logger.warning(f"⚠️ Discovery for {tasks[task].name} failed: {task.exception()}")
+
+    async def _sweep_tiles(self, tiles: List[Tile], categories: Sequence[DiscoveryCategory], deadline: float,
+                           fetched: Dict[str, List[Dict[str, Any]]], stats: Dict[str, Any]) -> None:
+        """Nearby search per tile, tile_concurrency at a time; full tiles are split and searched again.
+
+        The first max_tiles tiles are always sent (max_tile_requests >= max_tiles).
+        Split children come next, ahead of any further tiles (viewports too
+        large for max_tiles circles), which only use what is left of the cap.
+        """
+        loop = asyncio.get_running_loop()
+        included_types = sorted({c.included_type for c in categories})
+        by_type: Dict[str, List[DiscoveryCategory]] = {}
+        for category in categories:
+            by_type.setdefault(category.included_type, []).append(category)
+        seen = {c.name: {p.get("id") for p in fetched[c.name]} for c in categories}
+        queue, spare = deque(tiles[:self.max_tiles]), deque(tiles[self.max_tiles:])
+        running: Dict[asyncio.Task, Tile] = {}
+        issued = 0
+        tile_stats = stats["tiles"]
+
+        while queue or spare or running:
+            while (queue or spare) and len(running) < self.tile_concurrency and issued < self.max_tile_requests:
+                tile = (queue or spare).popleft()
+                issued += 1
+                stats["requests"] += 1
+                running[loop.create_task(self._post("searchNearby", NEARBY_FIELD_MASK, {
+                    "includedTypes": included_types,
+                    "maxResultCount": NEARBY_RESULT_CAP,
+                    "rankPreference": "POPULARITY",
+                    "locationRestriction": tile.circle(),
+                }, min(self.request_timeout, max(0.0, deadline - loop.time()))))] = tile
+            if not running:
+                break
+            done, _ = await asyncio.wait(running, timeout=max(0.0, deadline - loop.time()),
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                for task in running:
+                    task.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+                stats["timed_out"].append(f"tiles ({len(running) + len(queue) + len(spare)} left)")
+                return
+            for task in done:
+                tile = running.pop(task)
+                if task.exception() is not None:
+                    stats["errors"] += 1
+                    self.logger.warning(f"⚠️ Nearby search for {tile} failed: {task.exception()}")
+                    continue
+                places = task.result().get("places", [])
+                tile_stats["searched"] += 1
+                for place in places:
+                    for place_type in place.get("types", []):
+                        for category in by_type.get(place_type, ()):
+                            if place.get("id") not in seen[category.name]:
+                                seen[category.name].add(place.get("id"))
+                                fetched[category.name].append(place)
+                if len(places) >= NEARBY_RESULT_CAP:
+                    tile_stats["saturated"] += 1
+                    # the cap cut this tile short; smaller circles reach what it left out
+                    if tile.depth < self.max_split_depth and tile.radius_m > 500:
+                        tile_stats["split"] += 1
+                        queue.extend(tile.split())
+
+    async def _fetch_category(self, category: DiscoveryCategory, center: Dict[str, float], radius_m: float,
+                              deadline: float, sink: List[Dict[str, Any]], stats: Dict[str, Any]) -> None:
+        loop = asyncio.get_running_loop()
+        target = max(1, math.ceil(category.quota * self.overfetch))
+        body: Dict[str, Any] = {
+            "textQuery": category.query,
+            "includedType": category.included_type,
+            "pageSize": min(20, target),
+            "locationBias": {"circle": {"center": {"latitude": center["lat"], "longitude": center["lng"]},
+                                        "radius": float(min(radius_m, MAX_SEARCH_RADIUS_M))}},
+        }
+        seen = set()
+        for _ in range(self.max_pages):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            stats["requests"] += 1
+            result = await self._post("searchText", SEARCH_FIELD_MASK, body, min(self.request_timeout, remaining))
+            stats["pages"][category.name] += 1
+            for place in result.get("places", []):
+                if place.get("id") not in seen:
+                    seen.add(place.get("id"))
+                    sink.append(place)
+            token = result.get("nextPageToken")
+            if not token or len(seen) >= target:
+                return
+            body = {**body, "pageToken": token}
+
+    @staticmethod
+    def distance_m(place: Dict[str, Any], center: Dict[str, float]) -> Optional[float]:
+        location = place.get("location") or {}
+        if "latitude" not in location:
+            return None
+        return haversine_km(center["lat"], center["lng"], location["latitude"], location["longitude"]) * 1000
+
+    def score(self, place: Dict[str, Any], distance_m: Optional[float], radius_m: float) -> float:
+        rating = (place.get("rating") or 0.0) / 5.0
+        count = place.get("userRatingCount") or 0
+        popularity = min(1.0, math.log10(1 + count) / 5.0)
+        closeness = max(0.0, 1.0 - distance_m / radius_m) if distance_m is not None else 0.0
+        hidden_gem = 1.0 if count < 1000 and rating >= 0.84 else 0.0
+        w = self.weights
+        return (w["rating"] * rating + w["popularity"] * popularity
+                + w["distance"] * closeness + w["hidden_gem"] * hidden_gem)
+
+    def _select(self, center: Dict[str, float], radius_m: float, categories: Sequence[DiscoveryCategory],
+                fetched: Dict[str, List[Dict[str, Any]]], quota_scale: float = 1.0,
+                cell_m: Optional[float] = None, cells: int = 1):
+        """Greedy by score: each place once, each category up to its (scaled) quota, each cell up to its cap"""
+        candidates = []
+        for order, category in enumerate(categories):
+            for place in fetched[category.name]:
+                distance = self.distance_m(place, center)
+                # Text Search only biases towards the circle; drop results well outside it
+                if not place.get("id") or (distance is not None and distance > radius_m * self.max_distance_factor):
+                    continue
+                candidates.append((self.score(place, distance, radius_m), -order, category, place))
+        unique = len({c[3]["id"] for c in candidates})
+        candidates.sort(key=lambda c: (c[0], c[1]), reverse=True)
+
+        quotas = {c.name: max(1, round(c.quota * quota_scale)) for c in categories}
+        cell_cap = max(2, math.ceil(2 * sum(quotas.values()) / max(1, cells)))
+        per_cell: Dict[Any, int] = {}
+
+        taken = set()
+        filled = {c.name: 0 for c in categories}
+        selected = []
+        for score, _, category, place in candidates:
+            if place["id"] in taken or filled[category.name] >= quotas[category.name]:
+                continue
+            if cell_m and "latitude" in (place.get("location") or {}):
+                cell = grid_cell(place["location"]["latitude"], place["location"]["longitude"], cell_m / 1000)
+                if per_cell.get(cell, 0) >= cell_cap:
+                    continue
+                per_cell[cell] = per_cell.get(cell, 0) + 1
+            taken.add(place["id"])
+            filled[category.name] += 1
+            selected.append({"place": place, "category": category, "score": round(score, 4)})
+        return selected, len(candidates), unique
@@ -0,0 +1,350 @@
+"""
+In-memory proximity index over stored activities and hotels.
+
+Answers "what is near X?" without a database or Places API round-trip:
+points are kept as unit vectors in NumPy arrays, grouped by destination so
+a per-destination query only scans that destination's slice, and a global
+latitude-sorted view narrows radius queries to a band before computing
+exact great-circle distances. Also groups a destination's activities into
+geographic clusters (one per itinerary day).
+
+Like DestinationIndex, it is loaded from the database in the background,
+updated incrementally as rows are upserted, and refreshed periodically.
+Readers never take a lock: every write publishes a new snapshot.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.destination_index import normalize_name
+from utils.geo_helper import EARTH_RADIUS_KM, KM_PER_DEGREE
+
+# (kind, row id, place id, destination id, name, category, latitude, longitude)
+PlaceRow = Tuple[str, Optional[int], str, int, str, Optional[str], float, float]
+
+
+def _key(row: PlaceRow) -> Tuple[int, str]:
+    # a place can belong to several (overlapping) destinations; each keeps its own entry
+    return row[3], row[2]
+
+KINDS = ("activity", "hotel")
+
+
+def _unit_vectors(lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+    phi, lmb = np.radians(lat), np.radians(lng)
+    cos_phi = np.cos(phi)
+    return np.column_stack((cos_phi * np.cos(lmb), cos_phi * np.sin(lmb), np.sin(phi)))
+
+
+def _chord_to_km(chord: np.ndarray) -> np.ndarray:
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0.0, 1.0))
+
+
+class _Snapshot:
+    """Immutable arrays for one published version of the index"""
+
+    __slots__ = ("rows", "xyz", "lat", "lng", "kind", "dest_slices", "lat_order", "lat_sorted", "by_name")
+
+    def __init__(self, rows: List[PlaceRow]):
+        # grouped by destination, so a destination's points are one contiguous slice
+        rows = sorted(rows, key=lambda r: (r[3], r[0], r[4]))
+        self.rows = rows
+        self.lat = np.fromiter((r[6] for r in rows), dtype=np.float64, count=len(rows))
+        self.lng = np.fromiter((r[7] for r in rows), dtype=np.float64, count=len(rows))
+        self.xyz = _unit_vectors(self.lat, self.lng) if rows else np.empty((0, 3))
+        self.kind = np.array([KINDS.index(r[0]) for r in rows], dtype=np.int8)
+        self.dest_slices: Dict[int, Tuple[int, int]] = {}
+        for i, row in enumerate(rows):
+            start, _ = self.dest_slices.get(row[3], (i, i))
+            self.dest_slices[row[3]] = (start, i + 1)
+        self.lat_order = np.argsort(self.lat, kind="stable")
+        self.lat_sorted = self.lat[self.lat_order]
+        self.by_name: Dict[Tuple[int, str], List[int]] = {}
+        for i, row in enumerate(rows):
+            self.by_name.setdefault((row[3], normalize_name(row[4])), []).append(i)
+
+
+class ProximityIndex:
+    """k-nearest, radius and clustering queries over activity / hotel coordinates"""
+
+    def __init__(self,
+                 loader: Callable[[], Iterable[PlaceRow]],
+                 refresh_interval: float = 300.0):
+        self._loader = loader
+        self.refresh_interval = refresh_interval
+        self._snapshot = _Snapshot([])
+        self._added_during_refresh: Dict[str, PlaceRow] = {}
+
+        self._write_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._started = False
+        self._stop = threading.Event()
+        self.last_refresh: Optional[float] = None
+        self.logger = logging.getLogger("ProximityIndex")
+        self._metrics = {"queries": 0, "refreshes": 0, "refresh_errors": 0}
+
+    # ---------- lifecycle ----------
+
+    def start(self) -> None:
+        """Load in the background and keep refreshing; safe to call repeatedly"""
+        if self._started:
+            return
+        with self._write_lock:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._refresh_loop, name="proximity-index", daemon=True).start()
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Block until the first load has finished (or failed); True when loaded"""
+        self.start()
+        return self._ready.wait(timeout) and self.last_refresh is not None
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            self.refresh()
+            if self._stop.wait(self.refresh_interval):
+                return
+
+    def refresh(self) -> bool:
+        """Rebuild from the database and swap it in; keeps the old index on failure"""
+        with self._write_lock:
+            self._added_during_refresh = {}
+        try:
+            rows = {_key(row): row for row in self._loader() if row[6] is not None and row[7] is not None}
+        except Exception as e:
+            self._metrics["refresh_errors"] += 1
+            self.logger.warning(f"⚠️ Proximity index refresh failed: {e}")
+            self._ready.set()
+            return False
+
+        with self._write_lock:
+            # rows upserted after the snapshot was read must survive the swap
+            rows.update(self._added_during_refresh)
+            self._snapshot = _Snapshot(list(rows.values()))
+        self.last_refresh = time.time()
+        self._metrics["refreshes"] += 1
+        self._ready.set()
+        self.logger.debug(f"Proximity index loaded {len(rows)} places")
+        return True
+
+    # ---------- writes ----------
+
+    def add_many(self, rows: Iterable[PlaceRow]) -> None:
+        """Record upserted places (keyed on destination id + place id), publishing the updated index once"""
+        new_rows = {_key(row): row for row in rows if row[6] is not None and row[7] is not None}
+        if not new_rows:
+            return
+        with self._write_lock:
+            merged = {_key(row): row for row in self._snapshot.rows}
+            for key, row in new_rows.items():
+                old = merged.get(key)
+                # the database id is only known after a refresh; keep it when we already have it
+                merged[key] = row if row[1] is not None or old is None else (row[0], old[1], *row[2:])
+            self._added_during_refresh.update(new_rows)
+            self._snapshot = _Snapshot(list(merged.values()))
+
+    # ---------- reads ----------
+
+    def find(self, destination_id: int, name: str, kind: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """A stored place of this destination by name: exact (normalized) match first, then substring"""
+        snap = self._snapshot
+        key = normalize_name(name)
+        if not key:
+            return None
+        hits = snap.by_name.get((destination_id, key), [])
+        if not hits:
+            start, end = snap.dest_slices.get(destination_id, (0, 0))
+            hits = [i for i in range(start, end) if key in normalize_name(snap.rows[i][4])]
+        hits = [i for i in hits if kind is None or snap.rows[i][0] == kind]
+        return self._place(snap, hits[0]) if hits else None
+
+    def nearest(self, lat: float, lng: float, k: int = 5, kind: Optional[str] = None,
+                destination_id: Optional[int] = None, max_km: Optional[float] = None,
+                exclude: Sequence[str] = ()) -> List[Dict[str, Any]]:
+        """Up to k places closest to (lat, lng), nearest first, each with distance_km"""
+        self._metrics["queries"] += 1
+        snap = self._snapshot
+        if destination_id is None:
+            # widen a latitude band until it holds k hits; everything outside is farther
+            radius = 10.0
+            while max_km is None or radius < max_km:
+                hits = self._ranked(snap, self._candidates(snap, lat, radius, None), lat, lng, k, kind, radius, exclude)
+                if len(hits) >= k or radius > 2 * EARTH_RADIUS_KM:
+                    return hits
+                radius *= 4
+        candidates = self._candidates(snap, lat, max_km, destination_id)
+        return self._ranked(snap, candidates, lat, lng, k, kind, max_km, exclude)
+
+    def within(self, lat: float, lng: float, radius_km: float, kind: Optional[str] = None,
+               destination_id: Optional[int] = None, limit: Optional[int] = None,
+               exclude: Sequence[str] = ()) -> List[Dict[str, Any]]:
+        """Every place within radius_km of (lat, lng), nearest first"""
+        self._metrics["queries"] += 1
+        snap = self._snapshot
+        candidates = self._candidates(snap, lat, radius_km, destination_id)
+        return self._ranked(snap, candidates, lat, lng, limit, kind, radius_km, exclude)
+
+    def cluster(self, destination_id: int, groups: int, kind: str = "activity",
+                names: Optional[Sequence[str]] = None, balanced: bool = True,
+                iterations: int = 50) -> List[List[Dict[str, Any]]]:
+        """Split a destination's places (optionally only `names`) into `groups` nearby clusters.
+
+        k-means on the unit vectors with deterministic farthest-point seeding.
+        With `balanced`, every cluster holds at most ceil(n / groups) places
+        (itinerary days should carry similar loads even when the city centre
+        is dense). Clusters come back largest first; within a cluster, places are in
+        nearest-neighbour visiting order starting from the one closest to
+        the cluster centre.
+        """
+        snap = self._snapshot
+        start, end = snap.dest_slices.get(destination_id, (0, 0))
+        idx = np.arange(start, end)
+        idx = idx[snap.kind[idx] == KINDS.index(kind)]
+        if names:
+            wanted = {normalize_name(n) for n in names}
+            idx = np.array([i for i in idx if normalize_name(snap.rows[i][4]) in wanted], dtype=np.int64)
+        if len(idx) == 0:
+            return []
+        groups = max(1, min(groups, len(idx)))
+        points = snap.xyz[idx]
+
+        # farthest-point seeding: start at the point farthest from the centroid
+        centers = [points[np.argmin(points @ points.mean(axis=0))]]
+        while len(centers) < groups:
+            nearest = np.max(points @ np.array(centers).T, axis=1)
+            centers.append(points[np.argmin(nearest)])
+        centers = np.array(centers)
+        labels = None
+        for _ in range(iterations):
+            similarity = points @ centers.T
+            labels_new = (self._assign_balanced(similarity, -(-len(points) // groups)) if balanced
+                          else np.argmax(similarity, axis=1))
+            for g in range(groups):
+                members = points[labels_new == g]
+                if len(members):
+                    center = members.sum(axis=0)
+                    centers[g] = center / np.linalg.norm(center)
+            if labels is not None and np.array_equal(labels_new, labels):
+                break
+            labels = labels_new
+
+        clusters = []
+        for g in range(groups):
+            members = idx[labels == g]
+            if len(members) == 0:
+                continue
+            clusters.append(self._route(snap, members, centers[g]))
+        clusters.sort(key=len, reverse=True)
+        return clusters
+
+    # ---------- internals ----------
+
+    @staticmethod
+    def _candidates(snap: _Snapshot, lat: float, radius_km: Optional[float],
+                    destination_id: Optional[int]) -> np.ndarray:
+        if destination_id is not None:
+            start, end = snap.dest_slices.get(destination_id, (0, 0))
+            return np.arange(start, end)
+        if radius_km is None:
+            return np.arange(len(snap.rows))
+        band = radius_km / KM_PER_DEGREE
+        lo = np.searchsorted(snap.lat_sorted, lat - band, side="left")
+        hi = np.searchsorted(snap.lat_sorted, lat + band, side="right")
+        return snap.lat_order[lo:hi]
+
+    def _ranked(self, snap: _Snapshot, candidates: np.ndarray, lat: float, lng: float, k: Optional[int],
+                kind: Optional[str], max_km: Optional[float], exclude: Sequence[str]) -> List[Dict[str, Any]]:
+        if kind is not None:
+            candidates = candidates[snap.kind[candidates] == KINDS.index(kind)]
+        if len(candidates) == 0:
+            return []
+        origin = _unit_vectors(np.array([lat]), np.array([lng]))[0]
+        distances = _chord_to_km(np.linalg.norm(snap.xyz[candidates] - origin, axis=1))
+        if max_km is not None:
+            keep = distances <= max_km
+            candidates, distances = candidates[keep], distances[keep]
+        excluded = set(exclude)
+        wanted = None if k is None else k + len(excluded)
+        if wanted is not None and wanted < len(candidates):
+            part = np.argpartition(distances, wanted)[:wanted]
+            results = self._collect(snap, candidates[part], distances[part], k, excluded)
+            if len(results) >= k:
+                return results
+            # duplicates (a place stored under overlapping destinations) used up the partition
+        return self._collect(snap, candidates, distances, k, excluded)
+
+    def _collect(self, snap: _Snapshot, candidates: np.ndarray, distances: np.ndarray, k: Optional[int],
+                 excluded: set) -> List[Dict[str, Any]]:
+        """Nearest first, each place once even when several destinations hold it"""
+        results, seen = [], set(excluded)
+        for i in np.argsort(distances, kind="stable"):
+            row = snap.rows[candidates[i]]
+            if row[2] in seen:
+                continue
+            seen.add(row[2])
+            results.append(self._place(snap, candidates[i], float(distances[i])))
+            if k is not None and len(results) >= k:
+                break
+        return results
+
+    @staticmethod
+    def _assign_balanced(similarity: np.ndarray, capacity: int) -> np.ndarray:
+        """Closest-first assignment of points to centres, no centre taking more than `capacity`"""
+        groups = similarity.shape[1]
+        labels = np.full(similarity.shape[0], -1, dtype=np.int64)
+        counts = np.zeros(groups, dtype=np.int64)
+        for flat in np.argsort(-similarity, axis=None, kind="stable"):
+            point, group = divmod(int(flat), groups)
+            if labels[point] < 0 and counts[group] < capacity:
+                labels[point] = group
+                counts[group] += 1
+        return labels
+
+    def _route(self, snap: _Snapshot, members: np.ndarray, center: np.ndarray) -> List[Dict[str, Any]]:
+        """Greedy nearest-neighbour walk through a cluster, from the member closest to its centre"""
+        points = snap.xyz[members]
+        remaining = list(range(len(members)))
+        current = int(np.argmax(points @ center))
+        route = []
+        previous = None
+        while remaining:
+            remaining.remove(current)
+            step = None if previous is None else float(_chord_to_km(np.linalg.norm(points[current] - points[previous])))
+            place = self._place(snap, members[current])
+            place["leg_km"] = round(step, 2) if step is not None else 0.0
+            route.append(place)
+            previous = current
+            if remaining:
+                rest = np.array(remaining)
+                current = int(rest[np.argmax(points[rest] @ points[previous])])
+        return route
+
+    @staticmethod
+    def _place(snap: _Snapshot, i: int, distance_km: Optional[float] = None) -> Dict[str, Any]:
+        kind, row_id, place_id, dest_id, name, category, lat, lng = snap.rows[int(i)]
+        place = {"kind": kind, "id": row_id, "place_id": place_id, "destination_id": dest_id, "name": name,
+                 "category": category, "latitude": lat, "longitude": lng}
+        if distance_km is not None:
+            place["distance_km"] = round(distance_km, 2)
+        return place
+
+    def __len__(self) -> int:
+        return len(self._snapshot.rows)
+
+    @property
+    def ready(self) -> bool:
+        return self.last_refresh is not None
+
+    def stats(self) -> Dict[str, Any]:
+        metrics = dict(self._metrics)
+        metrics.update(size=len(self), destinations=len(self._snapshot.dest_slices), ready=self.ready,
+                       last_refresh=self.last_refresh)
+        return metrics
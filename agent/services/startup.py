@@ -0,0 +1,136 @@
+"""
+Startup warm-up and readiness for the agent server.
+
+Importing agent.py no longer builds any client. Instead, warm_up() builds
+the toolbox toolset, the weather service and the ingestion service in
+parallel threads, so a cold start costs the slowest of them rather than
+their sum. Anything warm-up has not reached yet is built on first use.
+
+readiness() reports each component's state in the running process (for
+whatever embeds the agent and serves health checks). `python -m
+services.startup` is a pre-deploy smoke check, not a probe: it warms up a
+fresh process and exits non-zero when a required component cannot be built
+(missing credentials, unreachable toolbox or database).
+"""
+
+import argparse
+import concurrent.futures
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+logger = logging.getLogger("Startup")
+
+_import_ms: Optional[float] = None
+_warmup_thread: Optional[threading.Thread] = None
+_warmup_lock = threading.Lock()
+
+
+def _warm_toolbox() -> None:
+    from services.toolbox_service import travel_toolset
+    travel_toolset.load()
+
+
+def _warm_weather() -> None:
+    from services.weather_service import get_weather_service
+    get_weather_service()
+
+
+def _warm_ingestion() -> None:
+    from services.dynamic_ingestion_service import get_ingestion_service
+    # also starts the destination / proximity index loads; CLOUDSQL_POOL_MIN connections are opened now
+    get_ingestion_service().db_integration.pool.prefill()
+
+
+COMPONENTS: Dict[str, Callable[[], None]] = {
+    "toolbox": _warm_toolbox,
+    "weather_service": _warm_weather,
+    "ingestion_service": _warm_ingestion,
+}
+
+
+def _component_stats() -> Dict[str, Dict[str, Any]]:
+    # only report modules that are already imported; readiness must not trigger imports
+    stats = {}
+    toolbox = sys.modules.get("services.toolbox_service")
+    weather = sys.modules.get("services.weather_service")
+    ingestion = sys.modules.get("services.dynamic_ingestion_service")
+    stats["toolbox"] = toolbox.travel_toolset.stats() if toolbox else {"ready": False}
+    stats["weather_service"] = weather._weather_service.stats() if weather else {"ready": False}
+    stats["ingestion_service"] = ingestion._ingestion_service.stats() if ingestion else {"ready": False}
+    return stats
+
+
+def required_components() -> Sequence[str]:
+    spec = os.getenv("STARTUP_REQUIRED", ",".join(COMPONENTS))
+    return [name.strip() for name in spec.split(",") if name.strip() in COMPONENTS]
+
+
+def warm_up(timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Build every component concurrently; returns readiness() once all finished or timeout passed"""
+    started = time.perf_counter()
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=len(COMPONENTS), thread_name_prefix="warmup")
+    futures = {pool.submit(fn): name for name, fn in COMPONENTS.items()}
+    done, _ = concurrent.futures.wait(futures, timeout=timeout)
+    # a slow component keeps building in the background; don't wait for it here
+    pool.shutdown(wait=False)
+    for future in done:
+        if future.exception() is not None:
+            logger.warning(f"⚠️ Warm-up of {futures[future]} failed: {future.exception()}")
+    elapsed = round((time.perf_counter() - started) * 1000, 1)
+    status = readiness()
+    status["warmup_ms"] = elapsed
+    logger.info(f"Warm-up finished in {elapsed} ms (ready={status['ready']})")
+    return status
+
+
+def start_background_warmup() -> None:
+    """Run warm_up() once on a daemon thread; no-op when STARTUP_WARMUP=0 or already started"""
+    global _warmup_thread
+    if os.getenv("STARTUP_WARMUP", "1") == "0":
+        return
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=warm_up, name="startup-warmup", daemon=True)
+            _warmup_thread.start()
+
+
+def record_import(started: float, budget_ms: Optional[float] = None) -> float:
+    """Log how long importing the agent module took; warn past AGENT_IMPORT_BUDGET_MS when one is set.
+
+    There is no default budget: the import is dominated by google.adk / genai
+    and takes ~6-7 s on a typical instance, so a fixed figure warned on every start.
+    """
+    global _import_ms
+    _import_ms = round((time.perf_counter() - started) * 1000, 1)
+    if budget_ms is None and os.getenv("AGENT_IMPORT_BUDGET_MS"):
+        budget_ms = float(os.getenv("AGENT_IMPORT_BUDGET_MS"))
+    if budget_ms is not None and _import_ms > budget_ms:
+        logger.warning(f"⚠️ Agent import took {_import_ms} ms (budget {budget_ms:.0f} ms)")
+    else:
+        logger.info(f"Agent import took {_import_ms} ms")
+    return _import_ms
+
+
+def readiness() -> Dict[str, Any]:
+    """{"ready": all required components built, "components": {name: stats}, "import_ms": ...}"""
+    components = _component_stats()
+    return {
+        "ready": all(components[name]["ready"] for name in required_components()),
+        "components": components,
+        "import_ms": _import_ms,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-deploy smoke check: build the agent's services in a "
+                                                 "fresh process and report which ones fail")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+    result = warm_up(timeout=args.timeout)
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if result["ready"] else 1)
@@ -0,0 +1,410 @@
+"""
+Shared MCP Toolbox client and a lazily loaded toolset for the agents.
+
+Nothing here touches the network at import time. One ToolboxService per
+process owns the only aiohttp session to the toolbox server (on the shared
+service loop), and the travel_genius_toolset is built the first time an
+agent asks for its tools (or by the startup warm-up, whichever comes first).
+
+Toolset manifests are cached on local disk with a sha256 content hash, so a
+worker with a warm cache builds its tools without any request to the
+toolbox server, and workers that boot together on a cold cache share one
+download (a lock file next to the entry); scaling out to N workers no longer
+means N schema downloads. The cache sits at the HTTP layer: toolbox_core's
+own ToolboxClient.load_toolset builds the tools, through a session that
+answers the manifest GET from the cache and passes everything else (tool
+invocations) to the shared aiohttp session. A background check re-fetches the manifest every
+MCP_TOOLBOX_MANIFEST_CHECK seconds (first check jittered, so workers started
+together don't poll together) and swaps in new tools when the hash changes.
+
+If the toolbox server is down and nothing is cached, agents get no database
+tools for that turn instead of the process failing to start; loading is
+retried after a short backoff.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import aiohttp
+from google.adk.tools import FunctionTool
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.base_toolset import BaseToolset
+from toolbox_core import ToolboxClient
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, each worker fetches on a miss
+    fcntl = None
+
+from utils.async_helper import run_in_service_loop, service_loop
+from utils.lazy_helper import Lazy
+
+logger = logging.getLogger("ToolboxService")
+
+# bump when the on-disk entry layout changes; older entries are ignored
+MANIFEST_CACHE_FORMAT = 1
+
+
+def toolbox_url() -> str:
+    return os.getenv("MCP_TOOLBOX_URL", "http://127.0.0.1:5000")
+
+
+def default_manifest_cache_dir() -> str:
+    return os.path.join(os.path.expanduser("~"), ".cache", "travel-genius", "toolbox")
+
+
+def manifest_hash(manifest: Dict[str, Any]) -> str:
+    """sha256 of the manifest's canonical JSON (key order and whitespace don't count)"""
+    canonical = json.dumps(manifest, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ManifestCache:
+    """One JSON file per (server, toolset): the manifest plus its hash, server version and fetch time"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path(self, url: str, toolset: str) -> str:
+        key = hashlib.sha1(f"{url.rstrip('/')}|{toolset}".encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"{toolset}-{key}.json")
+
+    def load(self, url: str, toolset: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path(url, toolset), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (entry.get("format") != MANIFEST_CACHE_FORMAT or entry.get("url") != url.rstrip("/")
+                or entry.get("toolset") != toolset
+                or manifest_hash(entry.get("manifest") or {}) != entry.get("sha256")):
+            return None  # other layout, other server, or a corrupted file
+        return entry
+
+    @contextlib.contextmanager
+    def fetch_lock(self, url: str, toolset: str):
+        """Cross-process lock held while one worker downloads; the others wait and read its entry"""
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path(url, toolset) + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def save(self, url: str, toolset: str, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        entry = {
+            "format": MANIFEST_CACHE_FORMAT,
+            "url": url.rstrip("/"),
+            "toolset": toolset,
+            "server_version": manifest.get("serverVersion"),
+            "sha256": manifest_hash(manifest),
+            "fetched_at": time.time(),
+            "manifest": manifest,
+        }
+        path = self.path(url, toolset)
+        os.makedirs(self.directory, exist_ok=True)
+        # unique temp name: several workers may refresh the same entry at once
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+        return entry
+
+
+class _ReplayedResponse:
+    """Enough of an aiohttp response for a client reading a JSON body"""
+
+    status, reason, ok = 200, "OK", True
+
+    def __init__(self, body: Dict[str, Any]):
+        self._body = body
+
+    async def __aenter__(self) -> "_ReplayedResponse":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+    async def json(self, **kwargs) -> Dict[str, Any]:
+        return self._body
+
+    async def text(self, **kwargs) -> str:
+        return json.dumps(self._body)
+
+
+class ManifestReplaySession:
+    """The shared aiohttp session, except that GETs of known manifest URLs are answered from memory.
+
+    Handed to ToolboxClient so its load_toolset parses a cached manifest
+    without a request; tool invocations (POSTs) go to the real session.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, manifests: Dict[str, Dict[str, Any]]):
+        self._session = session
+        self._manifests = manifests
+        self.replayed = 0
+
+    def get(self, url, **kwargs):
+        manifest = self._manifests.get(str(url))
+        if manifest is None:
+            return self._session.get(url, **kwargs)
+        self.replayed += 1
+        return _ReplayedResponse(manifest)
+
+    def __getattr__(self, name: str):
+        return getattr(self._session, name)
+
+
+def _on_service_loop(tool: Callable) -> Callable:
+    """An async callable with the tool's name, docs and signature that runs it on the service loop.
+
+    The tools' session lives on the service loop; ADK awaits tools on its own
+    loop, so each call is handed over (and ADK's loop is never blocked).
+    """
+    async def call(**kwargs):
+        return await run_in_service_loop(tool(**kwargs))
+
+    call.__name__ = call.__qualname__ = tool.__name__
+    call.__doc__ = tool.__doc__
+    call.__signature__ = tool.__signature__
+    call.__annotations__ = tool.__annotations__
+    return call
+
+
+class ToolboxService:
+    """The process's single toolbox connection: manifest fetches, the cache and tool construction"""
+
+    def __init__(self, url: str, cache: Optional[ManifestCache] = None, request_timeout: float = 10.0):
+        self.url = url.rstrip("/")
+        self.cache = cache
+        self.request_timeout = request_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.downloads = 0
+        self.cache_hits = 0
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # created on (and only used from) the shared service loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def _fetch(self, toolset: str) -> Dict[str, Any]:
+        session = await self._get_session()
+        async with session.get(self.toolset_url(toolset),
+                               timeout=aiohttp.ClientTimeout(total=self.request_timeout)) as response:
+            if not response.ok:
+                raise RuntimeError(f"Toolbox returned {response.status} for toolset {toolset}: "
+                                   f"{await response.text()}")
+            return await response.json()
+
+    def fetch_manifest(self, toolset: str) -> Dict[str, Any]:
+        """Download the manifest (blocking) and store it in the cache"""
+        manifest = service_loop.run_sync(self._fetch(toolset))
+        self.downloads += 1
+        if self.cache is not None:
+            try:
+                return self.cache.save(self.url, toolset, manifest)
+            except OSError as e:
+                logger.warning(f"⚠️ Could not cache toolbox manifest: {e}")
+        return {"sha256": manifest_hash(manifest), "server_version": manifest.get("serverVersion"),
+                "fetched_at": time.time(), "manifest": manifest}
+
+    def manifest(self, toolset: str) -> Dict[str, Any]:
+        """Cached manifest entry when there is one, otherwise a fresh download"""
+        if self.cache is None:
+            return self.fetch_manifest(toolset)
+        entry = self.cache.load(self.url, toolset)
+        if entry is None:
+            with self.cache.fetch_lock(self.url, toolset):
+                # a worker that held the lock before us has probably just written it
+                entry = self.cache.load(self.url, toolset)
+                if entry is None:
+                    return self.fetch_manifest(toolset)
+        self.cache_hits += 1
+        return entry
+
+    def toolset_url(self, toolset: str) -> str:
+        return f"{self.url}/api/toolset/{toolset}"
+
+    async def _load_toolset(self, toolset: str, manifest: Dict[str, Any]) -> list:
+        session = ManifestReplaySession(await self._get_session(), {self.toolset_url(toolset): manifest})
+        tools = await ToolboxClient(self.url, session=session).load_toolset(toolset)
+        if not session.replayed:
+            # toolbox_core fetched the manifest some other way: still correct, just not from the cache
+            logger.warning("⚠️ toolbox_core bypassed the cached manifest; it was downloaded again")
+        return tools
+
+    def build_tools(self, toolset: str, manifest: Dict[str, Any]) -> List[Callable]:
+        """Tools for `manifest`, built by ToolboxClient.load_toolset on the shared session"""
+        return [_on_service_loop(tool) for tool in service_loop.run_sync(self._load_toolset(toolset, manifest))]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"url": self.url, "downloads": self.downloads, "cache_hits": self.cache_hits,
+                "cache_dir": self.cache.directory if self.cache is not None else None}
+
+
+def _build_toolbox_service() -> ToolboxService:
+    cache_dir = os.getenv("MCP_TOOLBOX_CACHE_DIR", default_manifest_cache_dir())
+    return ToolboxService(
+        toolbox_url(),
+        cache=None if cache_dir.lower() == "off" else ManifestCache(cache_dir),
+        request_timeout=float(os.getenv("MCP_TOOLBOX_LOAD_TIMEOUT", 10)),
+    )
+
+
+_toolbox_service = Lazy(_build_toolbox_service, "toolbox_service")
+
+
+def get_toolbox_service() -> ToolboxService:
+    """The one toolbox connection for this process (agents and services alike)"""
+    return _toolbox_service.get()
+
+
+class LazyToolboxToolset(BaseToolset):
+    """ADK toolset whose tools come from the cached (or freshly fetched) toolbox manifest on first use"""
+
+    def __init__(self,
+                 toolset_name: str,
+                 load_timeout: float = 10.0,
+                 retry_interval: float = 30.0,
+                 check_interval: float = 600.0):
+        super().__init__()
+        self.toolset_name = toolset_name
+        self.load_timeout = load_timeout
+        self.retry_interval = retry_interval
+        self.check_interval = check_interval
+        self._tools: Optional[List[BaseTool]] = None
+        self._lock = threading.Lock()
+        self._failed_at: Optional[float] = None
+        self._checker: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.version: Optional[Dict[str, Any]] = None
+        self.load_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.attempts = 0
+        self.updates = 0
+
+    def load(self) -> List[BaseTool]:
+        """Build the toolset (blocking, thread-safe); raises when there is no cache and no server"""
+        if self._tools is not None:
+            return self._tools
+        with self._lock:
+            if self._tools is None:
+                self.attempts += 1
+                started = time.perf_counter()
+                try:
+                    service = get_toolbox_service()
+                    entry = service.manifest(self.toolset_name)
+                    self._publish(service, entry)
+                except Exception as e:
+                    self._failed_at = time.monotonic()
+                    self.last_error = f"{type(e).__name__}: {e}"
+                    raise
+                self.load_ms = round((time.perf_counter() - started) * 1000, 1)
+                self.last_error = None
+                logger.info(f"✅ Loaded {len(self._tools)} tools from {self.toolset_name} "
+                            f"(manifest {entry['sha256'][:12]}) in {self.load_ms} ms")
+                self._start_checker()
+            return self._tools
+
+    def _publish(self, service: ToolboxService, entry: Dict[str, Any]) -> None:
+        # what LlmAgent does with plain callables in `tools=`
+        self._tools = [FunctionTool(func=tool) for tool in service.build_tools(self.toolset_name, entry["manifest"])]
+        self.version = {"sha256": entry["sha256"], "server_version": entry.get("server_version"),
+                        "fetched_at": entry.get("fetched_at")}
+
+    def check_for_update(self) -> bool:
+        """Re-fetch the manifest; swap in new tools when its hash changed. True when updated."""
+        service = get_toolbox_service()
+        entry = service.fetch_manifest(self.toolset_name)
+        current = self.version["sha256"] if self.version else None
+        if entry["sha256"] == current:
+            self.version["fetched_at"] = entry.get("fetched_at")
+            return False
+        with self._lock:
+            self._publish(service, entry)
+        self.updates += 1
+        logger.info(f"🔄 Toolset {self.toolset_name} changed on the server (manifest {entry['sha256'][:12]})")
+        return True
+
+    def _start_checker(self) -> None:
+        if self.check_interval <= 0 or self._checker is not None:
+            return
+        self._checker = threading.Thread(target=self._check_loop, name="toolbox-manifest-check", daemon=True)
+        self._checker.start()
+
+    def _check_loop(self) -> None:
+        # jittered first check: workers started together shouldn't all hit the server together
+        delay = random.uniform(0.1, 1.0) * self.check_interval
+        while not self._stop.wait(delay):
+            try:
+                self.check_for_update()
+            except Exception as e:
+                logger.warning(f"⚠️ Toolset staleness check failed (keeping current tools): {e}")
+            delay = self.check_interval
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    async def get_tools(self, readonly_context=None) -> List[BaseTool]:
+        if self._tools is None:
+            if self._failed_at is not None and time.monotonic() - self._failed_at < self.retry_interval:
+                return []
+            try:
+                # loading blocks; keep the agent's event loop free
+                await asyncio.wait_for(asyncio.to_thread(self.load), self.load_timeout)
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self._failed_at = time.monotonic()
+                    self.last_error = f"timed out after {self.load_timeout}s"
+                logger.warning(f"⚠️ Toolbox toolset {self.toolset_name} unavailable: {self.last_error or e}")
+                return []
+        return [tool for tool in self._tools if self._is_tool_selected(tool, readonly_context)]
+
+    async def close(self) -> None:
+        self.stop()
+
+    def subset(self, tool_names: List[str]) -> "ToolboxToolsetView":
+        """A view with only `tool_names`, sharing this toolset's loaded tools"""
+        return ToolboxToolsetView(self, tool_names)
+
+    @property
+    def ready(self) -> bool:
+        return self._tools is not None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"ready": self.ready, "init_ms": self.load_ms, "attempts": self.attempts, "error": self.last_error,
+                "tools": len(self._tools) if self._tools is not None else 0, "version": self.version,
+                "updates": self.updates}
+
+
+class ToolboxToolsetView(BaseToolset):
+    """Filtered view of a LazyToolboxToolset (per-agent tool subsets); loading and closing stay with the parent"""
+
+    def __init__(self, parent: LazyToolboxToolset, tool_names: List[str]):
+        super().__init__(tool_filter=list(tool_names))
+        self.parent = parent
+
+    async def get_tools(self, readonly_context=None) -> List[BaseTool]:
+        tools = await self.parent.get_tools(readonly_context)
+        return [tool for tool in tools if self._is_tool_selected(tool, readonly_context)]
+
+
+travel_toolset = LazyToolboxToolset(
+    "travel_genius_toolset",
+    load_timeout=float(os.getenv("MCP_TOOLBOX_LOAD_TIMEOUT", 10)),
+    retry_interval=float(os.getenv("MCP_TOOLBOX_RETRY_INTERVAL", 30)),
+    check_interval=float(os.getenv("MCP_TOOLBOX_MANIFEST_CHECK", 600)),
+)
@@ -0,0 +1,258 @@
+"""
+Vectorized weather suitability scoring.
+
+Packs forecast days into NumPy arrays and scores every day against every
+activity category in one pass. Results are identical to
+WeatherService.get_weather_suitability_score, which remains the readable
+reference implementation.
+"""
+
+import threading
+from numbers import Real
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Activity categories understood by the scorer; anything else scores a flat 5
+OUTDOOR, INDOOR, BEACH, NEUTRAL = range(4)
+CATEGORY_TYPES = {
+    OUTDOOR: ('outdoor', 'adventure', 'sightseeing', 'walking'),
+    INDOOR: ('indoor', 'cultural', 'museum', 'shopping'),
+    BEACH: ('beach', 'water', 'swimming'),
+}
+_TYPE_TO_CATEGORY = {t: c for c, types in CATEGORY_TYPES.items() for t in types}
+
+
+def activity_category(activity_type) -> int:
+    """Map an activity type string onto OUTDOOR / INDOOR / BEACH / NEUTRAL"""
+    if not isinstance(activity_type, str):
+        return NEUTRAL
+    return _TYPE_TO_CATEGORY.get(activity_type.lower(), NEUTRAL)
+
+
+def _condition_deltas(condition: str) -> Tuple[int, int, int]:
+    """Per-category score adjustment for a (lower-cased) condition string"""
+    if "clear" in condition or "sun" in condition:
+        outdoor = 3
+    elif "cloud" in condition:
+        outdoor = 1
+    elif "rain" in condition:
+        outdoor = -3
+    elif "storm" in condition:
+        outdoor = -5
+    else:
+        outdoor = 0
+
+    if "rain" in condition or "drizzle" in condition:
+        indoor = 1
+    elif "storm" in condition:
+        indoor = 2
+    else:
+        indoor = 0
+
+    if "clear" in condition or "sun" in condition:
+        beach = 4
+    elif "cloud" in condition:
+        beach = 2
+    else:
+        beach = 0
+    return outdoor, indoor, beach
+
+
+class PackedForecast:
+    """Column-oriented view of a list of forecast day (or slot) dicts."""
+
+    __slots__ = ("avg_temp", "precipitation", "wind_speed", "condition_code", "numeric_ok", "condition_ok")
+
+    def __init__(self, avg_temp, precipitation, wind_speed, condition_code, numeric_ok, condition_ok):
+        self.avg_temp = avg_temp
+        self.precipitation = precipitation
+        self.wind_speed = wind_speed
+        self.condition_code = condition_code
+        self.numeric_ok = numeric_ok
+        self.condition_ok = condition_ok
+
+    def __len__(self) -> int:
+        return len(self.avg_temp)
+
+
+class WeatherScoringEngine:
+    """Scores all days x all activity categories with NumPy array operations."""
+
+    def __init__(self):
+        # Condition strings are interned to integer codes; deltas are looked up by code
+        self._condition_codes: Dict[str, int] = {}
+        self._deltas = np.zeros((0, 3), dtype=np.int64)
+        # one engine serves the ADK thread and the service loop; only interning a new condition writes
+        self._intern_lock = threading.Lock()
+
+    def _condition_code(self, condition: str) -> int:
+        code = self._condition_codes.get(condition)
+        if code is None:
+            with self._intern_lock:
+                code = self._condition_codes.get(condition)
+                if code is None:
+                    # grow the delta table before publishing the code so readers never index past it
+                    code = len(self._deltas)
+                    self._deltas = np.vstack([self._deltas, np.array(_condition_deltas(condition), dtype=np.int64)])
+                    self._condition_codes[condition] = code
+        return code
+
+    def pack(self, days: Sequence[Dict]) -> PackedForecast:
+        n = len(days)
+        avg_temp = np.empty(n, dtype=np.float64)
+        precipitation = np.empty(n, dtype=np.float64)
+        wind_speed = np.empty(n, dtype=np.float64)
+        condition_code = np.zeros(n, dtype=np.int64)
+        numeric_ok = np.ones(n, dtype=bool)
+        condition_ok = np.ones(n, dtype=bool)
+
+        for i, day in enumerate(days):
+            if not isinstance(day, dict):
+                numeric_ok[i] = condition_ok[i] = False
+                avg_temp[i] = precipitation[i] = wind_speed[i] = 0.0
+                continue
+            condition = day.get("condition", "")
+            if isinstance(condition, str):
+                condition_code[i] = self._condition_code(condition.lower())
+            else:
+                condition_ok[i] = False
+            t, p, w = day.get("avg_temp", 22), day.get("precipitation", 0), day.get("wind_speed", 0)
+            if isinstance(t, Real) and isinstance(p, Real) and isinstance(w, Real):
+                avg_temp[i], precipitation[i], wind_speed[i] = t, p, w
+            else:
+                # the reference scorer raises on these comparisons and falls back to 5
+                numeric_ok[i] = False
+                avg_temp[i] = precipitation[i] = wind_speed[i] = 0.0
+
+        return PackedForecast(avg_temp, precipitation, wind_speed, condition_code, numeric_ok, condition_ok)
+
+    def category_scores(self, packed: PackedForecast) -> np.ndarray:
+        """(n_days, 4) int matrix of scores indexed by OUTDOOR/INDOOR/BEACH/NEUTRAL"""
+        n = len(packed)
+        t, p, w = packed.avg_temp, packed.precipitation, packed.wind_speed
+        deltas = self._deltas[packed.condition_code] if n and len(self._deltas) else np.zeros((n, 3), dtype=np.int64)
+
+        # elif-chains become mutually exclusive masks: each band excludes the ones above it
+        t_best = (20 <= t) & (t <= 28)
+        t_ok = ~t_best & (((15 <= t) & (t < 20)) | ((28 < t) & (t <= 35)))
+        t_bad = ~t_best & ~t_ok & ((t < 10) | (t > 40))
+        outdoor = 5 + deltas[:, 0] + 2 * t_best + t_ok - 3 * t_bad
+        outdoor -= 3 * (p > 10) + ((p > 5) & (p <= 10))
+        outdoor -= 2 * (w > 30) + ((w > 20) & (w <= 30))
+
+        indoor = 7 + deltas[:, 1]
+
+        b_best = (25 <= t) & (t <= 32)
+        b_ok = ~b_best & (22 <= t) & (t < 25)
+        b_bad = ~b_best & ~b_ok & ((t < 20) | (t > 35))
+        beach = 5 + deltas[:, 2] + 3 * b_best + b_ok - 2 * b_bad
+        beach -= 4 * (p > 2)
+        beach += ((10 <= w) & (w <= 25)) - 2 * (w > 35)
+
+        scores = np.empty((n, 4), dtype=np.int64)
+        scores[:, OUTDOOR] = outdoor
+        scores[:, INDOOR] = indoor
+        scores[:, BEACH] = beach
+        scores[:, NEUTRAL] = 5
+        np.clip(scores, 1, 10, out=scores)
+
+        # rows the reference implementation would have rejected with an exception
+        scores[~packed.numeric_ok, OUTDOOR] = 5
+        scores[~packed.numeric_ok, BEACH] = 5
+        scores[~packed.condition_ok] = 5
+        return scores
+
+    def score_matrix(self, days: Sequence[Dict], activity_types: Sequence[str]) -> np.ndarray:
+        """(n_days, n_activity_types) matrix of 1-10 suitability scores"""
+        categories = np.array([activity_category(a) for a in activity_types], dtype=np.int64)
+        return self.category_scores(self.pack(days))[:, categories]
+
+    def score_pairs(self, days: Sequence[Dict], activity_types: Sequence[str]) -> List[int]:
+        """Score days[i] against activity_types[i] for each i"""
+        if not days:
+            return []
+        categories = np.array([activity_category(a) for a in activity_types], dtype=np.int64)
+        scores = self.category_scores(self.pack(days))
+        return scores[np.arange(len(days)), categories].tolist()
+
+
+class ForecastSlots:
+    """Compact, array-backed 3-hour forecast slots with precomputed scores.
+
+    Built once per forecast fetch: every slot is scored against every activity
+    category up front, so time-of-day questions are answered by slicing arrays.
+    """
+
+    SLOT_HOURS = 3
+
+    def __init__(self, local_times: np.ndarray, temp: np.ndarray, precipitation: np.ndarray,
+                 wind_speed: np.ndarray, conditions: List[str], scores: np.ndarray):
+        self.local_times = local_times      # datetime64[s], destination local time
+        self.temp = temp
+        self.precipitation = precipitation
+        self.wind_speed = wind_speed
+        self.conditions = conditions
+        self.scores = scores                # (n_slots, 4) int8, OUTDOOR/INDOOR/BEACH/NEUTRAL
+        self.local_dates = local_times.astype("datetime64[D]")
+        self.local_hours = (local_times - self.local_dates).astype("timedelta64[h]").astype(np.int64)
+
+    @classmethod
+    def from_payload(cls, data: Dict, engine: WeatherScoringEngine) -> "ForecastSlots":
+        """Build from a raw OpenWeatherMap /forecast payload"""
+        items = data.get("list", [])
+        utc_offset = int(data.get("city", {}).get("timezone", 0))
+        slots = [{
+            "condition": item["weather"][0]["description"],
+            "avg_temp": item["main"]["temp"],
+            "precipitation": item.get("rain", {}).get("3h", 0),
+            "wind_speed": item["wind"]["speed"],
+        } for item in items]
+        packed = engine.pack(slots)
+        local_times = np.array([item["dt"] + utc_offset for item in items], dtype="datetime64[s]")
+        return cls(
+            local_times=local_times,
+            temp=packed.avg_temp.astype(np.float32),
+            precipitation=packed.precipitation.astype(np.float32),
+            wind_speed=packed.wind_speed.astype(np.float32),
+            conditions=[slot["condition"] for slot in slots],
+            scores=engine.category_scores(packed).astype(np.int8),
+        )
+
+    def __len__(self) -> int:
+        return len(self.local_times)
+
+    def dates(self) -> List[str]:
+        return sorted({str(d) for d in self.local_dates})
+
+    def _slot_info(self, i: int, score) -> Dict:
+        start = self.local_times[i].astype(object)
+        return {
+            "time": start.strftime("%H:%M"),
+            "score": round(float(score), 1),
+            "condition": self.conditions[i],
+            "temp_c": round(float(self.temp[i]), 1),
+            "precipitation": round(float(self.precipitation[i]), 1),
+        }
+
+    def best_window(self, date: str, activity_type: str, duration_hours: int = 3,
+                    day_start: int = 6, day_end: int = 21) -> Optional[Dict]:
+        """Best contiguous daytime window on a local date for an activity type"""
+        mask = (self.local_dates == np.datetime64(date)) & (self.local_hours >= day_start) & (self.local_hours < day_end)
+        idx = np.flatnonzero(mask)
+        if not len(idx):
+            return None
+        slot_scores = self.scores[idx, activity_category(activity_type)].astype(np.float64)
+        width = min(len(idx), max(1, -(-duration_hours // self.SLOT_HOURS)))
+        window_means = np.convolve(slot_scores, np.ones(width) / width, mode="valid")
+        best = int(np.argmax(window_means))  # earliest window wins ties
+        first, last = idx[best], idx[best + width - 1]
+        end = (self.local_times[last] + np.timedelta64(self.SLOT_HOURS, "h")).astype(object)
+        return {
+            "start": self.local_times[first].astype(object).strftime("%H:%M"),
+            "end": end.strftime("%H:%M"),
+            "score": round(float(window_means[best]), 1),
+            "conditions": sorted(set(self.conditions[i] for i in idx[best:best + width])),
+            "avg_temp_c": round(float(self.temp[idx[best:best + width]].mean()), 1),
+            "slots": [self._slot_info(i, s) for i, s in zip(idx, slot_scores)],
+        }
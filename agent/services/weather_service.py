@@ -1,71 +1,259 @@
 import os
+import logging
 import aiohttp
 import asyncio
 from dotenv import load_dotenv
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
 from collections import defaultdict
+from urllib.parse import urlsplit
+from utils.http_helper import PooledSession
+from utils.cache_helper import TTLCache
+from utils.async_helper import SingleFlight
+from utils.lazy_helper import Lazy
+from utils.resilience_helper import (
+    CircuitBreaker, RetryBudget, full_jitter_backoff, is_retryable_status, retry_after_seconds
+)
+from utils.weather_helper import normalize_destination
+from services.weather_scoring import WeatherScoringEngine, ForecastSlots
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 class WeatherService:
     def __init__(self):
-        print("[Init] Initializing WeatherService...")
         self.api_key = os.getenv("WEATHER_API_KEY")
         if not self.api_key:
             raise ValueError("WEATHER_API_KEY not found in environment variables")
         self.base_url_current = "https://api.openweathermap.org/data/2.5/weather"
         self.base_url_forecast = "https://api.openweathermap.org/data/2.5/forecast"
-        print("[Init] WeatherService initialized successfully.")
+        # One keep-alive pool shared by every current/forecast/summary call
+        self.http = PooledSession(
+            limit=int(os.getenv("WEATHER_HTTP_POOL_LIMIT", 100)),
+            limit_per_host=int(os.getenv("WEATHER_HTTP_POOL_PER_HOST", 20)),
+            dns_cache_ttl=int(os.getenv("WEATHER_HTTP_DNS_TTL", 300)),
+            keepalive_timeout=float(os.getenv("WEATHER_HTTP_KEEPALIVE", 30)),
+        )
+        # Current conditions go stale faster than the 3-hour forecast
+        self.cache = TTLCache(max_size=int(os.getenv("WEATHER_CACHE_SIZE", 256)), keep_stale=True)
+        self.cache_ttl = {
+            "current": int(os.getenv("WEATHER_CACHE_TTL_CURRENT", 600)),
+            "forecast": int(os.getenv("WEATHER_CACHE_TTL_FORECAST", 1800)),
+        }
+        # Concurrent misses for the same (endpoint, destination) share one request
+        self.singleflight = SingleFlight()
+        # How long get_weather_report waits on /weather before using the forecast
+        self.report_current_timeout = float(os.getenv("WEATHER_REPORT_CURRENT_TIMEOUT", 3))
+        self.compare_concurrency = int(os.getenv("WEATHER_COMPARE_CONCURRENCY", 4))
+        self.scoring = WeatherScoringEngine()
+        # Per-host circuit breakers and one process-wide retry budget
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.retry_budget = RetryBudget(
+            ratio=float(os.getenv("WEATHER_RETRY_BUDGET_RATIO", 0.2)),
+            min_per_second=float(os.getenv("WEATHER_RETRY_MIN_PER_SEC", 1)),
+        )
+        self.retry_backoff_base = float(os.getenv("WEATHER_RETRY_BACKOFF_BASE", 0.5))
+        self.retry_backoff_cap = float(os.getenv("WEATHER_RETRY_BACKOFF_CAP", 4))
+        # Per-slot scores, precomputed once per forecast fetch and keyed like the cache
+        self.slot_cache = TTLCache(max_size=self.cache.max_size)
+        logger.info("WeatherService initialized (cache_size=%d, pool_limit=%d)",
+                    self.cache.max_size, self.http.limit)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters of the destination cache"""
+        return self.cache.stats()
+
+    def fetch_stats(self) -> Dict[str, Any]:
+        """Cache, single-flight, circuit breaker and retry budget counters"""
+        return {
+            "cache": self.cache.stats(),
+            "singleflight": self.singleflight.stats(),
+            "circuit_breakers": {host: b.stats() for host, b in self.breakers.items()},
+            "retry_budget": self.retry_budget.stats(),
+        }
+
+    async def close(self) -> None:
+        """Close the shared HTTP session (call on shutdown)"""
+        await self.http.close()
+
+    def _breaker_for(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = self.breakers[host] = CircuitBreaker(
+                host,
+                failure_threshold=int(os.getenv("WEATHER_CIRCUIT_FAILURES", 5)),
+                reset_timeout=float(os.getenv("WEATHER_CIRCUIT_RESET", 30)),
+            )
+        return breaker
 
     async def _fetch_json(self, url: str, retries: int = 3, timeout: int = 10) -> Dict:
-        """Internal method to fetch JSON with retries, timeout, and debug prints"""
+        """Internal method to fetch JSON with status-aware retries behind a per-host circuit breaker.
+
+        4xx responses (unknown city, bad key) fail immediately; timeouts,
+        connection errors, 429 and 5xx are retried with full-jitter backoff
+        while the global retry budget allows it.
+        """
+        endpoint = url.split("?", 1)[0]  # never log the appid query parameter
+        breaker = self._breaker_for(url)
         for attempt in range(1, retries + 1):
+            breaker.before_call()
+            retry_delay = None
             try:
-                print(f"[Attempt {attempt}] Fetching {url} ...")
-                async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
-                    async with session.get(url) as response:
-                        response.raise_for_status()
-                        data = await response.json()
-                        print(f"[Success] Fetched data from {url}")
-                        return data
+                logger.debug("Fetching %s (attempt %d)", endpoint, attempt)
+                session = await self.http.get()
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    response.raise_for_status()
+                    data = await response.json()
+                    breaker.record_success()
+                    self.retry_budget.record_success()
+                    logger.debug("Fetched %s (attempt %d)", endpoint, attempt)
+                    return data
             except asyncio.TimeoutError:
-                print(f"[Attempt {attempt}] Timeout fetching {url}")
+                breaker.record_failure()
+                logger.warning("Timeout fetching %s (attempt %d)", endpoint, attempt)
             except aiohttp.ClientResponseError as e:
-                print(f"[Attempt {attempt}] HTTP error fetching {url}: {e.status}, message='{e.message}'")
+                if not is_retryable_status(e.status):
+                    breaker.record_success()  # the host answered; the request was bad
+                    logger.warning("HTTP %s fetching %s: %s (not retrying)", e.status, endpoint, e.message)
+                    raise Exception(f"{endpoint} returned HTTP {e.status}: {e.message}") from None
+                breaker.record_failure()
+                retry_delay = retry_after_seconds(e.headers, cap=self.retry_backoff_cap)
+                logger.warning("HTTP %s fetching %s (attempt %d): %s", e.status, endpoint, attempt, e.message)
             except aiohttp.ClientError as e:
-                print(f"[Attempt {attempt}] Client error fetching {url}: {str(e)}")
-            except Exception as e:
-                print(f"[Attempt {attempt}] Unexpected error fetching {url}: {str(e)}")
-            if attempt < retries:
-                await asyncio.sleep(2 * attempt)  # exponential backoff
-        raise Exception(f"Failed to fetch {url} after {retries} attempts")
+                breaker.record_failure()
+                logger.warning("Client error fetching %s (attempt %d): %s", endpoint, attempt, e)
+            except Exception:
+                breaker.record_failure()
+                logger.exception("Unexpected error fetching %s (attempt %d)", endpoint, attempt)
+            if attempt == retries or not self.retry_budget.try_acquire():
+                break
+            if retry_delay is None:
+                retry_delay = full_jitter_backoff(attempt, base=self.retry_backoff_base, cap=self.retry_backoff_cap)
+            await asyncio.sleep(retry_delay)
+        raise Exception(f"Failed to fetch {endpoint} after {attempt} attempts")
+
+    async def _fetch_endpoint(self, endpoint: str, destination: str) -> Dict:
+        """Fetch 'current' or 'forecast' JSON for a destination through the TTL cache.
+
+        If the upstream fails (or its circuit is open) an expired cache entry
+        is served instead, when one is still held.
+        """
+        key = (endpoint, normalize_destination(destination))
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+        try:
+            return await self.singleflight.do(key, lambda: self._fetch_and_cache(key))
+        except Exception as e:
+            stale = self.cache.get_stale(key)
+            if stale is None:
+                raise
+            logger.warning("Serving stale %s data for %s: %s", endpoint, key[1], e)
+            return stale
+
+    async def _fetch_and_cache(self, key: tuple) -> Dict:
+        endpoint, destination = key
+        base_url = self.base_url_current if endpoint == "current" else self.base_url_forecast
+        data = await self._fetch_json(f"{base_url}?q={destination}&appid={self.api_key}&units=metric")
+        self.cache.set(key, data, self.cache_ttl[endpoint])
+        if endpoint == "forecast":
+            self._build_slots(destination, data)
+        return data
+
+    def _build_slots(self, destination: str, data: Dict) -> ForecastSlots:
+        slots = ForecastSlots.from_payload(data, self.scoring)
+        self.slot_cache.set(destination, (data, slots), self.cache_ttl["forecast"])
+        return slots
+
+    async def get_forecast_slots(self, destination: str) -> ForecastSlots:
+        """Scored 3-hour slots for a destination (rebuilt only when the payload changes)"""
+        data = await self._fetch_endpoint("forecast", destination)
+        cached = self.slot_cache.get(normalize_destination(destination))
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        return self._build_slots(normalize_destination(destination), data)
 
     async def get_current_weather(self, destination: str) -> dict:
-        """Get current weather for a destination with debug prints"""
-        print(f"[Start] get_current_weather for {destination}")
+        """Get current weather for a destination"""
         try:
-            url = f"{self.base_url_current}?q={destination}&appid={self.api_key}&units=metric"
-            data = await self._fetch_json(url)
-            result = {
-                "current": {
-                    "condition": data["weather"][0]["description"],
-                    "temp_c": data["main"]["temp"],
-                    "feelslike_c": data["main"]["feels_like"]
-                }
-            }
-            print(f"[Success] Current weather for {destination}: {result}")
+            data = await self._fetch_endpoint("current", destination)
+            result = {"current": self._parse_current(data)}
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Current weather for %s: %s", destination, result)
             return result
         except Exception as e:
-            print(f"[Error] Failed to fetch current weather for {destination}: {str(e)}")
+            logger.error("Failed to fetch current weather for %s: %s", destination, e)
             return {"current": {}, "error": str(e)}
 
+    async def get_weather_report(self, destination: str, duration_days: int = 7,
+                                 current_timeout: float = None) -> Dict[str, Any]:
+        """Current conditions and daily summary fetched concurrently in one round-trip.
+
+        If the current-weather call fails or takes longer than current_timeout,
+        "current" is derived from the first 3-hour forecast slot instead.
+        """
+        if current_timeout is None:
+            current_timeout = self.report_current_timeout
+        current_result, summary = await asyncio.gather(
+            asyncio.wait_for(self._fetch_endpoint("current", destination), timeout=current_timeout),
+            self.get_weather_summary_for_dates(destination, start_date="", duration_days=duration_days),
+            return_exceptions=True
+        )
+        if isinstance(summary, Exception):
+            raise summary
+
+        current, current_source = {}, "unavailable"
+        if not isinstance(current_result, Exception):
+            current, current_source = self._parse_current(current_result), "observed"
+        elif not summary.get("error"):
+            logger.info("Current weather unavailable for %s (%r), using forecast", destination, current_result)
+            forecast_data = await self._fetch_endpoint("forecast", destination)
+            if forecast_data.get("list"):
+                current, current_source = self._parse_current(forecast_data["list"][0]), "forecast"
+
+        return {
+            "destination": destination,
+            "current": current,
+            "current_source": current_source,
+            "daily_weather": summary["daily_weather"][:duration_days],
+            "overall_weather_score": summary["overall_weather_score"],
+            "weather_alerts": summary["weather_alerts"],
+        }
+
+    @staticmethod
+    def _parse_current(item: Dict) -> Dict[str, Any]:
+        """Current-conditions shape from a /weather payload or a forecast slot"""
+        return {
+            "condition": item["weather"][0]["description"],
+            "temp_c": item["main"]["temp"],
+            "feelslike_c": item["main"]["feels_like"]
+        }
+
+    async def get_best_time_window(self, destination: str, date: str, activity_type: str,
+                                   duration_hours: int = 3) -> Dict[str, Any]:
+        """Best time-of-day window for an activity on a given (local) date"""
+        try:
+            slots = await self.get_forecast_slots(destination)
+            dates = slots.dates()
+            if not date:
+                date = dates[0] if dates else ""
+            window = slots.best_window(date, activity_type, duration_hours) if date in dates else None
+            if window is None:
+                return {"destination": destination, "date": date, "activity_type": activity_type,
+                        "error": f"No daytime forecast slots for {date}", "available_dates": dates}
+            return {"destination": destination, "date": date, "activity_type": activity_type,
+                    "best_window": {k: v for k, v in window.items() if k != "slots"},
+                    "slots": window["slots"]}
+        except Exception as e:
+            logger.error("Failed to find best time window for %s: %s", destination, e)
+            return {"destination": destination, "date": date, "activity_type": activity_type, "error": str(e)}
+
     async def get_forecast(self, destination: str, duration_days: int = 5) -> dict:
         """Get daily forecast summary from OpenWeatherMap 3-hour interval data"""
-        print(f"[Start] get_forecast for {destination}, duration_days={duration_days}")
         try:
-            url = f"{self.base_url_forecast}?q={destination}&appid={self.api_key}&units=metric"
-            data = await self._fetch_json(url)
+            data = await self._fetch_endpoint("forecast", destination)
 
             daily_data = defaultdict(list)
             for item in data.get("list", []):
@@ -96,16 +284,19 @@ class WeatherService:
                     "humidity": humidity,
                     "uv_index": uv_index
                 })
-            print(f"[Success] Processed forecast for {destination}, days={len(forecast_days)}")
+            logger.debug("Processed forecast for %s, days=%d", destination, len(forecast_days))
             return {"forecastday": forecast_days}
         except Exception as e:
-            print(f"[Error] Failed to fetch forecast for {destination}: {str(e)}")
+            logger.error("Failed to fetch forecast for %s: %s", destination, e)
             return {"forecastday": [], "error": str(e)}
 
     def get_weather_suitability_score(self, weather_data: Dict, activity_type: str) -> int:
-        """Score weather suitability for activities (1-10)"""
+        """Score weather suitability for activities (1-10).
+
+        Single-day reference implementation; batch callers use self.scoring,
+        which produces identical results for many days/activities at once.
+        """
         try:
-            print(f"[Start] get_weather_suitability_score for {activity_type}, data={weather_data}")
             day_data = weather_data
             condition = day_data.get("condition", "").lower()
             max_temp = day_data.get("max_temp", 25)
@@ -164,26 +355,23 @@ class WeatherService:
                 elif wind_speed > 35:
                     score -= 2
 
-            final_score = max(1, min(10, score))
-            print(f"[Success] Suitability score for {activity_type}: {final_score}")
-            return final_score
+            return max(1, min(10, score))
         except Exception as e:
-            print(f"[Error] get_weather_suitability_score failed: {str(e)}")
+            logger.debug("get_weather_suitability_score fell back to 5 for %r: %s", activity_type, e)
             return 5
 
     async def get_weather_summary_for_dates(self, destination: str, start_date: str, duration_days: int) -> Dict[str, Any]:
         """Generate daily summary with scores and recommendations"""
-        print(f"[Start] get_weather_summary_for_dates for {destination}, start_date={start_date}, duration_days={duration_days}")
         try:
             forecast_data = await self.get_forecast(destination, duration_days)
+            if forecast_data.get("error") and not forecast_data.get("forecastday"):
+                raise Exception(forecast_data["error"])
             daily_weather = []
             overall_score = 0
 
-            for day in forecast_data.get("forecastday", []):
-                outdoor_score = self.get_weather_suitability_score(day, "outdoor")
-                indoor_score = self.get_weather_suitability_score(day, "indoor")
-                beach_score = self.get_weather_suitability_score(day, "beach")
-
+            days = forecast_data.get("forecastday", [])
+            scores = self.scoring.score_matrix(days, ["outdoor", "indoor", "beach"]).tolist()
+            for day, (outdoor_score, indoor_score, beach_score) in zip(days, scores):
                 day["suitability_scores"] = {
                     "outdoor": outdoor_score,
                     "indoor": indoor_score,
@@ -201,21 +389,67 @@ class WeatherService:
                 "best_days_for_outdoor": sorted(daily_weather, key=lambda x: x["suitability_scores"]["outdoor"], reverse=True)[:3],
                 "weather_alerts": self._generate_weather_alerts(daily_weather)
             }
-            print(f"[Success] Weather summary generated for {destination}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Weather summary for %s: %s", destination, result)
             return result
 
         except Exception as e:
-            print(f"[Error] Failed to generate weather summary for {destination}: {str(e)}")
+            logger.error("Failed to generate weather summary for %s: %s", destination, e)
             return {
                 "error": f"Weather data unavailable: {str(e)}",
+                "degraded": True,
                 "destination": destination,
                 "overall_weather_score": 6,
                 "daily_weather": [],
                 "weather_alerts": []
             }
 
+    async def compare_destinations(self, destinations: List[str], start_date: str, duration_days: int,
+                                   activity_type: str = "outdoor", max_concurrency: int = None) -> Dict[str, Any]:
+        """Fetch several destinations concurrently and rank them by weather suitability"""
+        unique = list({normalize_destination(d): d for d in destinations if d and d.strip()}.values())
+        semaphore = asyncio.Semaphore(max_concurrency or self.compare_concurrency)
+
+        async def _score(destination: str) -> Dict[str, Any]:
+            async with semaphore:
+                summary = await self.get_weather_summary_for_dates(destination, start_date, duration_days)
+            if summary.get("error") or not summary.get("daily_weather"):
+                return {"destination": destination, "error": summary.get("error", "No forecast data")}
+            days = summary["daily_weather"]
+            day_scores = list(zip((day["date"] for day in days),
+                                  self.scoring.score_matrix(days, [activity_type])[:, 0].tolist()))
+            best_date, best_score = max(day_scores, key=lambda x: x[1])
+            return {
+                "destination": destination,
+                "score": round(sum(score for _, score in day_scores) / len(day_scores), 1),
+                "overall_weather_score": summary["overall_weather_score"],
+                "best_day": {"date": best_date, "score": best_score},
+                "alerts": len(summary["weather_alerts"])
+            }
+
+        results = await asyncio.gather(*(_score(d) for d in unique), return_exceptions=True)
+        ranking, failed = [], []
+        for destination, result in zip(unique, results):
+            if isinstance(result, Exception):
+                failed.append({"destination": destination, "error": str(result)})
+            elif "error" in result:
+                failed.append(result)
+            else:
+                ranking.append(result)
+
+        ranking.sort(key=lambda r: (r["score"], r["overall_weather_score"], -r["alerts"]), reverse=True)
+        for rank, entry in enumerate(ranking, start=1):
+            entry["rank"] = rank
+        logger.info("Compared %d destinations for %s, %d failed", len(ranking), activity_type, len(failed))
+        return {
+            "activity_type": activity_type,
+            "duration_days": duration_days,
+            "best_destination": ranking[0]["destination"] if ranking else None,
+            "ranking": ranking,
+            "failed": failed
+        }
+
     def _get_day_recommendations(self, day_data: Dict, outdoor_score: int) -> List[str]:
-        print(f"[Info] Generating recommendations for {day_data.get('date', 'unknown')}...")
         recommendations = []
         condition = day_data.get("condition", "").lower()
         avg_temp = day_data.get("avg_temp", 22)
@@ -241,14 +475,12 @@ class WeatherService:
             elif avg_temp < 10:
                 recommendations.append("Cold weather - dress warmly and consider heated venues")
 
-            print(f"[Success] Recommendations generated: {recommendations}")
         except Exception as e:
-            print(f"[Error] Failed generating recommendations: {str(e)}")
+            logger.error("Failed generating recommendations: %s", e)
 
         return recommendations
 
     def _generate_weather_alerts(self, daily_weather: List[Dict]) -> List[Dict]:
-        print("[Info] Generating weather alerts...")
         alerts = []
         try:
             for day in daily_weather:
@@ -270,11 +502,21 @@ class WeatherService:
                         "type": "high_wind",
                         "message": f"High winds expected ({day['wind_speed']} km/h) - outdoor activities may be affected"
                     })
-            print(f"[Success] Generated {len(alerts)} weather alerts")
         except Exception as e:
-            print(f"[Error] Failed to generate alerts: {str(e)}")
+            logger.error("Failed to generate alerts: %s", e)
 
         return alerts
 
-# Singleton instance for use in other modules
-weather_service = WeatherService()
+# Shared instance, built on first use so importing this module needs no API key
+_weather_service = Lazy(WeatherService, "weather_service")
+
+
+def get_weather_service() -> WeatherService:
+    return _weather_service.get()
+
+
+def __getattr__(name: str):
+    # `from services.weather_service import weather_service` keeps working (and builds it)
+    if name == "weather_service":
+        return get_weather_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
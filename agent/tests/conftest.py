@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+import sys
+
+# modules import each other as top-level packages (utils, services), as when run from agent/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
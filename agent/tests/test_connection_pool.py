@@ -0,0 +1,53 @@
+# tests/test_connection_pool.py
+"""ConnectionPool prefill: min_size connections opened ahead of the first checkout."""
+import pytest
+
+from services.connection_pool import ConnectionPool
+
+
+class FakeConnection:
+    closed = 0
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def connects():
+    opened = []
+
+    def connect():
+        opened.append(FakeConnection())
+        return opened[-1]
+
+    return opened, connect
+
+
+def test_prefill_opens_min_size_and_checkouts_reuse_them(connects):
+    opened, connect = connects
+    pool = ConnectionPool(connect, min_size=3, max_size=5, reap_interval=0)
+    assert pool.prefill() == 3
+    assert pool.prefill() == 0
+    assert pool.stats()["idle"] == 3
+
+    conns = [pool.getconn() for _ in range(3)]
+    assert len(opened) == 3 and set(map(id, conns)) == set(map(id, opened))
+    for conn in conns:
+        pool.putconn(conn, discard=True)
+    pool.close()
+
+
+def test_prefill_stops_at_the_first_failure(connects):
+    opened, connect = connects
+
+    def flaky():
+        if len(opened) == 1:
+            raise OSError("connection refused")
+        return connect()
+
+    pool = ConnectionPool(flaky, min_size=3, max_size=5, reap_interval=0)
+    assert pool.prefill() == 1
+    stats = pool.stats()
+    assert stats["size"] == stats["idle"] == 1
+    pool.close()
+    assert opened[0].closed
@@ -0,0 +1,59 @@
+# tests/test_places_tiling.py
+"""Tiled nearby sweep over viewports larger than max_tiles circles."""
+import asyncio
+
+from services.places_discovery import ACTIVITY_CATEGORIES, NEARBY_RESULT_CAP, PlacesDiscoveryEngine
+from utils.geo_helper import cover_viewport, viewport_center
+
+# about Rajasthan: 142 tiles even at the largest search radius
+STATE_VIEWPORT = {"low": {"latitude": 23.0, "longitude": 69.5}, "high": {"latitude": 30.2, "longitude": 78.3}}
+
+
+def sweep(viewport, full=lambda circle: False, **engine_options):
+    """Circles the engine's nearby searches asked for; `full(circle)` tiles come back with a capped result"""
+    circles = []
+
+    async def post(method, field_mask, body, timeout):
+        if method != "searchNearby":
+            return {"places": []}
+        circle = body["locationRestriction"]["circle"]
+        circles.append(circle)
+        if not full(circle):
+            return {"places": []}
+        return {"places": [{"id": f"{len(circles)}-{i}", "types": ["park"]} for i in range(NEARBY_RESULT_CAP)]}
+
+    engine = PlacesDiscoveryEngine(post, budget=5.0, **engine_options)
+    stats = asyncio.run(engine.discover_area(viewport, ACTIVITY_CATEGORIES))["stats"]
+    return circles, stats
+
+
+def quadrants(circles, viewport):
+    center = viewport_center(viewport)
+    return {(c["center"]["latitude"] >= center["lat"], c["center"]["longitude"] >= center["lng"]) for c in circles}
+
+
+def test_cover_viewport_spreads_tiles_over_the_cap():
+    tiles = cover_viewport(STATE_VIEWPORT, 5000, 24)
+    assert len(tiles) == 24
+    circles = [t.circle()["circle"] for t in tiles]
+    assert len(quadrants(circles, STATE_VIEWPORT)) == 4
+    # every prefix is spread as well: the first few already reach all four quadrants
+    assert len(quadrants(circles[:5], STATE_VIEWPORT)) == 4
+
+
+def test_sweep_over_the_cap_searches_every_quadrant():
+    circles, stats = sweep(STATE_VIEWPORT, max_tiles=24, max_tile_requests=48)
+    assert len(circles) == stats["tiles"]["searched"] == 48
+    assert len(quadrants(circles, STATE_VIEWPORT)) == 4
+    latitudes = [c["center"]["latitude"] for c in circles]
+    assert max(latitudes) > 29.0 and min(latitudes) < 24.0
+
+
+def test_split_children_go_before_spare_tiles():
+    # every tile saturates: each base tile's children must still be searched
+    circles, stats = sweep(STATE_VIEWPORT, full=lambda circle: True, max_tiles=4, max_tile_requests=18,
+                           tile_concurrency=1)
+    assert len(circles) == 18
+    assert [c["radius"] for c in circles[:4]] == [50000.0] * 4
+    assert all(c["radius"] == 25000.0 for c in circles[4:])
+    assert stats["tiles"]["split"] == 4
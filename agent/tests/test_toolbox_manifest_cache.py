@@ -0,0 +1,50 @@
+# tests/test_toolbox_manifest_cache.py
+"""Toolbox tools built by toolbox_core from the cached manifest, against the local stub toolbox server."""
+import asyncio
+
+import pytest
+
+from benchmarks.stub_toolbox_server import StubToolboxServer
+from services import toolbox_service
+from services.toolbox_service import LazyToolboxToolset, ManifestCache, ToolboxService
+from utils.async_helper import service_loop
+
+
+@pytest.fixture
+def stub_toolbox():
+    server = StubToolboxServer()
+    url = service_loop.run_sync(server.start())
+    yield server, url
+    service_loop.run_sync(server.stop())
+
+
+def load_toolset(monkeypatch, url, cache_dir):
+    service = ToolboxService(url, ManifestCache(str(cache_dir)))
+    monkeypatch.setattr(toolbox_service, "get_toolbox_service", lambda: service)
+    return LazyToolboxToolset("travel_genius_toolset", check_interval=0).load(), service
+
+
+def test_warm_cache_builds_tools_without_download(monkeypatch, tmp_path, stub_toolbox):
+    server, url = stub_toolbox
+    cold, _ = load_toolset(monkeypatch, url, tmp_path)
+    assert server.hits["toolset"] == 1
+
+    warm, service = load_toolset(monkeypatch, url, tmp_path)
+    assert server.hits["toolset"] == 1
+    assert service.cache_hits == 1 and service.downloads == 0
+    assert [tool.name for tool in warm] == [tool.name for tool in cold]
+
+
+def test_tools_keep_manifest_schema_and_invoke(monkeypatch, tmp_path, stub_toolbox):
+    server, url = stub_toolbox
+    tools, _ = load_toolset(monkeypatch, url, tmp_path)
+    tool = next(tool for tool in tools if tool.name == "get-hidden-gems")
+
+    declaration = tool._get_declaration()
+    assert "travel database" in declaration.description
+    assert set(declaration.parameters.properties) == {"destination", "limit"}
+    assert declaration.parameters.required == ["destination"]
+
+    result = asyncio.run(tool.func(destination="Goa"))
+    assert result == "[]"
+    assert server.hits["invoke"] == 1
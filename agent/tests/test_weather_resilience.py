@@ -0,0 +1,178 @@
+# tests/test_weather_resilience.py
+"""WeatherService retries, circuit breaker and retry budget against the local stub weather server."""
+import asyncio
+import time
+
+import pytest
+
+from benchmarks.stub_weather_server import StubWeatherServer
+from services import weather_service
+from services.weather_service import WeatherService
+from utils.resilience_helper import CircuitBreaker, CircuitOpenError, RetryBudget, full_jitter_backoff
+
+
+@pytest.fixture(autouse=True)
+def weather_env(monkeypatch):
+    monkeypatch.setenv("WEATHER_API_KEY", "test-key")
+    monkeypatch.setenv("WEATHER_CIRCUIT_FAILURES", "100")
+    monkeypatch.setenv("WEATHER_CIRCUIT_RESET", "0.2")
+
+
+@pytest.fixture
+def jitter_delays(monkeypatch):
+    """Backoff delays drawn by _fetch_json, with the attempt they were drawn for"""
+    delays = []
+
+    def recording_backoff(attempt, base, cap):
+        delay = full_jitter_backoff(attempt, base=base, cap=cap)
+        delays.append((attempt, base, cap, delay))
+        return delay
+
+    monkeypatch.setattr(weather_service, "full_jitter_backoff", recording_backoff)
+    return delays
+
+
+def run(scenario, **server_options):
+    """scenario(service, server, forecast_url) against a fresh stub server and WeatherService"""
+    async def main():
+        server = StubWeatherServer(**server_options)
+        base_url = await server.start()
+        service = WeatherService()
+        service.base_url_current = f"{base_url}/weather"
+        service.base_url_forecast = f"{base_url}/forecast"
+        service.retry_backoff_base = 0.01
+        service.retry_backoff_cap = 1.0
+        try:
+            return await scenario(service, server, f"{base_url}/forecast?q=goa")
+        finally:
+            await service.close()
+            await server.stop()
+    return asyncio.run(main())
+
+
+def test_4xx_fails_without_retry(jitter_delays):
+    async def scenario(service, server, url):
+        with pytest.raises(Exception, match="HTTP 404"):
+            await service._fetch_json(url)
+        assert server.hits == 1
+        assert service.retry_budget.retries == 0
+        assert service._breaker_for(url).state == CircuitBreaker.CLOSED
+
+    run(scenario, status=404)
+    assert jitter_delays == []
+
+
+def test_5xx_and_429_are_retried_with_jittered_backoff(jitter_delays):
+    async def scenario(service, server, url):
+        server.script = [503, 429, 500]
+        data = await service._fetch_json(url, retries=4)
+        assert data["list"]
+        assert server.hits == 4
+
+    run(scenario)
+    assert [attempt for attempt, *_ in jitter_delays] == [1, 2, 3]
+    for attempt, base, cap, delay in jitter_delays:
+        assert 0 <= delay <= min(cap, base * 2 ** attempt)
+
+
+def test_full_jitter_backoff_spreads_over_the_whole_window():
+    delays = [full_jitter_backoff(3, base=0.5, cap=8.0) for _ in range(200)]
+    assert all(0 <= d <= 4.0 for d in delays)
+    assert min(delays) < 1.0 < 3.0 < max(delays)
+    assert all(0 <= full_jitter_backoff(10, base=0.5, cap=2.0) <= 2.0 for _ in range(50))
+
+
+def test_retry_after_is_honoured(jitter_delays):
+    async def scenario(service, server, url):
+        server.script = [429]
+        started = time.monotonic()
+        await service._fetch_json(url)
+        assert time.monotonic() - started >= 0.3
+        assert server.hits == 2
+
+    run(scenario, retry_after="0.3")
+    assert jitter_delays == []
+
+
+def test_breaker_opens_goes_half_open_and_closes(monkeypatch):
+    monkeypatch.setenv("WEATHER_CIRCUIT_FAILURES", "2")
+
+    async def scenario(service, server, url):
+        for _ in range(2):
+            with pytest.raises(Exception, match="after 1 attempts"):
+                await service._fetch_json(url, retries=1)
+        breaker = service._breaker_for(url)
+        assert breaker.state == CircuitBreaker.OPEN
+
+        # open: fails fast without reaching the host
+        with pytest.raises(CircuitOpenError):
+            await service._fetch_json(url)
+        assert server.hits == 2
+        assert breaker.rejected == 1
+
+        # half-open: one probe goes through; a failed probe reopens the circuit
+        await asyncio.sleep(0.25)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        with pytest.raises(Exception, match="after 1 attempts"):
+            await service._fetch_json(url, retries=1)
+        assert breaker.state == CircuitBreaker.OPEN
+        assert server.hits == 3
+
+        # a successful probe closes it
+        await asyncio.sleep(0.25)
+        server.status = 200
+        assert (await service._fetch_json(url))["list"]
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.times_opened == 2
+
+    run(scenario, status=503)
+
+
+def test_retry_budget_stops_retries_once_spent():
+    async def scenario(service, server, url):
+        service.retry_budget = RetryBudget(ratio=0.2, min_per_second=0.0, max_tokens=2.0)
+        with pytest.raises(Exception, match="after 3 attempts"):
+            await service._fetch_json(url, retries=3)
+        assert server.hits == 3
+
+        # budget spent: the next call makes its one attempt and gives up
+        with pytest.raises(Exception, match="after 1 attempts"):
+            await service._fetch_json(url, retries=3)
+        assert server.hits == 4
+        assert service.retry_budget.stats()["denied"] == 1
+
+    run(scenario, status=503)
+
+
+def test_open_circuit_serves_stale_cache_entry(monkeypatch):
+    monkeypatch.setenv("WEATHER_CIRCUIT_FAILURES", "1")
+
+    async def scenario(service, server, url):
+        service.cache_ttl["forecast"] = 0.05
+        fresh = await service._fetch_endpoint("forecast", "Goa")
+        await asyncio.sleep(0.1)
+
+        server.status = 503
+        assert await service._fetch_endpoint("forecast", "Goa") is fresh
+        assert service._breaker_for(url).state == CircuitBreaker.OPEN
+
+        hits = server.hits
+        assert await service._fetch_endpoint("forecast", "Goa") is fresh
+        assert server.hits == hits
+
+    run(scenario)
+
+
+def test_open_circuit_without_cache_returns_degraded_summary(monkeypatch):
+    monkeypatch.setenv("WEATHER_CIRCUIT_FAILURES", "1")
+
+    async def scenario(service, server, url):
+        await service.get_weather_summary_for_dates("Goa", "", 3)
+        hits = server.hits
+        summary = await service.get_weather_summary_for_dates("Kochi", "", 3)
+        assert summary["degraded"] is True
+        assert summary["daily_weather"] == []
+        assert "Circuit open" in summary["error"]
+        assert server.hits == hits
+
+    run(scenario, status=503)
@@ -1,11 +1,12 @@
 # tools/common_tools.py
 from google.adk.tools import FunctionTool
-from utils.routing_helper import determine_intent
+from utils.routing_helper import classify_intent
 
 def determine_routing_intent(query: str,
                              has_existing_itinerary: bool = False) -> dict:
     try:
-        return {"intent": determine_intent(query, has_existing_itinerary)}
+        decision = classify_intent(query, has_existing_itinerary)
+        return {"intent": decision["intent"], "confidence": decision["confidence"]}
     except Exception as e:
         return {"intent": "unknown", "error": str(e)}
 
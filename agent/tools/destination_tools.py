@@ -1,26 +1,50 @@
 # tools/destination_tools.py
 import asyncio
 from google.adk.tools import FunctionTool
-from services.dynamic_ingestion_service import ingestion_service
+from utils.async_helper import run_in_service_loop
+from services.destination_index import CONFIRMED_MATCHES
+from services.dynamic_ingestion_service import get_ingestion_service
 
-def discover_new_destination(destination: str) -> dict:
+async def discover_new_destination(destination: str) -> dict:
     try:
-        res = asyncio.get_event_loop().run_until_complete(
-            ingestion_service.discover_missing_destination(destination))
+        res = await run_in_service_loop(
+            get_ingestion_service().discover_missing_destination(destination))
         return res
     except Exception as e:
         return {"success": False, "error": str(e), "destination": destination}
 
-def check_destination_exists(destination: str,
-                             personality_type: str = "adventure") -> dict:
+def _loaded_destination_index(timeout: float):
+    # building the service and the first index load both block, so this runs in a worker thread
+    index = get_ingestion_service().db_integration.destination_index
+    return index if index.wait_ready(timeout=timeout) else None
+
+async def check_destination_exists(destination: str,
+                                   personality_type: str = "adventure") -> dict:
     try:
-        ok = ingestion_service.db_integration.test_connection()
-        return {
+        # only the very first calls wait, for the initial background load
+        index = await asyncio.to_thread(_loaded_destination_index, 2.0)
+        if index is None:
+            return {"destination": destination, "exists": False, "needs_discovery": False,
+                    "personality_match": personality_type,
+                    "error": "Destination index is not loaded yet"}
+        match = index.lookup(destination)
+        # a fuzzy hit may be a different place ("Raipur" -> Jaipur): suggest it, don't treat it as stored
+        exists = match is not None and match["match"] in CONFIRMED_MATCHES
+        result = {
             "destination": destination,
-            "exists": ok,
+            "exists": exists,
             "personality_match": personality_type,
-            "needs_discovery": not ok
+            "needs_discovery": not exists
         }
+        if exists:
+            result.update(destination_id=match["destination_id"], matched_name=match["name"],
+                          country=match["country"], match_type=match["match"])
+        elif match:
+            result["did_you_mean"] = {"name": match["name"], "country": match["country"],
+                                      "similarity": round(match["score"], 3)}
+        else:
+            result["suggestions"] = index.suggestions(destination)
+        return result
     except Exception as e:
         return {"destination": destination, "exists": False, "error": str(e)}
 
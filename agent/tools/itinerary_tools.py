@@ -1,9 +1,11 @@
 # tools/itinerary_tools.py
+import asyncio
 import json
 from google.adk.tools import FunctionTool
 from utils.itinerary_helper import (
     create_weather_optimized_itinerary
 )
+from services.itinerary_engine import get_itinerary_engine
 
 def parse_and_structure_itinerary(weather_data_json: str,
                                   user_input_json: str,
@@ -16,6 +18,29 @@ def parse_and_structure_itinerary(weather_data_json: str,
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+async def build_itinerary_draft(destination: str,
+                                days: int,
+                                budget: int,
+                                personality: str = "CULTURAL",
+                                group_size: int = 1,
+                                start_date: str = "") -> dict:
+    """Complete itinerary JSON built from the activities stored for the destination
+    (personality, weather and budget aware); refine it instead of starting from scratch."""
+    try:
+        request = {"destination": destination, "days": days, "budget": budget,
+                   "personality": personality, "groupSize": group_size}
+        if start_date:
+            request["startDate"] = start_date
+        # the first call builds the services (or waits for warm-up to): not on the event loop
+        engine = await asyncio.to_thread(get_itinerary_engine)
+        itinerary = await engine.generate(request)
+        if itinerary is None:
+            return {"success": False, "error": f"Not enough stored activities for {destination}"}
+        return {"success": True, "itinerary": itinerary}
+    except Exception as e:
+        return {"success": False, "error": str(e), "destination": destination}
+
 itinerary_function_tools = [
-    FunctionTool(func=parse_and_structure_itinerary)
+    FunctionTool(func=parse_and_structure_itinerary),
+    FunctionTool(func=build_itinerary_draft),
 ]
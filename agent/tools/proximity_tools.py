@@ -0,0 +1,80 @@
+# tools/proximity_tools.py
+import asyncio
+import json
+import re
+import time
+from google.adk.tools import FunctionTool
+from services.dynamic_ingestion_service import get_ingestion_service
+
+_LAT_LNG = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+def _loaded_indexes(timeout: float):
+    # building the service and the first index loads block, so this runs in a worker thread
+    db = get_ingestion_service().db_integration
+    deadline = time.monotonic() + timeout
+    if db.destination_index.wait_ready(timeout=timeout) and \
+            db.proximity_index.wait_ready(timeout=max(0.0, deadline - time.monotonic())):
+        return db.destination_index, db.proximity_index
+    return None
+
+async def _resolve_destination(destination: str):
+    """(destination match, proximity index); raises LookupError with a reply-ready message"""
+    # only the very first calls wait (2 s in all), for the initial background loads
+    indexes = await asyncio.to_thread(_loaded_indexes, 2.0)
+    if indexes is None:
+        raise LookupError("Location data is not loaded yet")
+    destination_index, proximity_index = indexes
+    match = destination_index.lookup(destination)
+    if match is None:
+        raise LookupError(f"{destination} is not in our knowledge base yet")
+    return match, proximity_index
+
+async def find_places_near(destination: str,
+                           near: str,
+                           radius_km: float = 5.0,
+                           kind: str = "activity",
+                           limit: int = 10) -> dict:
+    """Stored activities or hotels (kind) within radius_km of `near`: a hotel or
+    activity name in the destination, or "lat,lng"."""
+    try:
+        match, index = await _resolve_destination(destination)
+        anchor = _LAT_LNG.match(near or "")
+        if anchor:
+            origin = {"name": near, "latitude": float(anchor.group(1)), "longitude": float(anchor.group(2))}
+        else:
+            origin = index.find(match["destination_id"], near)
+            if origin is None:
+                return {"success": False, "destination": match["name"],
+                        "error": f"No located hotel or activity called '{near}' in {match['name']}"}
+        places = index.within(origin["latitude"], origin["longitude"], radius_km,
+                              kind=kind if kind in ("activity", "hotel") else None,
+                              destination_id=match["destination_id"], limit=limit,
+                              exclude=[origin["place_id"]] if origin.get("place_id") else ())
+        return {"success": True, "destination": match["name"], "near": origin["name"],
+                "radius_km": radius_km, "count": len(places), "places": places}
+    except Exception as e:
+        return {"success": False, "error": str(e), "destination": destination}
+
+async def cluster_activities_by_day(destination: str,
+                                    days: int,
+                                    activity_names_json: str = "") -> dict:
+    """Group a destination's activities (or only the named ones) into one
+    geographically tight cluster per day, each in visiting order."""
+    try:
+        match, index = await _resolve_destination(destination)
+        names = json.loads(activity_names_json) if activity_names_json else None
+        clusters = index.cluster(match["destination_id"], days, kind="activity", names=names)
+        return {
+            "success": bool(clusters),
+            "destination": match["name"],
+            "days": [{"day": day, "activities": cluster,
+                      "travel_km": round(sum(place["leg_km"] for place in cluster), 2)}
+                     for day, cluster in enumerate(clusters, 1)],
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e), "destination": destination}
+
+proximity_function_tools = [
+    FunctionTool(func=find_places_near),
+    FunctionTool(func=cluster_activities_by_day),
+]
@@ -0,0 +1,186 @@
+# tools/registry.py
+"""Which tools each agent gets.
+
+Every tool schema an agent carries is sent with each of its model calls, so
+agents only get the tools their instruction uses. AGENT_TOOLS lists them by
+name: FunctionTool names, travel_genius_toolset tool names (hyphenated), or
+the toolset name itself for the whole toolset.
+
+    python -m tools.registry --check    # instructions only reference tools the agent has
+    python -m tools.registry --report   # schema tokens per agent, all_tools vs subset
+"""
+import argparse
+import re
+import sys
+from typing import Dict, Iterable, List, Optional
+
+from tools.weather_tools import weather_function_tools
+from tools.destination_tools import destination_function_tools
+from tools.itinerary_tools import itinerary_function_tools
+from tools.common_tools import common_function_tools
+from tools.proximity_tools import proximity_function_tools
+from services.toolbox_service import travel_toolset
+
+FUNCTION_TOOLS = {tool.name: tool for tool in (weather_function_tools + destination_function_tools +
+                                              itinerary_function_tools + common_function_tools +
+                                              proximity_function_tools)}
+
+# travel_genius_toolset tools the instructions name; the manifest may hold more
+TOOLBOX_TOOLS = [
+    "search-activities-by-interest", "get-hidden-gems", "search-hotels-enhanced",
+    "search-transport-options", "calculate-trip-budget",
+]
+WHOLE_TOOLSET = travel_toolset.toolset_name
+
+AGENT_TOOLS: Dict[str, List[str]] = {
+    "personality_analyzer": [
+        "check_destination_exists", "extract_destination_from_query", "get_weather_analysis",
+    ],
+    "budget_optimizer": [
+        "calculate-trip-budget", "search-transport-options", "get_weather_analysis",
+    ],
+    "gems_discoverer": [
+        "get-hidden-gems", "search-activities-by-interest", "get_weather_analysis", "find_places_near",
+    ],
+    "sustainability_advisor": [
+        "search-transport-options", "search-hotels-enhanced", "search-activities-by-interest", "get-hidden-gems",
+        "get_weather_analysis",
+    ],
+    "accommodation_specialist": [
+        "search-hotels-enhanced", "get_weather_analysis", "find_places_near",
+    ],
+    "weather_planner": [
+        "get_current_weather_report", "get_weather_analysis", "optimize_schedule_for_weather",
+        "compare_destinations_weather", "get_best_time_for_activity", "extract_destination_from_query",
+    ],
+    # the generator keeps the whole toolset: it builds full itineraries from the database
+    "travel_genius": [
+        WHOLE_TOOLSET, "check_destination_exists", "discover_new_destination", "extract_destination_from_query",
+        "get_current_weather_report", "get_weather_analysis", "optimize_schedule_for_weather",
+        "cluster_activities_by_day", "parse_and_structure_itinerary", "build_itinerary_draft",
+    ],
+    "itinerary_assistant": [
+        "search-activities-by-interest", "get-hidden-gems", "search-hotels-enhanced", "find_places_near",
+        "get_current_weather_report", "get_weather_analysis", "get_best_time_for_activity",
+    ],
+    "travel_genius_router": [
+        "determine_routing_intent",
+    ],
+}
+
+# "use get-hidden-gems", "Use search_transport_options tool": a name after use/call is a tool reference
+_TOOL_CALL = re.compile(r"\b(?:use|call)\s+([a-z]+(?:[_-][a-z]+)+)\b", re.IGNORECASE)
+
+
+def tools_for(agent_name: str) -> list:
+    """The agent's tool list: its FunctionTools, then one view of the MCP toolset for its toolbox tools"""
+    names = AGENT_TOOLS[agent_name]
+    unknown = [n for n in names if n not in FUNCTION_TOOLS and n not in TOOLBOX_TOOLS and n != WHOLE_TOOLSET]
+    if unknown:
+        raise KeyError(f"Unknown tools for {agent_name}: {unknown}")
+    tools = [FUNCTION_TOOLS[n] for n in names if n in FUNCTION_TOOLS]
+    if WHOLE_TOOLSET in names:
+        tools.append(travel_toolset)
+    else:
+        toolbox = [n for n in names if n in TOOLBOX_TOOLS]
+        if toolbox:
+            tools.append(travel_toolset.subset(toolbox))
+    return tools
+
+
+def tool_names_for(agent_name: str, toolbox_names: Iterable[str] = ()) -> List[str]:
+    """Tool names the agent can call; WHOLE_TOOLSET expands to toolbox_names (default: TOOLBOX_TOOLS)"""
+    names = []
+    for name in AGENT_TOOLS[agent_name]:
+        if name == WHOLE_TOOLSET:
+            names.extend(list(toolbox_names) or TOOLBOX_TOOLS)
+        else:
+            names.append(name)
+    return names
+
+
+def referenced_tools(instruction: str) -> List[str]:
+    """Tool names an instruction mentions: every known tool name, plus anything that follows use/call"""
+    known = set(FUNCTION_TOOLS) | set(TOOLBOX_TOOLS)
+    found = {name for name in known if re.search(rf"(?<![\w-]){re.escape(name)}(?![\w-])", instruction)}
+    found.update(m.group(1) for m in _TOOL_CALL.finditer(instruction))
+    return sorted(found)
+
+
+def walk_agents(root) -> list:
+    agents, stack = [], [root]
+    while stack:
+        agent = stack.pop()
+        agents.append(agent)
+        stack.extend(reversed(agent.sub_agents))
+    return agents
+
+
+def check_agents(root, toolbox_names: Iterable[str] = ()) -> List[str]:
+    """Problems found: instructions naming tools the agent doesn't have, agents missing from AGENT_TOOLS"""
+    problems = []
+    for agent in walk_agents(root):
+        instruction = getattr(agent, "instruction", None)
+        if not isinstance(instruction, str):
+            continue
+        if agent.name not in AGENT_TOOLS:
+            problems.append(f"{agent.name}: not in AGENT_TOOLS")
+            continue
+        available = set(tool_names_for(agent.name, toolbox_names))
+        for name in referenced_tools(instruction):
+            if name not in available:
+                problems.append(f"{agent.name}: instruction references {name}, which it does not have")
+    return problems
+
+
+def schema_tokens(declaration) -> int:
+    """Rough token count of one function declaration as sent to the model (~4 characters per token)"""
+    return len(declaration.model_dump_json(exclude_none=True)) // 4
+
+
+def token_report(root, toolbox_tools: Optional[list] = None) -> List[dict]:
+    """Per agent: tool count and schema tokens with all_tools vs with its registry subset"""
+    declarations = {name: tool._get_declaration() for name, tool in FUNCTION_TOOLS.items()}
+    declarations.update({tool.name: tool._get_declaration() for tool in toolbox_tools or []})
+    tokens = {name: schema_tokens(d) for name, d in declarations.items() if d is not None}
+    toolbox_names = [tool.name for tool in toolbox_tools or []]
+    rows = []
+    for agent in walk_agents(root):
+        if agent.name not in AGENT_TOOLS:
+            continue
+        subset = [n for n in tool_names_for(agent.name, toolbox_names) if n in tokens]
+        rows.append({
+            "agent": agent.name,
+            "tools_before": len(tokens),
+            "tokens_before": sum(tokens.values()),
+            "tools_after": len(subset),
+            "tokens_after": sum(tokens[n] for n in subset),
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-agent tool subsets: consistency check and schema token report")
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--report", action="store_true")
+    args = parser.parse_args()
+    from agent import root_agent
+
+    toolbox_tools = []
+    if args.report:
+        try:
+            toolbox_tools = travel_toolset.load()
+        except Exception as e:
+            print(f"⚠️ Toolbox tools not counted ({e})", file=sys.stderr)
+    problems = check_agents(root_agent, [tool.name for tool in toolbox_tools]) if args.check or not args.report else []
+    if args.report:
+        rows = token_report(root_agent, toolbox_tools)
+        print(f"{'agent':<26}{'tools':>7}{'tokens':>8}  ->{'tools':>7}{'tokens':>8}")
+        for row in rows:
+            print(f"{row['agent']:<26}{row['tools_before']:>7}{row['tokens_before']:>8}  ->"
+                  f"{row['tools_after']:>7}{row['tokens_after']:>8}")
+        print(f"{'total':<26}{'':>7}{sum(r['tokens_before'] for r in rows):>8}  ->"
+              f"{'':>7}{sum(r['tokens_after'] for r in rows):>8}")
+    for problem in problems:
+        print(f"❌ {problem}")
+    sys.exit(1 if problems else 0)
@@ -1,58 +1,50 @@
 # tools/weather_tools.py
-import json, asyncio
+import json
+from typing import List
 from google.adk.tools import FunctionTool
+from utils.async_helper import run_in_service_loop
 from utils.weather_helper import (
     extract_destination_from_text, analyze_weather_suitability
 )
-from services.weather_service import weather_service
+from services.weather_service import get_weather_service
 
 # ---------- WRAPPED FUNCTIONS ----------
 def extract_destination_from_query(query: str) -> dict:
     return {"destination": extract_destination_from_text(query)}
 
-def get_weather_analysis(destination: str,
+async def get_weather_analysis(destination: str,
                          start_date: str,
                          duration_days: int) -> dict:
     try:
-        data = asyncio.get_event_loop().run_until_complete(
-            weather_service.get_weather_summary_for_dates(
+        data = await run_in_service_loop(
+            get_weather_service().get_weather_summary_for_dates(
                 destination, start_date, duration_days)
         )
         return analyze_weather_suitability(data, destination)
     except Exception as e:
         return {"destination": destination, "error": str(e)}
 
-def get_current_weather_report(destination: str) -> dict:
+async def get_current_weather_report(destination: str) -> dict:
     try:
-        current  = asyncio.get_event_loop().run_until_complete(
-            weather_service.get_current_weather(destination))
-        summary  = asyncio.get_event_loop().run_until_complete(
-            weather_service.get_weather_summary_for_dates(
-                destination, start_date="", duration_days=7))
-        return {
-            "destination": destination,
-            "current": current["current"],
-            "daily_weather": summary["daily_weather"][:7],
-            "overall_weather_score": summary["overall_weather_score"],
-            "weather_alerts": summary["weather_alerts"],
-            "success": True
-        }
+        report = await run_in_service_loop(
+            get_weather_service().get_weather_report(destination, duration_days=7))
+        return {**report, "success": True}
     except Exception as e:
         return {"success": False, "error": str(e), "destination": destination}
 
-def optimize_schedule_for_weather(destination: str,
+async def optimize_schedule_for_weather(destination: str,
                                   activities_json: str,
                                   duration_days: int) -> dict:
     try:
         acts = json.loads(activities_json or "[]")
-        forecast = asyncio.get_event_loop().run_until_complete(
-            weather_service.get_forecast(destination, duration_days))
-        for idx, act in enumerate(acts):
-            if idx < len(forecast.get("forecastday", [])):
-                day = forecast["forecastday"][idx]
-                score = weather_service.get_weather_suitability_score(
-                    day, act.get("type", "outdoor"))
-                act["weather_score"] = score
+        service = get_weather_service()
+        forecast = await run_in_service_loop(
+            service.get_forecast(destination, duration_days))
+        days = forecast.get("forecastday", [])[:len(acts)]
+        scores = service.scoring.score_pairs(
+            days, [act.get("type", "outdoor") for act in acts[:len(days)]])
+        for act, score in zip(acts, scores):
+            act["weather_score"] = score
         return {
             "success": True,
             "destination": destination,
@@ -61,10 +53,36 @@ def optimize_schedule_for_weather(destination: str,
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+async def get_best_time_for_activity(destination: str,
+                                     date: str,
+                                     activity_type: str,
+                                     duration_hours: int = 3) -> dict:
+    try:
+        window = await run_in_service_loop(
+            get_weather_service().get_best_time_window(
+                destination, date, activity_type, duration_hours))
+        return {**window, "success": "error" not in window}
+    except Exception as e:
+        return {"success": False, "error": str(e), "destination": destination}
+
+async def compare_destinations_weather(destinations: List[str],
+                                       start_date: str,
+                                       duration_days: int,
+                                       activity_type: str = "outdoor") -> dict:
+    try:
+        comparison = await run_in_service_loop(
+            get_weather_service().compare_destinations(
+                destinations, start_date, duration_days, activity_type))
+        return {**comparison, "success": bool(comparison["ranking"])}
+    except Exception as e:
+        return {"success": False, "error": str(e), "destinations": destinations}
+
 # ---------- TOOLSET ----------
 weather_function_tools = [
     FunctionTool(func=extract_destination_from_query),
     FunctionTool(func=get_weather_analysis),
     FunctionTool(func=get_current_weather_report),
     FunctionTool(func=optimize_schedule_for_weather),
+    FunctionTool(func=compare_destinations_weather),
+    FunctionTool(func=get_best_time_for_activity),
 ]
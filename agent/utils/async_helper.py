@@ -0,0 +1,181 @@
+# utils/async_helper.py
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+import time
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key onto one in-flight task.
+
+    The first caller for a key (the leader) starts the work; every caller that
+    arrives before it finishes awaits the same task instead of repeating it.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.leaders += 1
+        task = loop.create_task(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._forget(key, t))
+        # shield: a cancelled caller must not cancel the fetch its followers share
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every waiter went away
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.leaders + self.coalesced
+        return {
+            "in_flight": self.in_flight,
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesce_rate": round(self.coalesced / calls, 3) if calls else 0.0,
+        }
+
+
+class RateLimiter:
+    """Token bucket for outbound API calls: `rate` calls/second, bursts up to `burst`.
+
+    Callers reserve a token up front and sleep until it is theirs, so waiters
+    are served in arrival order. Not bound to any event loop.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waits = 0
+        self.wait_time_total = 0.0
+
+    def _reserve(self) -> float:
+        """Take a token (possibly going into debt); seconds until it is usable"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            self.acquired += 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            if wait:
+                self.waits += 1
+                self.wait_time_total += wait
+            return wait
+
+    async def acquire(self) -> None:
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"rate": self.rate, "burst": self.burst, "acquired": self.acquired, "waits": self.waits,
+                "wait_time_total": round(self.wait_time_total, 3)}
+
+
+class BackgroundLoop:
+    """Event loop owned by a daemon thread that all service I/O runs on.
+
+    Pooled sessions, caches and single-flight tasks are bound to this one loop,
+    while callers on any thread (or any other loop) submit coroutines to it
+    and wait for the result without blocking each other.
+    """
+
+    def __init__(self, name: str = "travel-genius-io"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None or not self._thread.is_alive():
+            self.start()
+        return self._loop
+
+    @property
+    def thread(self) -> threading.Thread:
+        if self._loop is None or not self._thread.is_alive():
+            self.start()
+        return self._thread
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            ready = threading.Event()
+            self._loop = asyncio.new_event_loop()
+
+            def _run():
+                asyncio.set_event_loop(self._loop)
+                self._loop.call_soon(ready.set)
+                self._loop.run_forever()
+
+            self._thread = threading.Thread(target=_run, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+            atexit.register(self.stop)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the loop thread; the loop itself stays open for final cleanup"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run_sync(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Block the calling thread until coro finishes on the background loop"""
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("run_sync() called from the background loop thread; await instead")
+        return self.submit(coro).result(timeout)
+
+    async def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Await coro on the background loop from any other event loop"""
+        if self.in_loop_thread():
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+
+# Shared loop for WeatherService / DynamicIngestionService I/O
+service_loop = BackgroundLoop()
+
+
+def run_sync(coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    return service_loop.run_sync(coro, timeout)
+
+
+async def run_in_service_loop(coro: Coroutine[Any, Any, T]) -> T:
+    return await service_loop.run(coro)
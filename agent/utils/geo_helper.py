@@ -0,0 +1,142 @@
+# utils/geo_helper.py
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+MAX_SEARCH_RADIUS_M = 50000.0  # Places API circle limit
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
+
+
+def offset_point(lat: float, lng: float, north_km: float, east_km: float) -> Tuple[float, float]:
+    """Point north_km / east_km away (flat-earth approximation, fine at city scale)"""
+    new_lat = lat + north_km / KM_PER_DEGREE
+    cos_lat = max(1e-6, math.cos(math.radians(new_lat)))
+    return new_lat, lng + east_km / (KM_PER_DEGREE * cos_lat)
+
+
+# Viewports use the Places API shape: {"low": {"latitude", "longitude"}, "high": {...}}
+
+def circle_viewport(center: Dict[str, float], radius_m: float) -> Dict[str, Dict[str, float]]:
+    """Bounding box of a circle around {"lat", "lng"}"""
+    low = offset_point(center["lat"], center["lng"], -radius_m / 1000, -radius_m / 1000)
+    high = offset_point(center["lat"], center["lng"], radius_m / 1000, radius_m / 1000)
+    return {"low": {"latitude": low[0], "longitude": low[1]}, "high": {"latitude": high[0], "longitude": high[1]}}
+
+
+def viewport_center(viewport: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+    low, high = viewport["low"], viewport["high"]
+    return {"lat": (low["latitude"] + high["latitude"]) / 2, "lng": (low["longitude"] + high["longitude"]) / 2}
+
+
+def viewport_radius_m(viewport: Dict[str, Dict[str, float]]) -> float:
+    """Half the diagonal: radius of the smallest circle around the viewport centre that covers it"""
+    low, high = viewport["low"], viewport["high"]
+    return haversine_km(low["latitude"], low["longitude"], high["latitude"], high["longitude"]) * 500
+
+
+class Tile:
+    """One search circle; `depth` counts how often it was split from a saturated parent"""
+
+    __slots__ = ("lat", "lng", "radius_m", "depth")
+
+    def __init__(self, lat: float, lng: float, radius_m: float, depth: int = 0):
+        self.lat = lat
+        self.lng = lng
+        self.radius_m = radius_m
+        self.depth = depth
+
+    def circle(self) -> Dict[str, Any]:
+        """locationRestriction / locationBias circle for the Places API"""
+        return {"circle": {"center": {"latitude": self.lat, "longitude": self.lng}, "radius": float(self.radius_m)}}
+
+    def split(self) -> List["Tile"]:
+        """Seven circles of half the radius (one centred, six around it) that cover this one"""
+        r_km = self.radius_m / 1000
+        children = [Tile(self.lat, self.lng, self.radius_m / 2, self.depth + 1)]
+        for k in range(6):
+            bearing = math.radians(30 + 60 * k)
+            lat, lng = offset_point(self.lat, self.lng, r_km * math.sqrt(3) / 2 * math.cos(bearing),
+                                    r_km * math.sqrt(3) / 2 * math.sin(bearing))
+            children.append(Tile(lat, lng, self.radius_m / 2, self.depth + 1))
+        return children
+
+    def __repr__(self) -> str:
+        return f"Tile({self.lat:.5f}, {self.lng:.5f}, {self.radius_m:.0f}m, depth={self.depth})"
+
+
+def hex_tiles(viewport: Dict[str, Dict[str, float]], tile_radius_m: float) -> List[Tile]:
+    """Hexagonal packing of circles of `tile_radius_m` that covers the whole viewport.
+
+    Circle centres sit on a hex grid whose cells have the circle as circumcircle
+    (rows 1.5r apart, columns r*sqrt(3) apart, odd rows shifted by half a column),
+    which covers the plane with the least overlap.
+    """
+    low, high = viewport["low"], viewport["high"]
+    r_km = tile_radius_m / 1000
+    height_km = (high["latitude"] - low["latitude"]) * KM_PER_DEGREE
+    row_step, col_step = 1.5 * r_km, math.sqrt(3) * r_km
+    rows = max(1, math.ceil(height_km / row_step) + 1)
+    tiles = []
+    for row in range(rows):
+        lat = low["latitude"] + min(row * row_step, height_km) / KM_PER_DEGREE
+        # widest extent of the row's band, so high-latitude edges stay covered
+        band_cos = math.cos(math.radians(min(89.0, max(abs(low["latitude"]), abs(high["latitude"])))))
+        width_km = (high["longitude"] - low["longitude"]) * KM_PER_DEGREE * max(band_cos, math.cos(math.radians(lat)))
+        shift = col_step / 2 if row % 2 else 0.0
+        cols = max(1, math.ceil((width_km + shift) / col_step) + 1)
+        for col in range(cols):
+            _, lng = offset_point(lat, low["longitude"], 0.0, col * col_step - shift)
+            tiles.append(Tile(lat, lng, tile_radius_m))
+    return tiles
+
+
+def spread_tiles(tiles: List[Tile], count: int, center: Dict[str, float]) -> List[Tile]:
+    """Up to `count` tiles spread evenly over the area, in an order where every prefix is spread too.
+
+    Farthest-point sampling: start with the tile nearest the centre, then keep
+    taking the tile farthest from everything taken so far.
+    """
+    if not tiles or count <= 0:
+        return []
+    nearest = [haversine_km(center["lat"], center["lng"], t.lat, t.lng) for t in tiles]
+    first = min(range(len(tiles)), key=nearest.__getitem__)
+    picked = [first]
+    gap = [haversine_km(tiles[first].lat, tiles[first].lng, t.lat, t.lng) for t in tiles]
+    while len(picked) < min(count, len(tiles)):
+        farthest = max(range(len(tiles)), key=gap.__getitem__)
+        picked.append(farthest)
+        gap = [min(g, haversine_km(tiles[farthest].lat, tiles[farthest].lng, t.lat, t.lng))
+               for g, t in zip(gap, tiles)]
+    return [tiles[i] for i in picked]
+
+
+def cover_viewport(viewport: Dict[str, Dict[str, float]], tile_radius_m: float, max_tiles: int,
+                   limit: Optional[int] = None) -> List[Tile]:
+    """hex_tiles with the smallest radius (>= tile_radius_m) that needs at most max_tiles circles, spread-first.
+
+    A viewport too large for max_tiles circles even at the API's largest radius
+    gets its tiles in spread_tiles order (up to `limit`, default max_tiles), so
+    whichever prefix a caller can afford covers the whole area, not its
+    southern rows.
+    """
+    radius = min(tile_radius_m, MAX_SEARCH_RADIUS_M)
+    tiles = hex_tiles(viewport, radius)
+    while len(tiles) > max_tiles and radius < MAX_SEARCH_RADIUS_M:
+        radius = min(MAX_SEARCH_RADIUS_M, radius * 1.25)
+        tiles = hex_tiles(viewport, radius)
+    return spread_tiles(tiles, max(max_tiles, limit or 0), viewport_center(viewport))
+
+
+def grid_cell(lat: float, lng: float, cell_km: float) -> Tuple[int, int]:
+    """(row, column) of the uniform lat/lng grid cell, cell_km on a side, that a point falls in"""
+    cell_deg = cell_km / KM_PER_DEGREE
+    return int(math.floor(lat / cell_deg)), int(math.floor(lng / cell_deg))
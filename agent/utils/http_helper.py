@@ -0,0 +1,90 @@
+# utils/http_helper.py
+import asyncio
+import atexit
+import weakref
+from typing import Optional
+
+import aiohttp
+
+# Every PooledSession registers itself here so open pools can be closed at exit
+_open_pools: "weakref.WeakSet[PooledSession]" = weakref.WeakSet()
+
+
+class PooledSession:
+    """Long-lived aiohttp session with a bounded keep-alive connection pool.
+
+    The session is created lazily on first use inside the running event loop
+    and shared by every request made through it, so repeated calls to the same
+    host reuse TCP/TLS connections and cached DNS lookups.
+    """
+
+    def __init__(self,
+                 limit: int = 100,
+                 limit_per_host: int = 20,
+                 dns_cache_ttl: int = 300,
+                 keepalive_timeout: float = 30.0):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = asyncio.Lock()
+        _open_pools.add(self)
+
+    def _new_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        return aiohttp.ClientSession(connector=connector)
+
+    async def get(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use in this loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed and self._loop is loop:
+            return self._session
+        if self._loop is not loop:
+            # asyncio.Lock binds to the first loop that awaits it
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._session is None or self._session.closed or self._loop is not loop:
+                if self._session is not None and not self._session.closed and self._loop is not None:
+                    self._close_on_owner_loop()
+                self._session = self._new_session()
+                self._loop = loop
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session and release all pooled connections"""
+        session, self._session = self._session, None
+        self._loop = None
+        if session is not None and not session.closed:
+            await session.close()
+
+    @property
+    def is_open(self) -> bool:
+        return self._session is not None and not self._session.closed
+
+    def _close_on_owner_loop(self) -> None:
+        """Close a session that belongs to a different (possibly idle) loop"""
+        session, loop = self._session, self._loop
+        self._session, self._loop = None, None
+        if session is None or session.closed or loop is None or loop.is_closed():
+            return
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        else:
+            loop.run_until_complete(session.close())
+
+
+@atexit.register
+def _close_open_pools() -> None:
+    for pool in list(_open_pools):
+        try:
+            pool._close_on_owner_loop()
+        except Exception:
+            pass
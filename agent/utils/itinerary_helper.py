@@ -1,5 +1,8 @@
 # utils/itinerary_helpers.py
-from typing import Dict, Any, List
+import re
+from typing import Dict, Any, List, Optional
+
+from utils.routing_helper import validate_user_input
 
 # ---------- DAILY ACTIVITY GENERATOR ----------
 def create_daily_activities(day: int, destination: str,
@@ -108,3 +111,58 @@ def create_weather_optimized_itinerary(weather_data: dict,
         "generatedBy":  "AI Travel Genius",
         "generatedAt":  "2025-09-16T23:45:00+05:30"
     }
+
+# ---------- TRIP REQUEST PARSING ----------
+PERSONALITIES = ("HERITAGE", "ADVENTURE", "CULTURAL", "PARTY", "LUXURY")
+_NUMBER_WORDS = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+                 "eight": 8, "nine": 9, "ten": 10, "a": 1}
+_DAYS = re.compile(r"\b(\d{1,2}|one|two|three|four|five|six|seven|eight|nine|ten|a)\s*-?\s*(day|night|week)s?\b",
+                   re.IGNORECASE)
+_DESTINATION = re.compile(
+    r"\b(?:trip|travel|vacation|holiday|getaway|tour|itinerary|visit|plan)\s+(?:to|for|in|of)\s+"
+    r"([a-z][\w'.-]*(?:\s+(?!(?:for|with|in|on|from|budget|and|at|during|starting|next|this)\b)[a-z][\w'.-]*){0,3})",
+    re.IGNORECASE)
+_BUDGET = re.compile(
+    r"(?:budget(?:\s+of|\s+is|:)?\s*|₹\s*|\brs\.?\s*|\binr\s*)(?:₹\s*|rs\.?\s*|inr\s*)?(\d[\d,]*(?:\.\d+)?)\s*(k|l|lakh|lakhs)?\b",
+    re.IGNORECASE)
+_GROUP = re.compile(r"\bfor\s+(\d{1,2}|two|three|four|five|six)\s+(?:people|persons|adults|travellers|travelers|friends)\b"
+                    r"|\b(couple|honeymoon)\b", re.IGNORECASE)
+_START_DATE = re.compile(r"\b(20\d\d-\d\d-\d\d)\b")
+
+
+def _count(token: str) -> int:
+    return int(token) if token.isdigit() else _NUMBER_WORDS[token.lower()]
+
+
+def parse_trip_request(text: str) -> Optional[Dict[str, Any]]:
+    """'5-day trip to Goa with a budget of 30000' -> user_input dict, or None unless
+    destination, days and budget are all stated (the requests the engine serves without an LLM)"""
+    days = _DAYS.search(text)
+    destination = _DESTINATION.search(text)
+    budget = _BUDGET.search(text)
+    if not (days and destination and budget):
+        return None
+    n_days = _count(days.group(1)) * (7 if days.group(2).lower() == "week" else 1)
+    if days.group(2).lower() == "night":
+        n_days += 1
+    amount = float(budget.group(1).replace(",", ""))
+    unit = (budget.group(2) or "").lower()
+    amount *= 1_000 if unit == "k" else 100_000 if unit.startswith("l") else 1
+    group = _GROUP.search(text)
+    group_size = 1
+    if group:
+        group_size = 2 if group.group(2) else _count(group.group(1))
+    upper = text.upper()
+    name = destination.group(1).strip(" .,")
+    user_input = {
+        "destination": name if not name.islower() else name.title(),
+        "days": n_days,
+        "budget": int(amount),
+        "groupSize": group_size,
+        "personality": next((p for p in PERSONALITIES if p in upper), "CULTURAL"),
+    }
+    start = _START_DATE.search(text)
+    if start:
+        user_input["startDate"] = start.group(1)
+    return user_input if validate_user_input(user_input) and 1 <= n_days <= 21 else None
+
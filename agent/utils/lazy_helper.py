@@ -0,0 +1,62 @@
+# utils/lazy_helper.py
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class Lazy(Generic[T]):
+    """Builds a shared instance on first use instead of at import time.
+
+    The factory runs at most once at a time: concurrent first callers wait for
+    the same build. A failed build is not cached, so the next call retries
+    (e.g. once the missing env var or the unreachable server is fixed).
+    """
+
+    def __init__(self, factory: Callable[[], T], name: str):
+        self._factory = factory
+        self.name = name
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+        self.init_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.attempts = 0
+
+    def get(self) -> T:
+        instance = self._instance
+        if instance is not None:
+            return instance
+        with self._lock:
+            if self._instance is None:
+                self.attempts += 1
+                started = time.perf_counter()
+                try:
+                    self._instance = self._factory()
+                except Exception as e:
+                    self.last_error = f"{type(e).__name__}: {e}"
+                    raise
+                self.init_ms = round((time.perf_counter() - started) * 1000, 1)
+                self.last_error = None
+                logger.debug("%s initialized in %.1f ms", self.name, self.init_ms)
+            return self._instance
+
+    def peek(self) -> Optional[T]:
+        """The instance if it has been built, without building it"""
+        return self._instance
+
+    @property
+    def ready(self) -> bool:
+        return self._instance is not None
+
+    def reset(self) -> Optional[T]:
+        """Forget the instance (tests, reconnects); returns it so the caller can close it"""
+        with self._lock:
+            instance, self._instance = self._instance, None
+            return instance
+
+    def stats(self) -> Dict[str, Any]:
+        return {"ready": self.ready, "init_ms": self.init_ms, "attempts": self.attempts, "error": self.last_error}
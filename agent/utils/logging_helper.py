@@ -0,0 +1,130 @@
+# utils/logging_helper.py
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional, TextIO
+
+# Bound per tool call; asyncio tasks and run_coroutine_threadsafe copy them along
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+session_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("session_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id", "session_id"}
+
+
+class ContextFilter(logging.Filter):
+    """Stamps the current request/session ids onto every record"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        record.session_id = session_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including request/session ids and `extra` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            payload["request_id"] = record.request_id
+        if getattr(record, "session_id", None):
+            payload["session_id"] = record.session_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    """'services.weather_service=DEBUG,utils=WARNING' -> {logger: level}"""
+    levels = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, level = part.partition("=")
+        if level:
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(level: Optional[str] = None,
+                      json_format: Optional[bool] = None,
+                      module_levels: Optional[Dict[str, str]] = None,
+                      stream: Optional[TextIO] = None) -> None:
+    """Install the root handler once.
+
+    Defaults come from LOG_LEVEL (INFO), LOG_FORMAT ('json' or 'text') and
+    LOG_LEVELS ('logger=LEVEL,...' per-module overrides).
+    """
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    if json_format is None:
+        json_format = os.getenv("LOG_FORMAT", "text").lower() == "json"
+    if module_levels is None:
+        module_levels = _parse_levels(os.getenv("LOG_LEVELS", ""))
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.addFilter(ContextFilter())
+    handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+    for name, module_level in module_levels.items():
+        logging.getLogger(name).setLevel(module_level)
+
+
+@contextlib.contextmanager
+def bind_request(request_id: Optional[str] = None, session_id: Optional[str] = None) -> Iterator[None]:
+    """Attach request/session ids to all log records emitted inside the block"""
+    request_token = request_id_var.set(request_id)
+    session_token = session_id_var.set(session_id)
+    try:
+        yield
+    finally:
+        request_id_var.reset(request_token)
+        session_id_var.reset(session_token)
+
+
+# Tokens to undo the innermost bind_tool_log_context, linked to the enclosing call's (AgentTool nests runs)
+_tool_log_tokens: contextvars.ContextVar[Optional[tuple]] = contextvars.ContextVar("tool_log_tokens", default=None)
+
+
+def bind_tool_log_context(tool, args, tool_context) -> None:
+    """ADK before_tool_callback: tag this tool call's logs with invocation/session ids.
+
+    The session id comes from the context's public `session` where the ADK
+    version has one; older versions only tag the invocation id.
+    """
+    session = getattr(tool_context, "session", None)
+    _tool_log_tokens.set((request_id_var.set(tool_context.invocation_id),
+                          session_id_var.set(getattr(session, "id", None)),
+                          _tool_log_tokens.get()))
+    return None
+
+
+def reset_tool_log_context(tool, args, tool_context, tool_response) -> None:
+    """ADK after_tool_callback: restore the ids bind_tool_log_context replaced"""
+    tokens = _tool_log_tokens.get()
+    if tokens is None:
+        return None
+    request_token, session_token, enclosing = tokens
+    try:
+        request_id_var.reset(request_token)
+        session_id_var.reset(session_token)
+    except ValueError:
+        pass  # bound in another context; nothing of ours is left in this one
+    _tool_log_tokens.set(enclosing)
+    return None
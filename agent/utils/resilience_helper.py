@@ -0,0 +1,137 @@
+# utils/resilience_helper.py
+import random
+import time
+from typing import Any, Dict, Optional
+
+# Worth retrying: request timeout, too early, rate limited, and server-side errors
+RETRYABLE_STATUSES = {408, 425, 429}
+
+
+def is_retryable_status(status: int) -> bool:
+    return status in RETRYABLE_STATUSES or status >= 500
+
+
+def full_jitter_backoff(attempt: int, base: float = 0.5, cap: float = 8.0) -> float:
+    """'Full jitter' exponential backoff: uniform in [0, min(cap, base * 2**attempt)]"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a host whose circuit breaker is open"""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit open for {host}; retry in {retry_in:.0f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures -> half-open probe after a cool-down.
+
+    Only upstream health counts as failure (timeouts, connection errors, 5xx/429);
+    a 4xx for a bad city is the caller's problem and leaves the circuit alone.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, host: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._probe_started = 0.0
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through right now"""
+        state = self.state
+        if state == self.CLOSED:
+            return
+        if state == self.HALF_OPEN:
+            now = time.monotonic()
+            if self._half_open_calls >= self.half_open_max_calls and now - self._probe_started >= self.reset_timeout:
+                self._half_open_calls = 0  # a probe was abandoned (e.g. cancelled); allow a new one
+            if self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                self._probe_started = now
+                return
+        self.rejected += 1
+        raise CircuitOpenError(self.host, max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)))
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self.times_opened += 1
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self._failures,
+                "times_opened": self.times_opened, "rejected": self.rejected}
+
+
+class RetryBudget:
+    """Caps retries to a fraction of recent successful traffic.
+
+    Every success deposits `ratio` tokens, every retry withdraws one, and a
+    small time-based allowance (`min_per_second`) keeps low-traffic retries
+    possible. During an outage the bucket drains, so sessions stop piling
+    retries onto an upstream that is already failing.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self.retries = 0
+        self.denied = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def record_success(self) -> None:
+        self._refill()
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        self._refill()
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            self.retries += 1
+            return True
+        self.denied += 1
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        self._refill()
+        return {"tokens": round(self._tokens, 2), "retries": self.retries, "denied": self.denied}
+
+
+def retry_after_seconds(headers: Optional[Dict[str, str]], cap: float) -> Optional[float]:
+    """Seconds from a numeric Retry-After header, capped; None if absent/unparseable"""
+    try:
+        return min(cap, max(0.0, float(headers.get("Retry-After"))))
+    except (AttributeError, TypeError, ValueError):
+        return None
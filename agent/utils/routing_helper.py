@@ -1,4 +1,7 @@
 # utils/routing_helpers.py
+import re
+from typing import Any, Dict, List, Tuple
+
 def determine_intent(query: str, has_existing_itinerary: bool = False) -> str:
     q = query.lower()
     gen = ['create itinerary', 'plan a trip', 'generate itinerary', 'plan my vacation']
@@ -9,3 +12,80 @@ def determine_intent(query: str, has_existing_itinerary: bool = False) -> str:
 
 def validate_user_input(data: dict) -> bool:
     return all(data.get(k) for k in ["destination", "days", "budget"])
+
+
+# Weighted routing signals: (rule name, intent, weight, regex). Each rule counts once per query.
+ROUTING_RULES: List[Tuple[str, str, float, str]] = [
+    ("plan_request", "generate", 3.0,
+     r"\b(?:create|generate|plan|build|make|design|prepare|organi[sz]e)\b[\w\s,'-]{0,30}?"
+     r"\b(?:itinerary|trip|vacation|holiday|travel plan|tour|getaway|honeymoon)\b"),
+    ("plan_my", "generate", 2.0, r"\bplan (?:my|our|a|an)\b"),
+    ("duration_trip", "generate", 2.5,
+     r"\b\d+\s*-?\s*(?:day|days|night|nights|week|weeks)\s+(?:trip|itinerary|tour|vacation|holiday|getaway|plan)\b"),
+    ("duration", "generate", 1.0, r"\bfor\s+(?:\d+|a|one|two|three|four|five|six|seven)\s+(?:days|nights|day|week|weeks)\b"),
+    ("trip_to", "generate", 1.0, r"\b(?:trip|travel|vacation|holiday|getaway|visit)\s+to\b"),
+    ("budget", "generate", 0.5, r"\bbudget\b|₹\s*\d|\brs\.?\s*\d|\binr\b|\b\d+\s*k\b"),
+    ("new_plan", "generate", 1.5, r"\b(?:new|another|fresh)\s+(?:itinerary|trip|plan)\b"),
+    ("change_request", "chat", 3.0,
+     r"\b(?:can|could|would)\s+you\s+(?:please\s+)?(?:change|swap|replace|move|remove|drop|add|shift|reschedule|update)\b"),
+    ("modify", "chat", 2.5,
+     r"\b(?:replace|swap|instead|reschedule|rearrange|move|remove|skip)\b"),
+    ("alternative", "chat", 2.0,
+     r"\b(?:alternatives?|cheaper|less expensive|different|another option|other options?|vegetarian|vegan)\b"),
+    ("what_about", "chat", 2.0, r"\b(?:what|how)\s+about\b"),
+    ("reference", "chat", 1.5,
+     r"\bday\s*\d+\b|\b(?:this|that|the)\s+(?:activity|hotel|restaurant|place|day)\b|\bmy\s+(?:itinerary|plan|hotel|trip)\b"),
+    ("practical", "chat", 2.0,
+     r"\b(?:what\s+(?:should\s+i|to)\s+(?:pack|wear)|how\s+(?:do|can|should)\s+i\s+(?:get|reach|go)|best\s+time"
+     r"|is\s+there|are\s+there|is\s+it\s+(?:safe|open|worth)|how\s+(?:much|far|long))\b"),
+    ("suggest", "chat", 1.0, r"\bsuggest\b|\brecommend\b"),
+    ("question", "chat", 1.5, r"\?"),
+]
+
+ROUTE_TARGETS = {"generate": "travel_genius", "chat": "itinerary_assistant"}
+
+# one pass over the query: a zero-width alternative per rule, so rules starting
+# at different positions all match (lookahead doesn't consume the text). At a
+# given position the first rule listed wins, so specific rules go before the
+# weaker ones they overlap (plan_request before plan_my).
+_ROUTING_PATTERN = re.compile(
+    "|".join(f"(?=(?P<{name}>{pattern}))" for name, _, _, pattern in ROUTING_RULES),
+    re.IGNORECASE,
+)
+_RULES_BY_NAME = {name: (intent, weight) for name, intent, weight, _ in ROUTING_RULES}
+_ITINERARY_MARKERS = re.compile(r'"(?:dailyPlans|tripTitle)"|\bitinerary\s*:', re.IGNORECASE)
+
+
+def has_itinerary_context(text: str) -> bool:
+    """True when the message carries an existing itinerary (the frontend pastes its JSON)"""
+    return bool(_ITINERARY_MARKERS.search(text))
+
+
+def classify_intent(query: str, has_existing_itinerary: bool = False) -> Dict[str, Any]:
+    """Keyword / pattern routing with a confidence score.
+
+    Returns {"intent": "generate"|"chat", "confidence": 0..1, "target": agent name,
+    "scores": {...}, "signals": [rule names]}. Confidence is the score margin
+    between the two intents, shrunk towards 0 when there is little evidence;
+    a query with no signals at all scores 0.
+    """
+    signals = set()
+    for match in _ROUTING_PATTERN.finditer(query):
+        signals.add(match.lastgroup)
+    scores = {"generate": 0.0, "chat": 0.0}
+    for name in signals:
+        intent, weight = _RULES_BY_NAME[name]
+        scores[intent] += weight
+    if has_existing_itinerary:
+        scores["chat"] += 1.5
+    intent = max(scores, key=lambda k: (scores[k], k == ("chat" if has_existing_itinerary else "generate")))
+    other = scores["chat" if intent == "generate" else "generate"]
+    # the itinerary prior alone picks a side but is no evidence of intent
+    confidence = (scores[intent] - other) / (scores[intent] + other + 1.0) if signals else 0.0
+    return {
+        "intent": intent,
+        "confidence": round(confidence, 3),
+        "target": ROUTE_TARGETS[intent],
+        "scores": scores,
+        "signals": sorted(signals),
+    }
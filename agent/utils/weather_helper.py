@@ -2,6 +2,10 @@
 import re
 from typing import Dict, Any, List
 
+def normalize_destination(destination: str) -> str:
+    """Canonical form used for cache keys: lower-case, single-spaced."""
+    return " ".join((destination or "").lower().split())
+
 def extract_destination_from_text(query: str) -> str:
     """Pure regex destination extractor (pulled from agent.py)."""
     query = re.sub(r'\b(the|in|at|for|weather|forecast|what|is|how|will|be)\b',